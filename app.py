@@ -1,5 +1,7 @@
 import streamlit as st
 
+from boraali import aquecimento
+
 # =========================================
 # CONFIGURAÇÃO DO APP
 # =========================================
@@ -114,10 +116,16 @@ st.sidebar.markdown("<div class='sidebar-title'>✌️ Bora Alí</div>", unsafe_
 st.sidebar.page_link("app.py", label="🏠 Início")
 st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
 st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
-st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão 2026")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
 st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
 st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
 st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# =========================================
+# AQUECIMENTO DOS CACHES (SEGUNDO PLANO)
+# =========================================
+aquecimento.iniciar_em_segundo_plano()
 
 # =========================================
 # CABEÇALHO
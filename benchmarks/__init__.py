@@ -0,0 +1 @@
+"""Benchmarks do motor de dados do Bora Alí."""
@@ -0,0 +1,145 @@
+"""Tempo de importação de ``app.py`` e de cada página, por módulo.
+
+Cada script tem suas importações de topo (o que roda antes de qualquer coisa
+aparecer na tela) executadas num processo novo com ``python -X importtime``.
+O relatório mostra, por script, o tempo total de importação (mediana das
+repetições) e os pacotes que mais pesam, somando o tempo próprio de cada
+módulo no seu pacote de topo (``pandas``, ``plotly``, ``boraali``...).
+
+Os resultados são acrescentados a ``benchmarks/importacao.jsonl`` com o
+commit atual, e ``--comparar`` mostra a variação em relação à última
+execução de outro commit.
+
+Uso:
+    python -m benchmarks.importacao [--repeticoes 5] [--top 8] [--saida ARQUIVO] [--comparar]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.paginas import LIMITE_REGRESSAO, RAIZ, _commit, _ler_historico
+
+RESULTADOS = os.path.join(RAIZ, "benchmarks", "importacao.jsonl")
+
+REPETICOES = 5
+TOP = 8
+
+
+def scripts() -> list[str]:
+    """``app.py`` e as páginas, relativos à raiz do projeto."""
+    paginas = sorted(glob.glob(os.path.join(RAIZ, "pages", "*.py")))
+    return ["app.py"] + [os.path.relpath(p, RAIZ) for p in paginas]
+
+
+def importacoes(script: str) -> str:
+    """Código com as importações de topo do script, na ordem original."""
+    with open(os.path.join(RAIZ, script), encoding="utf-8") as f:
+        arvore = ast.parse(f.read(), filename=script)
+    return "\n".join(
+        ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))
+    )
+
+
+def _medir(codigo: str) -> dict[str, tuple[int, int]]:
+    # Saída do -X importtime: "import time: próprio | acumulado | módulo" (µs).
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, env=dict(os.environ, PYTHONPATH=RAIZ), capture_output=True, text=True, check=True,
+    )
+    modulos = {}
+    for linha in saida.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        modulos[nome[1:].rstrip()] = (int(proprio), int(acumulado))
+    return modulos
+
+
+def medir(script: str, repeticoes: int = REPETICOES, top: int = TOP) -> dict:
+    """Tempo total de importação do script e os pacotes mais pesados."""
+    codigo = importacoes(script)
+    totais = []
+    por_pacote: dict[str, list[int]] = defaultdict(list)
+    for _ in range(repeticoes):
+        modulos = _medir(codigo)
+        # Módulos sem recuo foram importados diretamente: o acumulado deles soma tudo.
+        totais.append(sum(a for nome, (_, a) in modulos.items() if not nome.startswith(" ")))
+        pacotes: dict[str, int] = defaultdict(int)
+        for nome, (proprio, _) in modulos.items():
+            pacotes[nome.strip().split(".")[0]] += proprio
+        for pacote, us in pacotes.items():
+            por_pacote[pacote].append(us)
+
+    pacotes = sorted(
+        ((p, statistics.median(v)) for p, v in por_pacote.items()), key=lambda item: item[1], reverse=True,
+    )
+    return {
+        "script": script,
+        "total_ms": round(statistics.median(totais) / 1e3, 2),
+        "pacotes_ms": {p: round(us / 1e3, 2) for p, us in pacotes[:top]},
+    }
+
+
+def _imprimir(registros: list[dict]) -> None:
+    for r in registros:
+        pacotes = ", ".join(f"{p} {ms:.0f}" for p, ms in r["pacotes_ms"].items())
+        print(f"{r['script']:<38} {r['total_ms']:9.1f} ms   {pacotes}")
+
+
+def comparar(registros: list[dict], historico: list[dict]) -> None:
+    """Variação do total de cada script em relação à última execução de outro commit."""
+    commit = registros[0].get("commit") if registros else None
+    anteriores = {r["script"]: r for r in historico if r.get("commit") != commit}
+    pares = [(r, anteriores[r["script"]]) for r in registros if r["script"] in anteriores]
+    if not pares:
+        print("Nenhuma execução anterior de outro commit para comparar.")
+        return
+
+    print(f"\n{'script':<38} {'commit':>9} {'antes':>9} {'agora':>9} {'variação':>9}")
+    for r, antes in pares:
+        variacao = (r["total_ms"] / antes["total_ms"] - 1) * 100 if antes["total_ms"] else 0.0
+        alerta = "  <-- regressão" if variacao > LIMITE_REGRESSAO else ""
+        print(
+            f"{r['script']:<38} {antes.get('commit') or '?':>9} {antes['total_ms']:9.1f} "
+            f"{r['total_ms']:9.1f} {variacao:+8.1f}%{alerta}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES)
+    parser.add_argument("--top", type=int, default=TOP, help="pacotes mostrados por script")
+    parser.add_argument("--saida", default=RESULTADOS, help="arquivo JSONL de resultados")
+    parser.add_argument("--comparar", action="store_true", help="compara com a última execução de outro commit")
+    args = parser.parse_args(argv)
+
+    commit = _commit()
+    data = time.strftime("%Y-%m-%dT%H:%M:%S")
+    registros = []
+    for script in scripts():
+        r = medir(script, args.repeticoes, args.top)
+        r.update(commit=commit, data=data)
+        registros.append(r)
+
+    _imprimir(registros)
+    if args.comparar:
+        comparar(registros, _ler_historico(args.saida))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "a", encoding="utf-8") as f:
+        for r in registros:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    print(f"\nResultados acrescentados a {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
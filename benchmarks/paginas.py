@@ -0,0 +1,367 @@
+"""Benchmark da computação por trás de cada página, em várias escalas.
+
+Para cada escala, um processo separado aponta o motor (``BORAALI_CSV`` /
+``BORAALI_PARQUET``) para uma cópia ampliada do dataset e mede, por etapa:
+
+* ``carga``: leitura do dataset e montagem do cubo, a frio;
+* por página, ``filtro``, ``agregacao`` e ``figura`` (montagem do Plotly),
+  com o tempo da primeira execução (``frio``, inclui os pré-cálculos da
+  página), a mediana das seguintes (``quente``) e o pico de memória.
+
+Com ``--sintetico``, cada escala é gerada por ``boraali.sintetico`` (tarifas
+e temperaturas sorteadas do modelo aprendido) em vez de cópias com ruído.
+
+Os resultados são acrescentados a ``benchmarks/resultados.jsonl`` com o
+commit atual, e ``--comparar`` mostra a variação em relação à última
+execução de outro commit.
+
+Uso:
+    python -m benchmarks.paginas [--escalas 1 4 16] [--formato csv|parquet]
+                                 [--repeticoes 5] [--sintetico] [--saida ARQUIVO] [--comparar]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados.jsonl")
+
+ESCALAS = [1, 4, 16]
+REPETICOES = 5
+
+# Variação (em %) a partir da qual ``--comparar`` marca uma regressão.
+LIMITE_REGRESSAO = 20.0
+
+MESES = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
+}
+
+Etapas = list[tuple[str, Callable]]
+
+
+# ===========================
+# DATASET AMPLIADO
+# ===========================
+def ampliar_csv(origem: str, destino: str, escala: int, semente: int = 0) -> int:
+    """Grava ``escala`` cópias do CSV com ruído de ±10% na tarifa.
+
+    As chaves (rota, companhia, mês) se repetem: o volume bruto cresce, como
+    com mais voos por célula, mas o cubo mantém o mesmo tamanho.
+    """
+    base = pd.read_csv(origem)
+    rng = np.random.default_rng(semente)
+    with open(destino, "w", encoding="utf-8", newline="") as f:
+        for i in range(escala):
+            copia = base if i == 0 else base.assign(
+                TARIFA=(base["TARIFA"] * rng.uniform(0.9, 1.1, len(base))).round(2)
+            )
+            copia.to_csv(f, index=False, header=(i == 0))
+    return len(base) * escala
+
+
+# ===========================
+# COMPUTAÇÃO DE CADA PÁGINA
+# ===========================
+def _paginas(origem: str, destino: str) -> dict[str, Etapas]:
+    # Importados aqui: o processo de medição já tem o ambiente apontado.
+    import plotly.express as px
+
+    from boraali import companhias, cubo, dados, orcamento, previsao, projecao, radar
+    from boraali.constantes import ESTACOES
+
+    def historico_agregar(df):
+        g = cubo.agregar(df, ["ANO", "MES"])[["ANO", "MES", "TARIFA", "TEMP_MEDIA"]]
+        g["MES_NOME"] = g["MES"].map(MESES)
+        return g
+
+    def ranking_agregar(df):
+        anos = dados.anos() + projecao.anos_projetados()
+        agg = projecao.agregar(df, ["DESTINO"], anos=anos)[["DESTINO", "TARIFA"]].round(0)
+        return agg.sort_values("TARIFA")
+
+    def ranking_figura(agg):
+        return (
+            px.bar(agg.head(5), x="TARIFA", y="DESTINO", orientation="h", text="TARIFA"),
+            px.bar(agg.tail(3), x="TARIFA", y="DESTINO", orientation="h", text="TARIFA"),
+        )
+
+    coluna_previsao = f"PREVISAO_{previsao.ano_alvo()}"
+
+    def previsao_agregar(df):
+        df = df.rename(columns={"PREVISAO": coluna_previsao})
+        df["MES_NOME"] = df["MES"].map(MESES)
+        return df
+
+    def orcamento_agregar(df):
+        temp = cubo.agregar(df, [])["TEMP_MEDIA"].iloc[0]
+        g = cubo.agregar(df, ["MES"])[["MES", "TARIFA"]].round(2)
+        g["MES_NOME"] = g["MES"].map(MESES)
+        return g, temp
+
+    def companhias_agregar(resultado):
+        mensal, metricas = resultado
+        mensal = mensal.assign(MES_NOME=mensal["MES"].map(MESES))
+        return mensal, metricas.round(2)
+
+    return {
+        "1_historico": [
+            ("filtro", lambda _: cubo.rota(origem, destino)),
+            ("agregacao", historico_agregar),
+            ("figura", lambda g: px.line(g, x="MES_NOME", y="TARIFA", color="ANO", markers=True)),
+        ],
+        "2_ranking": [
+            ("filtro", lambda _: cubo.filtrar(cubo.obter(), meses=ESTACOES["Verão"])),
+            ("agregacao", ranking_agregar),
+            ("figura", ranking_figura),
+        ],
+        "3_previsao": [
+            ("filtro", lambda _: previsao.da_rota(origem, destino)),
+            ("agregacao", previsao_agregar),
+            ("figura", lambda g: px.line(g, x="MES_NOME", y=coluna_previsao, markers=True)),
+        ],
+        "4_orcamento": [
+            ("filtro", lambda _: cubo.filtrar(cubo.rota(origem, destino), anos=dados.anos())),
+            ("agregacao", orcamento_agregar),
+            ("figura", lambda r: px.bar(r[0], x="MES_NOME", y="TARIFA", color="TARIFA")),
+        ],
+        "4_orcamento_todos": [
+            ("filtro", lambda _: orcamento.abaixo_de(origem, 1000.0)),
+            ("agregacao", lambda df: df.drop_duplicates("DESTINO")),
+            ("figura", lambda df: px.bar(df, x="DESTINO", y="TARIFA", color="TARIFA")),
+        ],
+        "5_radar": [
+            ("filtro", lambda _: radar.camada(origem, 7)),
+            ("agregacao", lambda agg: (agg.loc[agg["TARIFA_MEDIA"].idxmin()], agg)),
+            ("figura", lambda r: px.scatter_mapbox(
+                r[1], lat="lat", lon="lon", size="TARIFA_MEDIA", color="CATEGORIA", hover_name="DESTINO",
+            )),
+        ],
+        "6_companhias": [
+            ("filtro", lambda _: companhias.da_estacao("Verão")),
+            ("agregacao", companhias_agregar),
+            ("figura", lambda r: px.line(r[0], x="MES_NOME", y="TARIFA", color="COMPANHIA", markers=True)),
+        ],
+    }
+
+
+# ===========================
+# MEDIÇÃO
+# ===========================
+def _executar(etapas: Etapas, medir_memoria: bool = False) -> dict[str, tuple[float, int]]:
+    medidas = {}
+    valor = None
+    for nome, funcao in etapas:
+        if medir_memoria:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        valor = funcao(valor)
+        segundos = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1] - base if medir_memoria else 0
+        medidas[nome] = (segundos, pico)
+    return medidas
+
+
+def _registro(pagina: str, etapa: str, frio: float, quentes: list[float], pico: int) -> dict:
+    return {
+        "pagina": pagina,
+        "etapa": etapa,
+        "frio_s": round(frio, 6),
+        "quente_s": round(statistics.median(quentes), 6) if quentes else None,
+        "pico_mb": round(pico / 2**20, 3),
+    }
+
+
+def medir(repeticoes: int = REPETICOES) -> list[dict]:
+    """Mede todas as páginas no dataset apontado pelo ambiente atual."""
+    from boraali import cubo, dados
+
+    registros = []
+
+    # Carga a frio: tempo sem tracemalloc, memória numa segunda carga.
+    inicio = time.perf_counter()
+    dados.carregar_dados()
+    cubo.obter()
+    frio = time.perf_counter() - inicio
+    dados.limpar_cache()
+    tracemalloc.start()
+    dados.carregar_dados()
+    cubo.obter()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    registros.append(_registro("0_dados", "carga", frio, [], pico))
+
+    # A rota mais movimentada existe em qualquer escala.
+    idx = dados.indice_rotas()
+    origem, destino = max(idx.rotas(), key=lambda r: idx.tamanho_rota(*r))
+
+    for pagina, etapas in _paginas(origem, destino).items():
+        frias = _executar(etapas)
+        quentes = [_executar(etapas) for _ in range(repeticoes)]
+        tracemalloc.start()
+        memoria = _executar(etapas, medir_memoria=True)
+        tracemalloc.stop()
+        for nome, _ in etapas:
+            registros.append(_registro(
+                pagina, nome, frias[nome][0], [q[nome][0] for q in quentes], memoria[nome][1],
+            ))
+    return registros
+
+
+# ===========================
+# ORQUESTRAÇÃO
+# ===========================
+def _commit() -> str | None:
+    try:
+        saida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return saida.stdout.strip() or None
+
+
+def _gerar(escala: int, formato: str, sintetico: bool, temporario: str) -> tuple[str, str, int]:
+    from boraali import armazenamento, cubo, dados, sintetico as gerador
+
+    csv = os.path.join(temporario, f"escala-{escala}.csv")
+    parquet = os.path.join(temporario, f"escala-{escala}-parquet")
+    if not sintetico:
+        linhas = ampliar_csv(dados.CAMINHO_CSV, csv, escala)
+        if formato == "parquet":
+            armazenamento.converter_csv(csv, parquet)
+        return csv, parquet, linhas
+
+    linhas = len(dados.carregar_dados()) * escala
+    lotes = gerador.blocos(gerador.aprender(cubo.obter()), linhas)
+    if formato == "parquet":
+        gerador.gravar_parquet(lotes, parquet)
+    else:
+        gerador.gravar_csv(lotes, csv)
+    return csv, parquet, linhas
+
+
+def _medir_escala(escala: int, formato: str, repeticoes: int, temporario: str, sintetico: bool) -> list[dict]:
+    csv, parquet, linhas = _gerar(escala, formato, sintetico, temporario)
+
+    ambiente = dict(
+        os.environ,
+        BORAALI_CSV=csv,
+        BORAALI_PARQUET=parquet,
+        BORAALI_MODELOS=os.path.join(temporario, f"modelos-{escala}"),
+    )
+    # Um processo por escala: carga realmente a frio e memória isolada.
+    saida = subprocess.run(
+        [sys.executable, "-m", "benchmarks.paginas", "--medir", "--repeticoes", str(repeticoes)],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True, check=True,
+    )
+    registros = [json.loads(linha) for linha in saida.stdout.splitlines() if linha.startswith("{")]
+    for r in registros:
+        r.update(escala=escala, linhas=linhas, formato=formato, gerador="sintetico" if sintetico else "copias")
+    return registros
+
+
+def _imprimir(registros: list[dict]) -> None:
+    print(f"{'escala':>6} {'pagina':<18} {'etapa':<10} {'frio (ms)':>10} {'quente (ms)':>12} {'pico (MB)':>10}")
+    for r in registros:
+        quente = f"{r['quente_s'] * 1e3:12.2f}" if r["quente_s"] is not None else f"{'-':>12}"
+        print(
+            f"{r['escala']:>6} {r['pagina']:<18} {r['etapa']:<10} "
+            f"{r['frio_s'] * 1e3:10.2f} {quente} {r['pico_mb']:10.2f}"
+        )
+
+
+def _chave(r: dict) -> tuple:
+    return (r["formato"], r.get("gerador", "copias"), r["escala"], r["pagina"], r["etapa"])
+
+
+def comparar(registros: list[dict], historico: list[dict]) -> None:
+    """Variação de cada etapa em relação à última execução de outro commit."""
+    commit = registros[0].get("commit") if registros else None
+    anteriores = {}
+    for r in historico:
+        if r.get("commit") != commit:
+            anteriores[_chave(r)] = r
+    if not anteriores:
+        print("Nenhuma execução anterior de outro commit para comparar.")
+        return
+
+    pares = [(r, anteriores[_chave(r)]) for r in registros if _chave(r) in anteriores]
+    if not pares:
+        print("Nenhuma etapa em comum com execuções anteriores de outro commit.")
+        return
+
+    print(f"\n{'escala':>6} {'pagina':<18} {'etapa':<10} {'commit':>9} {'quente':>9} {'pico':>9}")
+    for r, antes in pares:
+        tempo_atual = r["quente_s"] if r["quente_s"] is not None else r["frio_s"]
+        tempo_antes = antes["quente_s"] if antes["quente_s"] is not None else antes["frio_s"]
+        var_tempo = (tempo_atual / tempo_antes - 1) * 100 if tempo_antes else 0.0
+        var_pico = (r["pico_mb"] / antes["pico_mb"] - 1) * 100 if antes["pico_mb"] else 0.0
+        alerta = "  <-- regressão" if max(var_tempo, var_pico) > LIMITE_REGRESSAO else ""
+        print(
+            f"{r['escala']:>6} {r['pagina']:<18} {r['etapa']:<10} {antes.get('commit') or '?':>9} "
+            f"{var_tempo:+8.1f}% {var_pico:+8.1f}%{alerta}"
+        )
+
+
+def _ler_historico(caminho: str) -> list[dict]:
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=ESCALAS)
+    parser.add_argument("--formato", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES)
+    parser.add_argument("--sintetico", action="store_true",
+                        help="gera cada escala com boraali.sintetico em vez de copiar o CSV")
+    parser.add_argument("--saida", default=RESULTADOS, help="arquivo JSONL de resultados")
+    parser.add_argument("--comparar", action="store_true", help="compara com a última execução de outro commit")
+    parser.add_argument("--medir", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        for r in medir(args.repeticoes):
+            print(json.dumps(r))
+        return
+
+    commit = _commit()
+    data = pd.Timestamp.now().isoformat(timespec="seconds")
+    registros = []
+    with tempfile.TemporaryDirectory(prefix="boraali-bench-") as temporario:
+        for escala in args.escalas:
+            for r in _medir_escala(escala, args.formato, args.repeticoes, temporario, args.sintetico):
+                r.update(commit=commit, data=data)
+                registros.append(r)
+
+    _imprimir(registros)
+    historico = _ler_historico(args.saida)
+    if args.comparar:
+        comparar(registros, historico)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "a", encoding="utf-8") as f:
+        for r in registros:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    print(f"\nResultados acrescentados a {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
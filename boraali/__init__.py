@@ -0,0 +1 @@
+"""Motor de dados e análises do painel Bora Alí."""
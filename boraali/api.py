@@ -0,0 +1,418 @@
+"""Análises do painel como funções puras, sem Streamlit.
+
+Cada página chama uma função daqui e só cuida de desenhar o resultado. As
+funções recebem os filtros da página e devolvem dados simples (tabelas
+``pandas``, números e textos) em ``dataclasses``; quando a combinação de
+filtros não tem dados, devolvem ``None``. Assim a mesma computação pode ser
+usada em jobs em lote, testes, benchmarks ou outra interface, e sua
+latência pode ser medida fora de uma sessão do Streamlit. Com a
+instrumentação ligada, cada chamada vira uma etapa medida.
+
+Os resultados ficam no cache de resultados do processo (``boraali.cache``),
+compartilhado entre as sessões: as páginas não devem alterá-los.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from boraali import cache, companhias, cubo, dados, explorador, instrumentacao, orcamento, previsao, projecao, quantis, radar
+from boraali.constantes import ESTACOES
+
+MESES = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
+}
+
+
+def clima(temp: float) -> str:
+    """Faixa de clima de uma temperatura média."""
+    if temp < 20:
+        return "❄️ Frio"
+    elif temp <= 25:
+        return "🌤️ Ameno"
+    return "☀️ Quente"
+
+
+# ===========================
+# HISTÓRICO POR ROTA
+# ===========================
+@dataclass
+class HistoricoRota:
+    tabela: pd.DataFrame  # ANO, MES, TARIFA, TEMP_MEDIA, MES_NOME
+    media_geral: float
+    melhor_mes: int
+    melhor_valor: float
+    temp_media: float
+    clima: str
+
+
+@instrumentacao.cronometrado("analise: historico_rota")
+@cache.memorizar
+def historico_rota(origem: str, destino: str) -> HistoricoRota | None:
+    """Tarifa mensal por ano da rota, com o melhor mês e o clima."""
+    df_filtro = cubo.rota(origem, destino)
+    if df_filtro.empty:
+        return None
+
+    tabela = cubo.agregar(df_filtro, ["ANO", "MES"])[["ANO", "MES", "TARIFA", "TEMP_MEDIA"]]
+    tabela["MES_NOME"] = tabela["MES"].map(MESES)
+
+    temp_media = tabela["TEMP_MEDIA"].mean()
+    por_mes = tabela.groupby("MES")["TARIFA"].mean()
+    return HistoricoRota(
+        tabela=tabela,
+        media_geral=tabela["TARIFA"].mean(),
+        melhor_mes=por_mes.idxmin(),
+        melhor_valor=por_mes.min(),
+        temp_media=temp_media,
+        clima=clima(temp_media),
+    )
+
+
+# ===========================
+# DISTRIBUIÇÃO DAS TARIFAS
+# ===========================
+QUANTIS = {"P10": 0.10, "MEDIANA": 0.50, "P90": 0.90}
+
+# Veredito pela fração das tarifas da rota até o preço (até o limite).
+VEREDITOS = [
+    (0.25, "🟢 Ótimo preço"),
+    (0.50, "🙂 Bom preço"),
+    (0.75, "😐 Na média"),
+    (1.01, "🔴 Caro"),
+]
+
+
+@dataclass
+class DistribuicaoRota:
+    p10: float
+    mediana: float
+    p90: float
+    por_mes: pd.DataFrame  # MES, P10, MEDIANA, P90, MES_NOME
+    observacoes: int  # passagens vendidas, ou tarifas médias mensais (ver por_passagem)
+    por_passagem: bool  # esboços da ingestão (passagens) ou das médias do dataset
+
+
+@instrumentacao.cronometrado("analise: distribuicao_rota")
+@cache.memorizar
+def distribuicao_rota(origem: str, destino: str, companhia: str | None = None) -> DistribuicaoRota | None:
+    """p10, mediana e p90 das tarifas da rota (todos os anos), no total e por mês.
+
+    Com os esboços da ingestão, a distribuição é a das passagens vendidas;
+    sem eles, a das tarifas médias mensais por companhia (``quantis.por_passagem``).
+    """
+    celulas = quantis.da_rota(origem, destino)
+    if companhia is not None:
+        celulas = quantis.filtrar(celulas, companhias=[companhia])
+    if celulas.empty:
+        return None
+
+    esboco = quantis.esboco(celulas)
+    p10, mediana, p90 = esboco.quantis(list(QUANTIS.values()))
+    por_mes = quantis.quantis_por(celulas, "MES", QUANTIS)
+    por_mes["MES_NOME"] = por_mes["MES"].map(MESES)
+    return DistribuicaoRota(
+        p10=p10, mediana=mediana, p90=p90, por_mes=por_mes,
+        observacoes=esboco.total, por_passagem=quantis.por_passagem(),
+    )
+
+
+@dataclass
+class AvaliacaoPreco:
+    percentil: float  # % das tarifas da rota até o preço informado
+    veredito: str
+    mediana: float
+    por_passagem: bool  # como em DistribuicaoRota
+
+
+@instrumentacao.cronometrado("analise: avaliar_preco")
+def avaliar_preco(origem: str, destino: str, preco: float, mes: int | None = None) -> AvaliacaoPreco | None:
+    """Compara um preço com a distribuição da rota (no mês, se informado)."""
+    celulas = quantis.da_rota(origem, destino)
+    if mes is not None:
+        celulas = quantis.filtrar(celulas, meses=[mes])
+    if celulas.empty:
+        return None
+
+    esboco = quantis.esboco(celulas)
+    fracao = esboco.percentil_de(preco)
+    veredito = next(texto for limite, texto in VEREDITOS if fracao <= limite)
+    return AvaliacaoPreco(
+        percentil=fracao * 100, veredito=veredito, mediana=esboco.quantil(0.5),
+        por_passagem=quantis.por_passagem(),
+    )
+
+
+# ===========================
+# RANKING POR ESTAÇÃO
+# ===========================
+@dataclass
+class RankingEstacao:
+    tabela: pd.DataFrame  # DESTINO, TARIFA_MEDIA_ESTACAO (crescente)
+    top5: pd.DataFrame
+    evitar3: pd.DataFrame
+    mediana: float
+    vantagem_pct: float
+
+
+def anos_ranking() -> list[int]:
+    """Anos reais e projetados que o ranking aceita."""
+    return dados.anos() + projecao.anos_projetados()
+
+
+@instrumentacao.cronometrado("analise: ranking_estacao")
+@cache.memorizar(conjuntos=("anos",))
+def ranking_estacao(estacao: str, anos: list[int], origem: str | None = None) -> RankingEstacao | None:
+    """Destinos da estação ordenados pela tarifa média (anos projetados inclusos)."""
+    # Cubo pré-agregado: inteiro ou só a fatia da origem (consulta ao índice)
+    df = cubo.obter() if origem is None else cubo.da_origem(origem)
+    df_filtrado = cubo.filtrar(df, meses=ESTACOES[estacao])
+
+    agg = projecao.agregar(df_filtrado, ["DESTINO"], anos=anos)
+    if agg.empty:
+        return None
+
+    tabela = (
+        agg[["DESTINO", "TARIFA"]]
+        .round(0)
+        .rename(columns={"TARIFA": "TARIFA_MEDIA_ESTACAO"})
+    ).sort_values("TARIFA_MEDIA_ESTACAO", ascending=True)
+
+    top5 = tabela.head(5)
+    melhor = top5["TARIFA_MEDIA_ESTACAO"].iloc[0]
+    mediana = tabela["TARIFA_MEDIA_ESTACAO"].median()
+    return RankingEstacao(
+        tabela=tabela,
+        top5=top5,
+        evitar3=tabela.tail(3).sort_values("TARIFA_MEDIA_ESTACAO", ascending=False),
+        mediana=mediana,
+        vantagem_pct=((mediana - melhor) / mediana) * 100 if mediana != 0 else np.nan,
+    )
+
+
+# ===========================
+# PREVISÃO
+# ===========================
+@dataclass
+class PrevisaoRota:
+    tabela: pd.DataFrame  # MES, TARIFA, PREVISAO_<ano>, MES_NOME
+    melhor: pd.Series
+    pior: pd.Series
+    queda: bool
+    variacao_pct: float
+    ano: int  # ano previsto
+    anos_treino: list[int]  # anos reais usados no ajuste
+
+    @property
+    def coluna(self) -> str:
+        """Nome da coluna da previsão na ``tabela`` (ex.: ``PREVISAO_2026``)."""
+        return f"PREVISAO_{self.ano}"
+
+
+@instrumentacao.cronometrado("analise: previsao_rota")
+@cache.memorizar
+def previsao_rota(origem: str, destino: str, companhia: str | None = None) -> PrevisaoRota | None:
+    """Previsão mensal do próximo ano para a rota (ou rota × companhia)."""
+    ano = previsao.ano_alvo()
+    coluna = f"PREVISAO_{ano}"
+    tabela = previsao.da_rota(
+        origem, destino, previsao.TODAS if companhia is None else companhia
+    ).rename(columns={"HISTORICO": "TARIFA", "PREVISAO": coluna})
+    if tabela.empty:
+        return None
+
+    tabela["MES_NOME"] = tabela["MES"].map(MESES)
+    melhor = tabela.loc[tabela[coluna].idxmin()]
+    pior = tabela.loc[tabela[coluna].idxmax()]
+    return PrevisaoRota(
+        tabela=tabela,
+        melhor=melhor,
+        pior=pior,
+        queda=bool(tabela[coluna].iloc[-1] < tabela[coluna].iloc[0]),
+        variacao_pct=((pior[coluna] - melhor[coluna]) / melhor[coluna]) * 100,
+        ano=ano,
+        anos_treino=previsao.anos_treino(),
+    )
+
+
+# ===========================
+# MÊS IDEAL x ORÇAMENTO
+# ===========================
+# Período da média histórica por mês da página de orçamento.
+ANOS_ORCAMENTO = [2023, 2024, 2025]
+
+
+@dataclass
+class OrcamentoRota:
+    meses: pd.DataFrame  # MES, TARIFA, MES_NOME
+    baratos: pd.DataFrame  # meses dentro do orçamento, do mais barato ao mais caro
+    mais_proximo: pd.Series  # mês mais próximo do orçamento
+    mais_barato: pd.Series
+    mais_caro: pd.Series
+    temp_media: float
+    clima: str
+
+
+@instrumentacao.cronometrado("analise: orcamento_rota")
+@cache.memorizar
+def orcamento_rota(origem: str, destino: str, valor: float) -> OrcamentoRota | None:
+    """Meses da rota cuja tarifa média histórica cabe no orçamento."""
+    # Fatia da rota no cubo pré-agregado (consulta ao índice, sem varredura)
+    df_filtro = cubo.filtrar(cubo.rota(origem, destino), anos=ANOS_ORCAMENTO)
+    if df_filtro.empty:
+        return None
+
+    temp_media = cubo.agregar(df_filtro, [])["TEMP_MEDIA"].iloc[0]
+
+    df_mes = cubo.agregar(df_filtro, ["MES"])[["MES", "TARIFA"]].round(2)
+    df_mes["MES_NOME"] = df_mes["MES"].map(MESES)
+    return OrcamentoRota(
+        meses=df_mes,
+        baratos=df_mes[df_mes["TARIFA"] <= valor].sort_values("TARIFA"),
+        mais_proximo=df_mes.iloc[(df_mes["TARIFA"] - valor).abs().argmin()],
+        mais_barato=df_mes.loc[df_mes["TARIFA"].idxmin()],
+        mais_caro=df_mes.loc[df_mes["TARIFA"].idxmax()],
+        temp_media=temp_media,
+        clima=clima(temp_media),
+    )
+
+
+@dataclass
+class OrcamentoOrigem:
+    opcoes: pd.DataFrame  # DESTINO, MES, TARIFA, TEMP_MEDIA, MES_NOME (crescente)
+    melhor_por_destino: pd.DataFrame
+    mais_barato: pd.Series | None  # opção mais barata, mesmo fora do orçamento
+
+
+@instrumentacao.cronometrado("analise: orcamento_origem")
+@cache.memorizar
+def orcamento_origem(origem: str, valor: float) -> OrcamentoOrigem:
+    """Todos os (destino, mês) da origem dentro do orçamento, ranqueados."""
+    # Busca binária no índice de orçamento: já vem ordenado pela tarifa.
+    opcoes = orcamento.abaixo_de(origem, valor)
+    opcoes["MES_NOME"] = opcoes["MES"].map(MESES)
+
+    mais_barato = opcoes.iloc[0] if not opcoes.empty else None
+    if mais_barato is None:
+        primeiro = orcamento.obter().mais_barato(origem)
+        if not primeiro.empty:
+            mais_barato = primeiro.assign(MES_NOME=primeiro["MES"].map(MESES)).iloc[0]
+
+    return OrcamentoOrigem(
+        opcoes=opcoes,
+        melhor_por_destino=opcoes.drop_duplicates("DESTINO"),
+        mais_barato=mais_barato,
+    )
+
+
+# ===========================
+# RADAR DE OPORTUNIDADES
+# ===========================
+@dataclass
+class Radar:
+    camada: pd.DataFrame  # DESTINO, TARIFA_MEDIA, lat, lon, CATEGORIA
+    melhor: pd.Series
+    pior: pd.Series
+
+
+@instrumentacao.cronometrado("analise: radar_oportunidades")
+@cache.memorizar
+def radar_oportunidades(origem: str, mes: int) -> Radar | None:
+    """Camada do mapa (origem × mês) com o destino mais barato e o mais caro."""
+    # Tarifa por destino, coordenadas e categoria Barato/Médio/Caro (tercis)
+    agg = radar.camada(origem, mes)
+    if agg.empty:
+        return None
+    return Radar(
+        camada=agg,
+        melhor=agg.loc[agg["TARIFA_MEDIA"].idxmin()],
+        pior=agg.loc[agg["TARIFA_MEDIA"].idxmax()],
+    )
+
+
+# ===========================
+# ANÁLISE DAS COMPANHIAS
+# ===========================
+@dataclass
+class CompanhiasEstacao:
+    mensal: pd.DataFrame  # COMPANHIA, MES, TARIFA, MES_NOME
+    metricas: pd.DataFrame  # por COMPANHIA, arredondadas
+    mais_barata: str
+    mais_estavel: str
+    maior_oscilacao: str
+
+
+@instrumentacao.cronometrado("analise: companhias_estacao")
+@cache.memorizar
+def companhias_estacao(estacao: str) -> CompanhiasEstacao | None:
+    """Tarifas mensais e métricas de LATAM, GOL e AZUL numa estação."""
+    mensal, metricas = companhias.da_estacao(estacao)
+    if mensal.empty:
+        return None
+
+    mensal["MES_NOME"] = mensal["MES"].map(MESES)
+    m = metricas.round(2)
+    return CompanhiasEstacao(
+        mensal=mensal,
+        metricas=m,
+        mais_barata=m["mean"].idxmin(),
+        mais_estavel=m["estabilidade"].idxmax(),
+        maior_oscilacao=m["volatilidade_%"].idxmax(),
+    )
+
+
+@dataclass
+class CompanhiasTodasEstacoes:
+    mensal: pd.DataFrame  # ESTACAO, COMPANHIA, MES, TARIFA, MES_NOME
+    media: pd.DataFrame  # COMPANHIA × ESTACAO
+    estabilidade: pd.DataFrame  # COMPANHIA × ESTACAO
+
+
+@instrumentacao.cronometrado("analise: companhias_todas_estacoes")
+@cache.memorizar
+def companhias_todas_estacoes() -> CompanhiasTodasEstacoes:
+    """As métricas das companhias para as quatro estações, lado a lado."""
+    mensal, metricas = companhias.obter()
+
+    def por_estacao(coluna: str) -> pd.DataFrame:
+        tabela = metricas.pivot(index="COMPANHIA", columns="ESTACAO", values=coluna)
+        return tabela[[e for e in ESTACOES if e in tabela.columns]]
+
+    return CompanhiasTodasEstacoes(
+        mensal=mensal.assign(MES_NOME=mensal["MES"].map(MESES)),
+        media=por_estacao("mean"),
+        estabilidade=por_estacao("estabilidade"),
+    )
+
+
+# ===========================
+# EXPLORADOR (TABELA DINÂMICA)
+# ===========================
+@dataclass
+class Exploracao:
+    tabela: pd.DataFrame  # linhas × colunas escolhidas, valores da medida
+    celulas: int  # células do cubo somadas
+    registros: int  # linhas do dataset representadas
+
+
+@instrumentacao.cronometrado("analise: explorar")
+@cache.memorizar(conjuntos=("filtros",))
+def explorar(
+    linhas: list[str],
+    colunas: list[str],
+    filtros: dict[str, list] | None = None,
+    medida: str = "TARIFA",
+) -> Exploracao | None:
+    """Tabela dinâmica da medida por quaisquer dimensões do cubo."""
+    selecao = explorador.filtrar(filtros)
+    if selecao.empty:
+        return None
+    return Exploracao(
+        tabela=explorador.pivotar(linhas, colunas, filtros, medida),
+        celulas=len(selecao),
+        registros=int(selecao["N"].sum()),
+    )
@@ -0,0 +1,173 @@
+"""Aquecimento dos caches para os filtros mais procurados.
+
+Calcula de antemão, pela ``api``, os resultados que o tráfego real pede
+primeiro, na ordem:
+
+1. ranking de cada estação (todos os anos, todas as origens) e análise das
+   companhias por estação e lado a lado;
+2. as ``BORAALI_AQUECIMENTO_ROTAS`` rotas com mais linhas: histórico,
+   previsão, faixa de preços e mês ideal com o orçamento inicial da página;
+3. todas as camadas origem × mês do radar.
+
+De quebra, os pré-cálculos (cubo, índices, previsões...) ficam prontos. Os
+resultados vão para o cache de resultados (memória e disco), então rodar o
+aquecimento uma vez por deploy (``python -m boraali.aquecimento``) aquece
+também os outros workers. Dentro do Streamlit, a primeira leitura de dados
+do processo (``boraali.dados``, por qualquer página) e a página inicial
+disparam o aquecimento em segundo plano, uma vez por processo.
+
+O trabalho para ao estourar o orçamento de tempo
+(``BORAALI_AQUECIMENTO_SEGUNDOS``) ou de espaço do cache
+(``BORAALI_AQUECIMENTO_MB``), o que vier primeiro. O espaço é medido na
+memória do cache de resultados ou, com a memória desligada
+(``BORAALI_CACHE_RESULTADOS_MB=0``), no disco; sem nenhum dos dois não há
+onde guardar os resultados e o aquecimento não roda.
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from boraali import config
+
+# O ``app.py`` importa este módulo só para disparar a thread: o motor (api,
+# cache, dados e, com eles, pandas e pyarrow) é importado dentro das funções,
+# já na thread de aquecimento, e a página inicial não paga esse custo.
+
+# Orçamento inicial da página "Mês ideal x orçamento".
+ORCAMENTO_INICIAL = 100.0
+
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+@dataclass
+class Relatorio:
+    tarefas: int = 0
+    concluidas: int = 0
+    erros: list[str] = field(default_factory=list)
+    segundos: float = 0.0
+    mb: float = 0.0
+    motivo: str = "completo"
+    nivel: str = "memória"
+
+    def __str__(self) -> str:
+        return (
+            f"Aquecimento {self.motivo}: {self.concluidas}/{self.tarefas} tarefas em "
+            f"{self.segundos:.1f}s, {self.mb:.1f} MB no cache ({self.nivel}), {len(self.erros)} erros"
+        )
+
+
+def rotas_populares(n: int) -> list[tuple[str, str]]:
+    """As ``n`` rotas com mais linhas no dataset."""
+    from boraali import dados
+
+    idx = dados.indice_rotas()
+    return sorted(idx.rotas(), key=lambda r: idx.tamanho_rota(*r), reverse=True)[:n]
+
+
+def tarefas(rotas: int) -> Iterator[tuple[str, Callable[[], object]]]:
+    """Chamadas da ``api`` a aquecer, das mais às menos procuradas.
+
+    Cada chamada repete os argumentos que a página correspondente passa.
+    """
+    from boraali import api, dados
+    from boraali.constantes import ESTACOES
+
+    anos = api.anos_ranking()
+    for estacao in ESTACOES:
+        yield f"ranking {estacao}", lambda e=estacao: api.ranking_estacao(e, anos, origem=None)
+        yield f"companhias {estacao}", lambda e=estacao: api.companhias_estacao(e)
+    yield "companhias lado a lado", api.companhias_todas_estacoes
+
+    for origem, destino in rotas_populares(rotas):
+        yield f"historico {origem}-{destino}", lambda o=origem, d=destino: api.historico_rota(o, d)
+        yield f"previsao {origem}-{destino}", lambda o=origem, d=destino: api.previsao_rota(o, d, None)
+        yield f"orcamento {origem}-{destino}", (
+            lambda o=origem, d=destino: api.orcamento_rota(o, d, ORCAMENTO_INICIAL)
+        )
+        yield f"distribuicao {origem}-{destino}", lambda o=origem, d=destino: api.distribuicao_rota(o, d)
+
+    for origem in dados.origens():
+        for mes in api.MESES:
+            yield f"radar {origem} {mes}", lambda o=origem, m=mes: api.radar_oportunidades(o, m)
+
+
+def _ocupado(resultados) -> tuple[str, Callable[[], int]] | None:
+    # Nível do cache em que o orçamento é medido e a função que o mede.
+    if resultados.limite_bytes > 0:
+        return "memória", lambda: resultados.estatisticas()["bytes"]
+    if resultados.disco is not None:
+        return "disco", lambda: resultados.disco.estatisticas()["bytes"]
+    return None
+
+
+def aquecer(
+    rotas: int | None = None,
+    segundos: float | None = None,
+    mb: float | None = None,
+) -> Relatorio:
+    """Executa o aquecimento dentro dos orçamentos de tempo e espaço."""
+    from boraali import cache
+
+    medicao = _ocupado(cache.resultados)
+    if medicao is None:
+        return Relatorio(motivo="ignorado (cache de resultados desligado)", nivel="nenhum")
+    nivel, ocupado = medicao
+
+    rotas = config.AQUECIMENTO_ROTAS if rotas is None else rotas
+    segundos = config.AQUECIMENTO_SEGUNDOS if segundos is None else segundos
+    limite = (config.AQUECIMENTO_MB if mb is None else mb) * 2**20
+
+    inicio = time.perf_counter()
+    pendentes = list(tarefas(rotas))
+    relatorio = Relatorio(tarefas=len(pendentes), nivel=nivel)
+    bytes_iniciais = ocupado()
+    for nome, chamada in pendentes:
+        if time.perf_counter() - inicio > segundos:
+            relatorio.motivo = "interrompido pelo tempo"
+            break
+        if ocupado() - bytes_iniciais > limite:
+            relatorio.motivo = f"interrompido pelo espaço ({nivel})"
+            break
+        try:
+            chamada()
+            relatorio.concluidas += 1
+        except Exception as erro:  # um filtro com problema não derruba o resto
+            relatorio.erros.append(f"{nome}: {erro}")
+
+    relatorio.segundos = time.perf_counter() - inicio
+    relatorio.mb = (ocupado() - bytes_iniciais) / 2**20
+    return relatorio
+
+
+def iniciar_em_segundo_plano() -> threading.Thread | None:
+    """Dispara ``aquecer()`` numa thread, uma única vez por processo."""
+    global _thread
+    if not config.AQUECIMENTO:
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=aquecer, name="boraali-aquecimento", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Pré-calcula os resultados mais procurados.")
+    parser.add_argument("--rotas", type=int, default=config.AQUECIMENTO_ROTAS, help="rotas mais movimentadas")
+    parser.add_argument("--segundos", type=float, default=config.AQUECIMENTO_SEGUNDOS, help="orçamento de tempo")
+    parser.add_argument("--mb", type=float, default=config.AQUECIMENTO_MB, help="orçamento de espaço do cache")
+    args = parser.parse_args(argv)
+
+    relatorio = aquecer(args.rotas, args.segundos, args.mb)
+    print(relatorio)
+    for erro in relatorio.erros:
+        print(f"  {erro}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Armazenamento colunar (Parquet) particionado por ANO/MES.
+
+A conversão lê o CSV em blocos e grava um dataset Parquet no layout
+``ANO=<a>/MES=<m>/`` (estilo Hive). A leitura só abre as partições e as
+colunas que a consulta pede: a página de radar lê um único MES, a de
+previsão apenas 2023–2025, e assim por diante.
+
+Uso:
+    python -m boraali.armazenamento [CSV] [DIRETORIO_SAIDA]
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+
+# ===========================
+# ESQUEMA
+# ===========================
+_TEXTO = pa.dictionary(pa.int32(), pa.string())
+
+ESQUEMA = pa.schema([
+    ("COMPANHIA", _TEXTO),
+    ("ANO", pa.int16()),
+    ("MES", pa.int8()),
+    ("ORIGEM", _TEXTO),
+    ("DESTINO", _TEXTO),
+    ("TARIFA", pa.float64()),
+    ("TEMP_MEDIA", pa.float64()),
+])
+
+PARTICOES = ds.partitioning(
+    pa.schema([("ANO", pa.int16()), ("MES", pa.int8())]),
+    flavor="hive",
+)
+
+# Marcador gravado ao final de cada escrita; sua data identifica a versão.
+MARCADOR = "_VERSAO"
+
+TAMANHO_BLOCO = 64 << 20
+
+
+def existe(diretorio: str) -> bool:
+    """Indica se há um dataset Parquet completo em ``diretorio``."""
+    return os.path.isfile(os.path.join(diretorio, MARCADOR))
+
+
+def versao(diretorio: str) -> int:
+    """Versão do dataset (mtime do marcador de escrita)."""
+    return os.stat(os.path.join(diretorio, MARCADOR)).st_mtime_ns
+
+
+def marcar_versao(diretorio: str) -> None:
+    """Atualiza o marcador de versão após uma escrita no dataset."""
+    with open(os.path.join(diretorio, MARCADOR), "w", encoding="utf-8") as f:
+        f.write(str(pd.Timestamp.now()))
+
+
+def _blocos_csv(caminho_csv: str):
+    leitor = pacsv.open_csv(
+        caminho_csv,
+        read_options=pacsv.ReadOptions(block_size=TAMANHO_BLOCO),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c.name: c.type for c in ESQUEMA},
+            include_columns=ESQUEMA.names,
+        ),
+    )
+    for bloco in leitor:
+        yield bloco.select(ESQUEMA.names).cast(ESQUEMA)
+
+
+def gravar(blocos, diretorio: str) -> None:
+    """Grava lotes Arrow (no ``ESQUEMA``) particionados por ANO/MES."""
+    ds.write_dataset(
+        blocos,
+        diretorio,
+        schema=ESQUEMA,
+        format="parquet",
+        partitioning=PARTICOES,
+        existing_data_behavior="overwrite_or_ignore",
+        basename_template="parte-{i}.parquet",
+    )
+    marcar_versao(diretorio)
+
+
+# ===========================
+# VERSÕES DO DATASET
+# ===========================
+@contextlib.contextmanager
+def nova_versao(
+    diretorio: str,
+    manter: bool = True,
+    exceto: Iterable[tuple[int, int]] = (),
+) -> Iterator[str]:
+    """Diretório de uma nova versão do dataset, publicada ao sair do bloco.
+
+    Cada versão é um diretório irmão novo (``.<nome>-XXXX``) e ``diretorio``
+    é um link simbólico para a atual. Com ``manter``, a nova versão já começa
+    com as partições da atual (exceto os pares (ANO, MES) de ``exceto``)
+    como hard links, sem copiar dados, e com cópias dos arquivos de controle
+    (``_*``), que podem ser regravados sem afetar a versão atual.
+
+    Ao fim do bloco, o link é trocado com ``os.replace``, que é atômico: o
+    caminho sempre aponta para um dataset completo, o antigo ou o novo, e só
+    então o antigo é apagado. Se o bloco falhar, a nova versão é descartada
+    e a atual continua intacta.
+    """
+    diretorio = os.path.abspath(diretorio)
+    pai, nome = os.path.split(diretorio)
+    os.makedirs(pai, exist_ok=True)
+    _migrar_para_link(diretorio)
+
+    antigo = os.path.realpath(diretorio) if os.path.islink(diretorio) else None
+    novo = tempfile.mkdtemp(prefix=f".{nome}-", dir=pai)
+    link = novo + ".link"
+    try:
+        if manter and antigo and os.path.isdir(antigo):
+            _replicar(antigo, novo, {(int(a), int(m)) for a, m in exceto})
+        yield novo
+        os.symlink(os.path.basename(novo), link)
+        os.replace(link, diretorio)
+    except BaseException:
+        if os.path.lexists(link):
+            os.remove(link)
+        shutil.rmtree(novo, ignore_errors=True)
+        raise
+    if antigo and antigo != novo:
+        shutil.rmtree(antigo, ignore_errors=True)
+
+
+def _replicar(origem: str, destino: str, exceto: set[tuple[int, int]]) -> None:
+    # Partições (imutáveis: toda escrita vai para uma versão nova) viram hard
+    # links; arquivos de controle são copiados, pois são regravados no lugar.
+    for raiz, pastas, arquivos in os.walk(origem):
+        relativo = os.path.relpath(raiz, origem)
+        if relativo == ".":
+            for arquivo in arquivos:
+                shutil.copy2(os.path.join(raiz, arquivo), os.path.join(destino, arquivo))
+            continue
+        chaves = dict(parte.split("=", 1) for parte in relativo.split(os.sep))
+        if (int(chaves["ANO"]), int(chaves.get("MES", 0))) in exceto:
+            pastas.clear()
+            continue
+        os.makedirs(os.path.join(destino, relativo), exist_ok=True)
+        for arquivo in arquivos:
+            alvo = os.path.join(destino, relativo, arquivo)
+            try:
+                os.link(os.path.join(raiz, arquivo), alvo)
+            except OSError:
+                # Sistema de arquivos sem hard links: copia.
+                shutil.copy2(os.path.join(raiz, arquivo), alvo)
+
+
+def regravar(blocos, diretorio: str) -> None:
+    """Substitui o dataset inteiro pelos lotes informados (numa versão nova)."""
+    with nova_versao(diretorio, manter=False) as novo:
+        gravar(blocos, novo)
+
+
+def _migrar_para_link(diretorio: str) -> None:
+    # Datasets gravados antes dos links são diretórios comuns: viram o alvo
+    # de um link (única troca não atômica, feita uma vez).
+    if os.path.islink(diretorio) or not os.path.isdir(diretorio):
+        return
+    pai, nome = os.path.split(diretorio)
+    legado = tempfile.mkdtemp(prefix=f".{nome}-", dir=pai)
+    os.rmdir(legado)
+    os.replace(diretorio, legado)
+    os.symlink(os.path.basename(legado), diretorio)
+
+
+def converter_csv(caminho_csv: str, diretorio: str) -> None:
+    """Converte o CSV em um dataset Parquet particionado."""
+    regravar(_blocos_csv(caminho_csv), diretorio)
+
+
+def particoes(diretorio: str) -> set[tuple[int, int]]:
+    """Pares (ANO, MES) presentes no dataset, sem ler nenhum dado."""
+    dataset = ds.dataset(diretorio, format="parquet", partitioning=PARTICOES, schema=ESQUEMA)
+    encontradas = set()
+    for fragmento in dataset.get_fragments():
+        chaves = ds.get_partition_keys(fragmento.partition_expression)
+        encontradas.add((int(chaves["ANO"]), int(chaves["MES"])))
+    return encontradas
+
+
+def ler(
+    diretorio: str,
+    anos: tuple[int, ...] | None = None,
+    meses: tuple[int, ...] | None = None,
+    colunas: tuple[str, ...] | None = None,
+) -> pd.DataFrame:
+    """Lê apenas as partições (ANO/MES) e colunas necessárias.
+
+    Colunas de texto chegam como ``category``.
+    """
+    dataset = ds.dataset(diretorio, format="parquet", partitioning=PARTICOES, schema=ESQUEMA)
+
+    filtro = None
+    if anos is not None:
+        filtro = pc.field("ANO").isin(list(anos))
+    if meses is not None:
+        cond = pc.field("MES").isin(list(meses))
+        filtro = cond if filtro is None else filtro & cond
+
+    tabela = dataset.to_table(
+        columns=list(colunas) if colunas is not None else ESQUEMA.names,
+        filter=filtro,
+    )
+    return tabela.to_pandas()
+
+
+if __name__ == "__main__":
+    from boraali import dados
+
+    origem = sys.argv[1] if len(sys.argv) > 1 else dados.CAMINHO_CSV
+    destino = sys.argv[2] if len(sys.argv) > 2 else dados.DIR_PARQUET
+    converter_csv(origem, destino)
+    print(f"Dataset Parquet gravado em {destino}")
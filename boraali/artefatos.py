@@ -0,0 +1,127 @@
+"""Artefatos de modelos persistidos em disco, versionados pelo conteúdo.
+
+Cada artefato é um diretório com um ``.npy`` por coluna e um ``meta.json``.
+O nome do diretório é a chave do artefato: o hash do conteúdo dos dados mais
+os parâmetros do modelo. Enquanto os dados não mudam, qualquer processo (ou
+worker) reaproveita o mesmo artefato em vez de treinar de novo, e as colunas
+são abertas com ``mmap``: a carga é imediata e as páginas do arquivo ficam
+no cache do sistema operacional, compartilhadas entre processos.
+
+A gravação é atômica (diretório temporário renomeado no final), então um
+leitor nunca encontra um artefato pela metade. Ao gravar uma chave nova, só
+as ``BORAALI_ARTEFATOS_VERSOES`` mais recentes de cada nome ficam no disco:
+as demais (dados ou parâmetros antigos) são apagadas. Processos que ainda
+mapeiam uma versão apagada continuam lendo normalmente (o sistema só libera
+o arquivo quando o último ``mmap`` é fechado).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from boraali import config, dados
+
+DIR_MODELOS = os.environ.get("BORAALI_MODELOS", os.path.join(dados.RAIZ, "data", "modelos"))
+
+META = "meta.json"
+
+
+def chave(*partes) -> str:
+    """Chave curta e estável a partir do hash dos dados e de parâmetros."""
+    texto = json.dumps([dados.hash_dados(), *partes], sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode()).hexdigest()[:24]
+
+
+def caminho(nome: str, chave_artefato: str) -> str:
+    """Diretório do artefato ``nome`` com a chave informada."""
+    return os.path.join(DIR_MODELOS, nome, chave_artefato)
+
+
+def existe(diretorio: str) -> bool:
+    """Indica se há um artefato completo em ``diretorio``."""
+    return os.path.isfile(os.path.join(diretorio, META))
+
+
+def salvar_tabela(diretorio: str, tabela: pd.DataFrame, meta: dict | None = None) -> None:
+    """Grava ``tabela`` coluna a coluna; categorias vão para o ``meta.json``."""
+    pai = os.path.dirname(diretorio)
+    os.makedirs(pai, exist_ok=True)
+    temporario = tempfile.mkdtemp(prefix=".artefato-", dir=pai)
+    try:
+        colunas = {}
+        for col in tabela.columns:
+            serie = tabela[col]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                valores = serie.cat.codes.to_numpy()
+                colunas[col] = [str(c) for c in serie.cat.categories]
+            else:
+                valores = serie.to_numpy()
+                colunas[col] = None
+            np.save(os.path.join(temporario, f"{col}.npy"), valores, allow_pickle=False)
+        # O meta.json é o último arquivo: sua presença marca o artefato completo.
+        with open(os.path.join(temporario, META), "w", encoding="utf-8") as f:
+            json.dump({"colunas": colunas, "meta": meta or {}}, f, ensure_ascii=False)
+        try:
+            os.replace(temporario, diretorio)
+        except OSError:
+            # Outro processo gravou o mesmo artefato primeiro; o dele vale.
+            if not existe(diretorio):
+                raise
+            shutil.rmtree(temporario, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+
+
+def podar(nome: str, manter: int = config.ARTEFATOS_VERSOES) -> list[str]:
+    """Apaga as versões de ``nome`` além das ``manter`` gravadas mais recentemente."""
+    pasta = os.path.join(DIR_MODELOS, nome)
+    if not os.path.isdir(pasta):
+        return []
+    versoes = []
+    for entrada in os.scandir(pasta):
+        if entrada.is_dir() and not entrada.name.startswith(".") and existe(entrada.path):
+            versoes.append((os.stat(os.path.join(entrada.path, META)).st_mtime_ns, entrada.path))
+    versoes.sort(reverse=True)
+    apagadas = [diretorio for _, diretorio in versoes[max(manter, 1):]]
+    for diretorio in apagadas:
+        shutil.rmtree(diretorio, ignore_errors=True)
+    return apagadas
+
+
+def carregar_tabela(diretorio: str) -> tuple[pd.DataFrame, dict]:
+    """Abre um artefato gravado por ``salvar_tabela`` (colunas via ``mmap``)."""
+    with open(os.path.join(diretorio, META), encoding="utf-8") as f:
+        conteudo = json.load(f)
+    colunas = {}
+    for col, categorias in conteudo["colunas"].items():
+        valores = np.load(os.path.join(diretorio, f"{col}.npy"), mmap_mode="r", allow_pickle=False)
+        if categorias is not None:
+            valores = pd.Categorical.from_codes(valores, categories=categorias)
+        colunas[col] = valores
+    return pd.DataFrame(colunas, copy=False), conteudo["meta"]
+
+
+def obter_tabela(nome: str, parametros: dict, treinar) -> pd.DataFrame:
+    """Carrega o artefato de ``nome`` para os dados e ``parametros`` atuais.
+
+    Se ainda não existe, chama ``treinar()``, grava o resultado e o devolve
+    já mapeado do disco.
+    """
+    diretorio = caminho(nome, chave(nome, parametros))
+    if existe(diretorio):
+        return carregar_tabela(diretorio)[0]
+    tabela = treinar()
+    try:
+        salvar_tabela(diretorio, tabela, {"parametros": parametros, "hash_dados": dados.hash_dados()})
+    except OSError:
+        # Sem permissão de escrita (ex.: disco somente leitura): segue em memória.
+        return tabela
+    podar(nome)
+    return carregar_tabela(diretorio)[0]
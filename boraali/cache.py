@@ -0,0 +1,372 @@
+"""Cache de resultados das análises, compartilhado por todas as sessões.
+
+Guarda o resultado de cada chamada das funções marcadas com ``memorizar``
+(as análises da ``api``), com chave formada pela função, pelos filtros
+(origem, destino, estação, anos, mês, orçamento...) e pela versão dos dados.
+O cache tem limite de memória (``BORAALI_CACHE_RESULTADOS_MB``; 0 desliga só
+a memória) e, ao ultrapassá-lo, descarta os resultados usados há mais tempo
+(LRU). Contadores de acertos, falhas e descartes ficam em ``estatisticas()``.
+
+Abaixo da memória há um segundo nível em disco: um SQLite em modo WAL
+(``data/cache/resultados.sqlite`` ou ``BORAALI_CACHE_DISCO``) com o resultado
+serializado, chaveado pelo hash do conteúdo dos dados (como os
+``artefatos``), pelo hash do código do pacote (um deploy não lê resultados
+de código antigo) e pelos filtros. Todos os processos do servidor leem e
+gravam o mesmo arquivo ao mesmo tempo, então um worker novo ou reiniciado
+aproveita o que os outros já calcularam. O tamanho do arquivo é limitado por
+``BORAALI_CACHE_DISCO_MB`` (descarta os usados há mais tempo, com a data de
+uso renovada no máximo a cada ``INTERVALO_USO`` segundos); 0 desliga o
+disco. Falhas do SQLite (arquivo travado, disco cheio) só viram falhas de
+cache, nunca erros da página.
+
+Os resultados são compartilhados: trate-os como somente leitura.
+"""
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from boraali import artefatos, config, dados, instrumentacao
+
+ARQUIVO_DISCO = os.environ.get(
+    "BORAALI_CACHE_DISCO", os.path.join(dados.RAIZ, "data", "cache", "resultados.sqlite")
+)
+
+# Segundos mínimos entre duas renovações da data de uso de uma entrada do disco.
+INTERVALO_USO = 60.0
+
+
+def tamanho(objeto) -> int:
+    """Estimativa, em bytes, da memória ocupada por um resultado."""
+    if isinstance(objeto, pd.DataFrame):
+        return int(objeto.memory_usage(deep=True, index=True).sum())
+    if isinstance(objeto, (pd.Series, pd.Index)):
+        return int(objeto.memory_usage(deep=True))
+    if isinstance(objeto, np.ndarray):
+        return objeto.nbytes
+    if dataclasses.is_dataclass(objeto) and not isinstance(objeto, type):
+        return sum(tamanho(getattr(objeto, c.name)) for c in dataclasses.fields(objeto))
+    if isinstance(objeto, (list, tuple, set)):
+        return sys.getsizeof(objeto) + sum(tamanho(v) for v in objeto)
+    if isinstance(objeto, dict):
+        return sys.getsizeof(objeto) + sum(tamanho(k) + tamanho(v) for k, v in objeto.items())
+    if hasattr(objeto, "to_plotly_json"):
+        # Figuras Plotly: os dados das séries, sem serializar a figura.
+        return _tamanho_figura(objeto)
+    return sys.getsizeof(objeto)
+
+
+# Bytes atribuídos a layout, estilos e metadados de cada figura e de cada série.
+_BASE_FIGURA = 16_384
+_BASE_SERIE = 2_048
+
+
+def _tamanho_figura(figura) -> int:
+    # Soma os arrays de dados de cada trace; o resto tem custo fixo estimado.
+    total = _BASE_FIGURA
+    for trace in figura.data:
+        total += _BASE_SERIE
+        for campo in ("x", "y", "z", "text", "customdata", "lat", "lon", "hovertext"):
+            valores = getattr(trace, campo, None)
+            if valores is None:
+                continue
+            valores = np.asarray(valores)
+            # Arrays de objetos (textos): nbytes conta só os ponteiros.
+            total += valores.nbytes * (8 if valores.dtype == object else 1)
+    return total
+
+
+@functools.cache
+def _versao_codigo() -> str:
+    # Hash dos fontes do pacote: código novo não lê resultados antigos do disco.
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for nome in sorted(os.listdir(pasta)):
+        if nome.endswith(".py"):
+            with open(os.path.join(pasta, nome), "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _congelar(valor) -> Hashable:
+    # Listas e dicionários dos filtros viram tuplas para compor a chave.
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted(_congelar(v) for v in valor))
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _congelar(v)) for k, v in valor.items()))
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+# ===========================
+# DISCO (COMPARTILHADO ENTRE PROCESSOS)
+# ===========================
+class CacheDisco:
+    """Cache em SQLite (WAL), compartilhado por todos os processos do host."""
+
+    def __init__(self, arquivo: str, limite_bytes: int):
+        self.arquivo = arquivo
+        self.limite_bytes = limite_bytes
+        self._local = threading.local()
+        self._gravacoes = 0
+
+    def _conexao(self) -> sqlite3.Connection:
+        # Uma conexão por thread: conexões SQLite não são compartilháveis.
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+            conexao = sqlite3.connect(self.arquivo, timeout=5.0, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS resultados ("
+                " chave TEXT PRIMARY KEY, valor BLOB NOT NULL,"
+                " bytes INTEGER NOT NULL, usado REAL NOT NULL)"
+            )
+            self._local.conexao = conexao
+        return conexao
+
+    @staticmethod
+    def chave(chave: Hashable) -> str:
+        """Chave no disco: filtros, versão dos dados e hash do código do pacote."""
+        return artefatos.chave(_versao_codigo(), *chave)
+
+    def ler(self, chave: str) -> tuple[bool, object]:
+        """``(True, valor)`` se a chave está no disco, senão ``(False, None)``.
+
+        Leituras não escrevem: a data de uso só é renovada quando tem mais de
+        ``INTERVALO_USO`` segundos, então a poda é um LRU aproximado e os
+        workers não disputam o lock de escrita a cada acerto.
+        """
+        try:
+            conexao = self._conexao()
+            linha = conexao.execute(
+                "SELECT valor, usado FROM resultados WHERE chave = ?", (chave,)
+            ).fetchone()
+            if linha is None:
+                return False, None
+            agora = time.time()
+            if agora - linha[1] > INTERVALO_USO:
+                conexao.execute("UPDATE resultados SET usado = ? WHERE chave = ?", (agora, chave))
+            return True, pickle.loads(linha[0])
+        except (sqlite3.Error, OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False, None
+
+    def gravar(self, chave: str, valor: object) -> None:
+        """Grava o valor serializado; ignora valores maiores que o limite."""
+        try:
+            blob = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        if len(blob) > self.limite_bytes:
+            return
+        try:
+            conexao = self._conexao()
+            conexao.execute(
+                "INSERT OR REPLACE INTO resultados (chave, valor, bytes, usado) VALUES (?, ?, ?, ?)",
+                (chave, blob, len(blob), time.time()),
+            )
+            self._gravacoes += 1
+            if self._gravacoes % 32 == 1:
+                self._podar(conexao)
+        except (sqlite3.Error, OSError):
+            pass
+
+    def _podar(self, conexao: sqlite3.Connection) -> None:
+        # Descarta os usados há mais tempo até caber no limite.
+        total = conexao.execute("SELECT COALESCE(SUM(bytes), 0) FROM resultados").fetchone()[0]
+        if total <= self.limite_bytes:
+            return
+        excesso = total - self.limite_bytes
+        descartar = []
+        for chave, ocupado in conexao.execute("SELECT chave, bytes FROM resultados ORDER BY usado").fetchall():
+            descartar.append((chave,))
+            excesso -= ocupado
+            if excesso <= 0:
+                break
+        conexao.executemany("DELETE FROM resultados WHERE chave = ?", descartar)
+
+    def estatisticas(self) -> dict:
+        """Entradas e bytes gravados no arquivo."""
+        try:
+            entradas, ocupado = self._conexao().execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM resultados"
+            ).fetchone()
+        except (sqlite3.Error, OSError):
+            entradas, ocupado = 0, 0
+        return {"entradas": entradas, "bytes": ocupado, "limite_bytes": self.limite_bytes}
+
+    def limpar(self) -> None:
+        """Apaga todas as entradas do arquivo."""
+        try:
+            self._conexao().execute("DELETE FROM resultados")
+        except (sqlite3.Error, OSError):
+            pass
+
+
+# ===========================
+# MEMÓRIA (POR PROCESSO)
+# ===========================
+class CacheResultados:
+    """Cache LRU com limite de memória, seguro para várias threads.
+
+    Com ``disco``, as falhas da memória são procuradas no disco antes de
+    calcular, e o que é calculado também é gravado lá.
+    """
+
+    def __init__(self, limite_bytes: int, disco: CacheDisco | None = None):
+        self.limite_bytes = limite_bytes
+        self.disco = disco
+        self._itens: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+        self._bytes = 0
+        self._versao: tuple | None = None
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.acertos_disco = 0
+        self.descartes = 0
+
+    def _descartar_versao_antiga(self, versao: tuple) -> None:
+        if versao != self._versao:
+            self._itens.clear()
+            self._bytes = 0
+            self._versao = versao
+
+    def obter(self, chave: Hashable, calcular: Callable[[], object]) -> object:
+        """Devolve o resultado em cache para ``chave`` ou calcula e guarda."""
+        versao = dados.versao_dados()
+        with self._lock:
+            self._descartar_versao_antiga(versao)
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return item[0]
+
+        chave_disco = self.disco.chave(chave) if self.disco is not None else None
+        encontrado, resultado = self.disco.ler(chave_disco) if self.disco is not None else (False, None)
+        with self._lock:
+            if encontrado:
+                self.acertos_disco += 1
+            else:
+                self.falhas += 1
+        if not encontrado:
+            resultado = calcular()
+            if self.disco is not None:
+                self.disco.gravar(chave_disco, resultado)
+
+        ocupado = tamanho(resultado)
+        if ocupado > self.limite_bytes:
+            return resultado
+
+        with self._lock:
+            self._descartar_versao_antiga(versao)
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._itens[chave] = (resultado, ocupado)
+            self._bytes += ocupado
+            while self._bytes > self.limite_bytes:
+                _, (_, liberado) = self._itens.popitem(last=False)
+                self._bytes -= liberado
+                self.descartes += 1
+        return resultado
+
+    def limpar(self) -> None:
+        """Esvazia o cache (os contadores são mantidos)."""
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+    def estatisticas(self) -> dict:
+        """Acertos, falhas, descartes, entradas e memória ocupada."""
+        with self._lock:
+            total = self.acertos + self.acertos_disco + self.falhas
+            estatisticas = {
+                "acertos": self.acertos,
+                "acertos_disco": self.acertos_disco,
+                "falhas": self.falhas,
+                "taxa_acerto": (self.acertos + self.acertos_disco) / total if total else 0.0,
+                "descartes": self.descartes,
+                "entradas": len(self._itens),
+                "bytes": self._bytes,
+                "limite_bytes": self.limite_bytes,
+            }
+        if self.disco is not None:
+            estatisticas["disco"] = self.disco.estatisticas()
+        return estatisticas
+
+
+resultados = CacheResultados(
+    int(config.CACHE_RESULTADOS_MB * 2**20),
+    CacheDisco(ARQUIVO_DISCO, int(config.CACHE_DISCO_MB * 2**20)) if config.CACHE_DISCO_MB > 0 else None,
+)
+
+
+def _como_conjunto(valor) -> Hashable:
+    # Filtros em que a ordem não importa (anos, valores aceitos): ordenados.
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _como_conjunto(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return tuple(sorted(_congelar(v) for v in valor))
+    return _congelar(valor)
+
+
+def memorizar(funcao: Callable | None = None, *, conjuntos: tuple[str, ...] = ()) -> Callable:
+    """Decorador: guarda os resultados da função no cache de resultados.
+
+    A chave usa os argumentos já ligados à assinatura, com os padrões
+    preenchidos: chamadas posicionais, nomeadas ou com o padrão explícito
+    caem na mesma entrada. Os parâmetros em ``conjuntos`` são comparados sem
+    ordem (listas ordenadas; num dicionário, as listas de cada valor).
+    """
+    if funcao is None:
+        return functools.partial(memorizar, conjuntos=conjuntos)
+
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+    assinatura = inspect.signature(funcao)
+
+    @functools.wraps(funcao)
+    def envolvida(*args, **kwargs):
+        if resultados.limite_bytes <= 0 and resultados.disco is None:
+            return funcao(*args, **kwargs)
+        ligados = assinatura.bind(*args, **kwargs)
+        ligados.apply_defaults()
+        chave = (nome, tuple(
+            (parametro, _como_conjunto(valor) if parametro in conjuntos else _congelar(valor))
+            for parametro, valor in ligados.arguments.items()
+        ))
+        falhas, acertos_disco = resultados.falhas, resultados.acertos_disco
+        with instrumentacao.etapa("cache de resultados") as etapa:
+            resultado = resultados.obter(chave, lambda: funcao(*args, **kwargs))
+            if etapa:
+                if resultados.falhas > falhas:
+                    etapa.nome += " (falha)"
+                elif resultados.acertos_disco > acertos_disco:
+                    etapa.nome += " (disco)"
+                else:
+                    etapa.nome += " (acerto)"
+        return resultado
+
+    return envolvida
+
+
+def estatisticas() -> dict:
+    """Estatísticas do cache de resultados do processo."""
+    return resultados.estatisticas()
@@ -0,0 +1,54 @@
+"""Estatísticas das companhias por estação, calculadas em uma passada.
+
+Para LATAM, GOL e AZUL, a tarifa média mensal e as métricas da estação
+(média, desvio, mínimo, máximo, volatilidade e estabilidade entre os meses)
+saem de um único ``groupby`` sobre o cubo com a estação como chave, para
+todas as estações de uma vez. O mesmo cálculo pode ser feito também por
+origem ou por rota (``por``); cada nível fica em cache por versão dos dados.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from boraali import cubo, dados
+from boraali.constantes import ESTACAO_DO_MES, ESTACOES
+
+PRINCIPAIS = ["LATAM", "GOL", "AZUL"]
+
+
+def calcular(celulas: pd.DataFrame, por: list[str] | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Tarifas mensais e métricas por ``por`` + ESTACAO + COMPANHIA.
+
+    Devolve ``(mensal, metricas)``: ``mensal`` tem a TARIFA média de cada
+    mês; ``metricas`` tem mean, std, min, max, volatilidade_% e estabilidade
+    dessas tarifas dentro de cada estação.
+    """
+    por = list(por or [])
+    celulas = cubo.filtrar(celulas, companhias=PRINCIPAIS)
+    estacao = pd.Categorical(
+        ESTACAO_DO_MES[celulas["MES"].to_numpy()],
+        categories=list(ESTACOES),
+    )
+    chaves = por + ["ESTACAO", "COMPANHIA"]
+
+    mensal = cubo.agregar(celulas.assign(ESTACAO=estacao), chaves + ["MES"])
+    mensal = mensal[chaves + ["MES", "TARIFA"]]
+
+    metricas = mensal.groupby(chaves, sort=False, as_index=False)["TARIFA"].agg(["mean", "std", "min", "max"])
+    metricas["volatilidade_%"] = (metricas["max"] - metricas["min"]) / metricas["mean"] * 100
+    metricas["estabilidade"] = 100 - (metricas["std"] / metricas["mean"] * 100)
+    return mensal, metricas
+
+
+def obter(por: tuple[str, ...] = ()) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """``calcular`` sobre o cubo inteiro, em cache (``por`` vazio, ORIGEM...)."""
+    nome = "companhias:" + ",".join(por)
+    return dados.derivado(nome, lambda: calcular(cubo.obter(), list(por)))
+
+
+def da_estacao(estacao: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Tarifas mensais e métricas (indexadas por COMPANHIA) de uma estação."""
+    mensal, metricas = obter()
+    mensal = mensal[mensal["ESTACAO"] == estacao].drop(columns="ESTACAO").reset_index(drop=True)
+    metricas = metricas[metricas["ESTACAO"] == estacao].drop(columns="ESTACAO").set_index("COMPANHIA")
+    return mensal, metricas
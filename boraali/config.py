@@ -0,0 +1,92 @@
+"""Parâmetros do motor, ajustáveis por variáveis de ambiente ``BORAALI_*``."""
+from __future__ import annotations
+
+import os
+
+
+def _float(nome: str, padrao: float) -> float:
+    return float(os.environ.get(nome, padrao))
+
+
+def _int(nome: str, padrao: int) -> int:
+    return int(os.environ.get(nome, padrao))
+
+
+def _bool(nome: str, padrao: bool) -> bool:
+    return os.environ.get(nome, "1" if padrao else "0").strip().lower() in ("1", "true", "sim")
+
+
+# ===========================
+# PROJEÇÃO DE ANOS FUTUROS
+# ===========================
+# Cada ano projetado repete o histórico com a tarifa multiplicada por
+# FATOR_PROJECAO elevado à distância (em anos) do último ano com dados.
+FATOR_PROJECAO = _float("BORAALI_FATOR_PROJECAO", 1.01)
+HORIZONTE_PROJECAO = _int("BORAALI_HORIZONTE_PROJECAO", 1)
+
+# ===========================
+# PREVISÃO
+# ===========================
+ANOS_TREINO_PREVISAO = _int("BORAALI_ANOS_TREINO_PREVISAO", 3)
+# Fração da tendência estimada que entra na previsão (1 = sem amortecimento).
+AMORTECIMENTO_TENDENCIA = _float("BORAALI_AMORTECIMENTO_TENDENCIA", 0.5)
+# Faixa da previsão relativa à média histórica do mês.
+PREVISAO_MIN_RELATIVA = _float("BORAALI_PREVISAO_MIN_RELATIVA", 0.5)
+PREVISAO_MAX_RELATIVA = _float("BORAALI_PREVISAO_MAX_RELATIVA", 1.5)
+
+# ===========================
+# INSTRUMENTAÇÃO
+# ===========================
+# Mede as etapas de todas as páginas (também ligável por página com ?debug=1).
+INSTRUMENTACAO = _bool("BORAALI_INSTRUMENTACAO", False)
+
+# ===========================
+# CACHE DE RESULTADOS
+# ===========================
+# Memória máxima (MB) dos resultados das análises guardados no processo;
+# 0 desliga a memória (o disco continua valendo).
+CACHE_RESULTADOS_MB = _float("BORAALI_CACHE_RESULTADOS_MB", 64)
+# Tamanho máximo (MB) do cache em disco compartilhado pelos processos;
+# 0 desliga o disco.
+CACHE_DISCO_MB = _float("BORAALI_CACHE_DISCO_MB", 512)
+
+# ===========================
+# FIGURAS
+# ===========================
+# Pontos por série acima dos quais o gráfico é reduzido (mínimo/máximo por faixa).
+MAX_PONTOS_FIGURA = _int("BORAALI_MAX_PONTOS_FIGURA", 2000)
+
+# ===========================
+# DATASET COMPARTILHADO
+# ===========================
+# Publica a tabela completa em disco e a abre com mmap, compartilhada por
+# todos os processos do host (0 = cada processo lê a fonte para si).
+DATASET_COMPARTILHADO = _bool("BORAALI_DATASET_COMPARTILHADO", True)
+# Versões guardadas de cada artefato em data/modelos (a atual e as anteriores
+# mais recentes); as mais antigas são apagadas ao gravar uma nova.
+ARTEFATOS_VERSOES = _int("BORAALI_ARTEFATOS_VERSOES", 2)
+
+# ===========================
+# AQUECIMENTO
+# ===========================
+# Pré-cálculo dos filtros mais procurados em segundo plano, ao subir o app.
+AQUECIMENTO = _bool("BORAALI_AQUECIMENTO", True)
+AQUECIMENTO_ROTAS = _int("BORAALI_AQUECIMENTO_ROTAS", 20)
+AQUECIMENTO_SEGUNDOS = _float("BORAALI_AQUECIMENTO_SEGUNDOS", 120)
+# Espaço máximo (MB) que o aquecimento pode ocupar no cache de resultados (na
+# memória ou, se ela estiver desligada, no disco).
+AQUECIMENTO_MB = _float("BORAALI_AQUECIMENTO_MB", 32)
+
+# ===========================
+# QUANTIS DAS TARIFAS
+# ===========================
+# Erro relativo máximo dos quantis lidos dos esboços (0.01 = 1%).
+PRECISAO_QUANTIS = _float("BORAALI_PRECISAO_QUANTIS", 0.01)
+
+# ===========================
+# ESTAÇÕES DO INMET
+# ===========================
+# Cada capital usa a média das leituras das suas estações mais próximas,
+# até este número de estações e dentro deste raio.
+ESTACOES_POR_CAPITAL = _int("BORAALI_ESTACOES_POR_CAPITAL", 3)
+RAIO_ESTACOES_KM = _float("BORAALI_RAIO_ESTACOES_KM", 50.0)
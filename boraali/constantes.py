@@ -0,0 +1,100 @@
+"""Constantes compartilhadas entre o motor de dados e as páginas."""
+import numpy as np
+
+# ===========================
+# COORDENADAS DAS CAPITAIS DO BRASIL
+# ===========================
+CAPITAIS_COORDS = {
+    "Rio Branco": {"lat": -9.97499, "lon": -67.8243},
+    "Maceió": {"lat": -9.66599, "lon": -35.7350},
+    "Macapá": {"lat": 0.03493, "lon": -51.0694},
+    "Manaus": {"lat": -3.11866, "lon": -60.0212},
+    "Salvador": {"lat": -12.9718, "lon": -38.5011},
+    "Fortaleza": {"lat": -3.71722, "lon": -38.5434},
+    "Brasília": {"lat": -15.7797, "lon": -47.9297},
+    "Vitória": {"lat": -20.3155, "lon": -40.3128},
+    "Goiânia": {"lat": -16.6864, "lon": -49.2643},
+    "São Luís": {"lat": -2.53911, "lon": -44.2829},
+    "Cuiabá": {"lat": -15.6010, "lon": -56.0974},
+    "Campo Grande": {"lat": -20.4697, "lon": -54.6201},
+    "Belo Horizonte": {"lat": -19.8157, "lon": -43.9542},
+    "Belém": {"lat": -1.45502, "lon": -48.5024},
+    "João Pessoa": {"lat": -7.11509, "lon": -34.8641},
+    "Curitiba": {"lat": -25.4284, "lon": -49.2733},
+    "Recife": {"lat": -8.04666, "lon": -34.8771},
+    "Teresina": {"lat": -5.08921, "lon": -42.8016},
+    "Rio de Janeiro": {"lat": -22.9068, "lon": -43.1729},
+    "Natal": {"lat": -5.79448, "lon": -35.2110},
+    "Porto Alegre": {"lat": -30.0277, "lon": -51.2287},
+    "Porto Velho": {"lat": -8.76077, "lon": -63.8999},
+    "Boa Vista": {"lat": 2.82384, "lon": -60.6753},
+    "Florianópolis": {"lat": -27.5945, "lon": -48.5477},
+    "São Paulo": {"lat": -23.5505, "lon": -46.6333},
+    "Aracaju": {"lat": -10.9472, "lon": -37.0731},
+    "Palmas": {"lat": -10.1675, "lon": -48.3277}
+}
+
+# ===========================
+# AEROPORTOS (ICAO) → CAPITAL
+# ===========================
+AEROPORTOS_CAPITAIS = {
+    "SBRB": "Rio Branco",
+    "SBMO": "Maceió",
+    "SBMQ": "Macapá",
+    "SBEG": "Manaus",
+    "SBSV": "Salvador",
+    "SBFZ": "Fortaleza",
+    "SBBR": "Brasília",
+    "SBVT": "Vitória",
+    "SBGO": "Goiânia",
+    "SBSL": "São Luís",
+    "SBCY": "Cuiabá",
+    "SBCG": "Campo Grande",
+    "SBCF": "Belo Horizonte",
+    "SBBH": "Belo Horizonte",
+    "SBBE": "Belém",
+    "SBJP": "João Pessoa",
+    "SBCT": "Curitiba",
+    "SBBI": "Curitiba",
+    "SBRF": "Recife",
+    "SBTE": "Teresina",
+    "SBGL": "Rio de Janeiro",
+    "SBRJ": "Rio de Janeiro",
+    "SBSG": "Natal",
+    "SBPA": "Porto Alegre",
+    "SBPV": "Porto Velho",
+    "SBBV": "Boa Vista",
+    "SBFL": "Florianópolis",
+    "SBGR": "São Paulo",
+    "SBSP": "São Paulo",
+    "SBAR": "Aracaju",
+    "SBPJ": "Palmas",
+}
+
+# ===========================
+# EMPRESAS (ICAO) → COMPANHIA
+# ===========================
+EMPRESAS_COMPANHIAS = {
+    "AZU": "AZUL",
+    "GLO": "GOL",
+    "TAM": "LATAM",
+}
+
+COMPANHIA_OUTRAS = "OUTRAS"
+
+# ===========================
+# ESTAÇÕES DO ANO → MESES
+# ===========================
+ESTACOES = {
+    "Verão": [12, 1, 2],
+    "Outono": [3, 4, 5],
+    "Inverno": [6, 7, 8],
+    "Primavera": [9, 10, 11],
+}
+
+# Estação de cada mês (posição = MES; a posição 0 fica vazia), para
+# classificar uma coluna de meses inteira de uma vez: ESTACAO_DO_MES[meses].
+ESTACAO_DO_MES = np.empty(13, dtype=object)
+for _nome, _meses in ESTACOES.items():
+    ESTACAO_DO_MES[_meses] = _nome
+del _nome, _meses
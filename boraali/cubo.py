@@ -0,0 +1,133 @@
+"""Cubo de tarifas pré-agregado.
+
+Cada célula corresponde a uma combinação (ORIGEM, DESTINO, COMPANHIA, ANO,
+MES) e guarda contagem, soma e soma dos quadrados de TARIFA e TEMP_MEDIA.
+Como essas medidas são aditivas, qualquer agrupamento mais grosso (por rota,
+por mês, por companhia...) é obtido somando células, e média e desvio padrão
+saem das somas sem voltar às linhas brutas.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from boraali import dados, indice
+
+CHAVES = ["ORIGEM", "DESTINO", "COMPANHIA", "ANO", "MES"]
+
+MEDIDAS = ["N", "TARIFA_SOMA", "TARIFA_SOMA2", "TEMP_N", "TEMP_SOMA", "TEMP_SOMA2"]
+
+
+def construir(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega linhas brutas no grão mais fino do cubo."""
+    tarifa = df["TARIFA"].astype("float64")
+    temp = df["TEMP_MEDIA"].astype("float64")
+    base = df[CHAVES].assign(
+        N=np.int64(1),
+        TARIFA_SOMA=tarifa,
+        TARIFA_SOMA2=tarifa * tarifa,
+        TEMP_N=temp.notna().astype("int64"),
+        TEMP_SOMA=temp.fillna(0.0),
+        TEMP_SOMA2=(temp * temp).fillna(0.0),
+    )
+    return base.groupby(CHAVES, observed=True, sort=True, as_index=False)[MEDIDAS].sum()
+
+
+def obter() -> pd.DataFrame:
+    """Cubo do dataset atual, construído uma vez por versão dos dados.
+
+    As células ficam ordenadas por rota (ORIGEM, DESTINO, ...).
+    """
+    return _indexado()[0]
+
+
+def _indexado() -> tuple[pd.DataFrame, indice.IndiceRotas]:
+    # Cubo e índice vêm juntos para nunca misturar versões diferentes.
+    def construir_tudo():
+        cubo = construir(dados.carregar_dados())
+        return cubo, indice.IndiceRotas(cubo)
+
+    return dados.derivado("cubo", construir_tudo)
+
+
+def indice_rotas() -> indice.IndiceRotas:
+    """Índice de rotas sobre as células do cubo."""
+    return _indexado()[1]
+
+
+def rota(origem: str, destino: str) -> pd.DataFrame:
+    """Células de uma rota (fatia contígua do cubo)."""
+    cubo, idx = _indexado()
+    return cubo.iloc[idx.rota(origem, destino)]
+
+
+def da_origem(origem: str) -> pd.DataFrame:
+    """Células de todas as rotas que partem de ``origem``."""
+    cubo, idx = _indexado()
+    return cubo.iloc[idx.origem(origem)]
+
+
+def filtrar(
+    cubo: pd.DataFrame,
+    origem: str | None = None,
+    destino: str | None = None,
+    companhias: list[str] | None = None,
+    anos: list[int] | None = None,
+    meses: list[int] | None = None,
+) -> pd.DataFrame:
+    """Seleciona as células que atendem aos filtros informados."""
+    mascara = np.ones(len(cubo), dtype=bool)
+    if origem is not None:
+        mascara &= (cubo["ORIGEM"] == origem).to_numpy()
+    if destino is not None:
+        mascara &= (cubo["DESTINO"] == destino).to_numpy()
+    if companhias is not None:
+        mascara &= cubo["COMPANHIA"].isin(companhias).to_numpy()
+    if anos is not None:
+        mascara &= cubo["ANO"].isin(anos).to_numpy()
+    if meses is not None:
+        mascara &= cubo["MES"].isin(meses).to_numpy()
+    return cubo[mascara]
+
+
+def finalizar(somas: pd.DataFrame) -> pd.DataFrame:
+    """Deriva média e desvio padrão (ddof=1) a partir das medidas aditivas."""
+    n = somas["N"].to_numpy(dtype="float64")
+    s = somas["TARIFA_SOMA"].to_numpy()
+    s2 = somas["TARIFA_SOMA2"].to_numpy()
+    tn = somas["TEMP_N"].to_numpy(dtype="float64")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = s / n
+        var = np.clip(s2 - s * media, 0.0, None) / (n - 1)
+        temp = somas["TEMP_SOMA"].to_numpy() / tn
+
+    out = somas.drop(columns=MEDIDAS[1:])
+    out["TARIFA"] = media
+    out["TARIFA_DP"] = np.where(n > 1, np.sqrt(var), np.nan)
+    out["TEMP_MEDIA"] = np.where(tn > 0, temp, np.nan)
+    return out
+
+
+def somar(cubo: pd.DataFrame, por: list[str]) -> pd.DataFrame:
+    """Soma as medidas aditivas pelas colunas ``por`` (texto como ``str``).
+
+    Com ``por=[]``, devolve uma única linha com o total das células.
+    """
+    if not por:
+        return cubo[MEDIDAS].sum().to_frame().T
+
+    somas = cubo.groupby(por, observed=True, sort=True, as_index=False)[MEDIDAS].sum()
+    for col in por:
+        if isinstance(somas[col].dtype, pd.CategoricalDtype):
+            somas[col] = somas[col].astype(str)
+    return somas
+
+
+def agregar(cubo: pd.DataFrame, por: list[str]) -> pd.DataFrame:
+    """Rollup das células pelas colunas ``por``.
+
+    Retorna ``por`` + N, TARIFA (média), TARIFA_DP e TEMP_MEDIA, com as
+    colunas de texto já como ``str``.
+    """
+    return finalizar(somar(cubo, por))
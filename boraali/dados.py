@@ -0,0 +1,317 @@
+"""Camada de acesso aos dados do Bora Alí.
+
+O dataset é lido uma única vez por processo e compartilhado, somente leitura,
+entre todas as sessões e páginas do Streamlit. Nenhuma página deve abrir o
+CSV diretamente: use ``carregar_dados()``, ``ler()`` e os acessores abaixo.
+
+Quando existe o dataset Parquet particionado (``data/parquet``, gerado por
+``python -m boraali.armazenamento``), as leituras usam-no e abrem apenas as
+partições ANO/MES e as colunas pedidas; caso contrário, o CSV é usado.
+
+A tabela completa é publicada uma vez por host como artefato colunar
+(``boraali.artefatos``: um ``.npy`` por coluna, chaveado pelo hash dos dados)
+e aberta com ``mmap`` somente leitura. Todos os processos do servidor mapeiam
+os mesmos arquivos, cujas páginas ficam uma única vez no cache do sistema
+operacional: mais workers não multiplicam a memória do dataset. Desliga com
+``BORAALI_DATASET_COMPARTILHADO=0``.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import TypeVar
+
+import pandas as pd
+
+from boraali import config, indice, instrumentacao
+
+# ===========================
+# CAMINHOS
+# ===========================
+# Podem ser trocados por BORAALI_CSV / BORAALI_PARQUET (ex.: benchmarks).
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_CSV = os.environ.get(
+    "BORAALI_CSV", os.path.join(RAIZ, "data", "INMET_ANAC_EXTREMAMENTE_REDUZIDO.csv")
+)
+DIR_PARQUET = os.environ.get("BORAALI_PARQUET", os.path.join(RAIZ, "data", "parquet"))
+
+# ===========================
+# ESQUEMA
+# ===========================
+COLUNAS = ["COMPANHIA", "ANO", "MES", "ORIGEM", "DESTINO", "TARIFA", "TEMP_MEDIA"]
+
+TIPOS = {
+    "COMPANHIA": "category",
+    "ANO": "int16",
+    "MES": "int8",
+    "ORIGEM": "category",
+    "DESTINO": "category",
+    "TARIFA": "float64",
+    "TEMP_MEDIA": "float64",
+}
+
+MAX_LEITURAS_EM_CACHE = 16
+
+T = TypeVar("T")
+
+_lock = threading.RLock()
+_cache: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
+_derivados: dict[str, tuple[tuple, object]] = {}
+_aquecimento_disparado = False
+
+
+def usa_parquet() -> bool:
+    """Indica se as leituras vêm do dataset Parquet particionado."""
+    from boraali import armazenamento
+
+    return armazenamento.existe(DIR_PARQUET)
+
+
+def versao_dados() -> tuple:
+    """Identifica a versão atual dos dados (fonte + data de modificação)."""
+    if usa_parquet():
+        from boraali import armazenamento
+
+        return (DIR_PARQUET, armazenamento.versao(DIR_PARQUET))
+    return (CAMINHO_CSV, os.stat(CAMINHO_CSV).st_mtime_ns)
+
+
+def _arquivos_fonte() -> list[str]:
+    if not usa_parquet():
+        return [CAMINHO_CSV]
+    arquivos = []
+    for pasta, _, nomes in os.walk(DIR_PARQUET):
+        arquivos += [os.path.join(pasta, n) for n in nomes if n.endswith(".parquet")]
+    return sorted(arquivos)
+
+
+def hash_dados() -> str:
+    """Hash SHA-256 do conteúdo da fonte atual (CSV ou arquivos Parquet).
+
+    Diferente de ``versao_dados()``, não muda quando os arquivos são apenas
+    regravados com o mesmo conteúdo; serve de chave para artefatos em disco.
+    Calculado uma vez por versão dos dados.
+    """
+    def construir() -> str:
+        h = hashlib.sha256()
+        for caminho in _arquivos_fonte():
+            h.update(os.path.relpath(caminho, RAIZ).encode())
+            with open(caminho, "rb") as f:
+                for bloco in iter(lambda: f.read(1 << 20), b""):
+                    h.update(bloco)
+        return h.hexdigest()
+
+    return derivado("hash_dados", construir)
+
+
+def _tupla(valores: Iterable | None) -> tuple | None:
+    if valores is None:
+        return None
+    return tuple(sorted(set(valores)))
+
+
+def _normalizar(df: pd.DataFrame) -> pd.DataFrame:
+    # Categorias em ordem alfabética, qualquer que seja a fonte.
+    for col, tipo in TIPOS.items():
+        if col not in df.columns:
+            continue
+        if tipo == "category":
+            serie = df[col].astype("category")
+            df[col] = serie.cat.reorder_categories(sorted(serie.cat.categories))
+        else:
+            df[col] = df[col].astype(tipo)
+    return df
+
+
+def _ler_csv(caminho: str) -> pd.DataFrame:
+    df = pd.read_csv(caminho, usecols=COLUNAS, dtype=TIPOS)
+    return _normalizar(df[COLUNAS])
+
+
+def _ler_completo(fonte: str) -> pd.DataFrame:
+    if fonte == DIR_PARQUET:
+        from boraali import armazenamento
+
+        return indice.ordenar_por_rota(_normalizar(armazenamento.ler(fonte)))
+    return indice.ordenar_por_rota(_ler_csv(fonte))
+
+
+# Versão do formato publicado; mude ao alterar o esquema ou a ordenação.
+VERSAO_PUBLICACAO = 1
+
+
+def _publicado(fonte: str) -> pd.DataFrame:
+    # Tabela completa mapeada do artefato compartilhado (gravado pelo primeiro
+    # processo que a pedir; os demais só mapeiam os arquivos).
+    from boraali import artefatos
+
+    return artefatos.obter_tabela(
+        "dataset", {"versao": VERSAO_PUBLICACAO}, lambda: _ler_completo(fonte)
+    )
+
+
+def _ler_fonte(versao: tuple, anos, meses, colunas) -> pd.DataFrame:
+    fonte = versao[0]
+
+    if anos is None and meses is None and colunas is None:
+        return _publicado(fonte) if config.DATASET_COMPARTILHADO else _ler_completo(fonte)
+
+    if fonte == DIR_PARQUET:
+        from boraali import armazenamento
+
+        return _normalizar(armazenamento.ler(fonte, anos, meses, colunas))
+
+    # Sem Parquet: recorta a tabela completa já em memória.
+    df = ler()
+    if anos is None and meses is None:
+        # Só colunas: visão da tabela completa, sem cópia.
+        return df[list(colunas)]
+    mascara = pd.Series(True, index=df.index)
+    if anos is not None:
+        mascara &= df["ANO"].isin(anos)
+    if meses is not None:
+        mascara &= df["MES"].isin(meses)
+    return df.loc[mascara, list(colunas) if colunas is not None else COLUNAS].reset_index(drop=True)
+
+
+def ler(
+    anos: Iterable[int] | None = None,
+    meses: Iterable[int] | None = None,
+    colunas: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Retorna o recorte pedido do dataset, carregado uma vez por versão.
+
+    Os DataFrames são compartilhados entre sessões: trate-os como somente
+    leitura (filtre ou copie antes de criar colunas).
+    """
+    versao = versao_dados()
+    chave = (versao, _tupla(anos), _tupla(meses), _tupla(colunas))
+
+    df = _cache.get(chave)
+    if df is not None:
+        return df
+
+    with _lock:
+        df = _cache.get(chave)
+        if df is not None:
+            return df
+        # Entradas de versões anteriores não servem mais.
+        for antiga in [k for k in _cache if k[0] != versao]:
+            del _cache[antiga]
+
+        with instrumentacao.etapa("leitura") as etapa:
+            df = _ler_fonte(*chave)
+            if etapa:
+                etapa.linhas = len(df)
+        _cache[chave] = df
+        while len(_cache) > MAX_LEITURAS_EM_CACHE:
+            _cache.popitem(last=False)
+    _disparar_aquecimento()
+    return df
+
+
+def _disparar_aquecimento() -> None:
+    # A primeira leitura do processo, venha de qualquer página, dispara o
+    # aquecimento dos caches em segundo plano. Só dentro do Streamlit: CLIs,
+    # benchmarks e a própria thread de aquecimento não disparam nada.
+    global _aquecimento_disparado
+    if _aquecimento_disparado:
+        return
+    _aquecimento_disparado = True
+    if "streamlit" not in sys.modules:
+        return
+    from streamlit import runtime
+
+    if runtime.exists():
+        from boraali import aquecimento
+
+        aquecimento.iniciar_em_segundo_plano()
+
+
+def carregar_dados() -> pd.DataFrame:
+    """Retorna o dataset completo (somente leitura), ordenado por rota."""
+    return ler()
+
+
+def derivado(nome: str, construir: Callable[[], T]) -> T:
+    """Objeto derivado do dataset (cubo, índices...), um por versão dos dados.
+
+    ``construir`` só é chamado na primeira vez e quando os dados mudam; o
+    resultado é compartilhado entre sessões, como o próprio dataset.
+    """
+    versao = versao_dados()
+    atual = _derivados.get(nome)
+    if atual is not None and atual[0] == versao:
+        return atual[1]
+
+    with _lock:
+        atual = _derivados.get(nome)
+        if atual is not None and atual[0] == versao:
+            return atual[1]
+        with instrumentacao.etapa(f"preparo: {nome}"):
+            objeto = construir()
+        _derivados[nome] = (versao, objeto)
+    return objeto
+
+
+def limpar_cache() -> None:
+    """Descarta as leituras e os derivados em memória (recarga a frio)."""
+    with _lock:
+        _cache.clear()
+        _derivados.clear()
+
+
+# ===========================
+# ÍNDICE DE ROTAS
+# ===========================
+def _indexado() -> tuple[pd.DataFrame, indice.IndiceRotas]:
+    # Tabela e índice vêm juntos para nunca misturar versões diferentes.
+    def construir():
+        df = carregar_dados()
+        return df, indice.IndiceRotas(df)
+
+    return derivado("dados_indexados", construir)
+
+
+def indice_rotas() -> indice.IndiceRotas:
+    """Índice de rotas do dataset completo."""
+    return _indexado()[1]
+
+
+def rota(origem: str, destino: str) -> pd.DataFrame:
+    """Linhas brutas de uma rota, sem varrer a tabela."""
+    df, idx = _indexado()
+    return df.iloc[idx.rota(origem, destino)]
+
+
+def da_origem(origem: str) -> pd.DataFrame:
+    """Linhas brutas que partem de ``origem``, sem varrer a tabela."""
+    df, idx = _indexado()
+    return df.iloc[idx.origem(origem)]
+
+
+# ===========================
+# ACESSORES
+# ===========================
+def origens() -> list[str]:
+    """Origens disponíveis, em ordem alfabética."""
+    return sorted(ler(colunas=["ORIGEM"])["ORIGEM"].unique().tolist())
+
+
+def destinos() -> list[str]:
+    """Destinos disponíveis, em ordem alfabética."""
+    return sorted(ler(colunas=["DESTINO"])["DESTINO"].unique().tolist())
+
+
+def anos() -> list[int]:
+    """Anos presentes no dataset, em ordem crescente."""
+    return sorted(int(a) for a in ler(colunas=["ANO"])["ANO"].unique())
+
+
+def companhias() -> list[str]:
+    """Companhias presentes no dataset, em ordem alfabética."""
+    return sorted(ler(colunas=["COMPANHIA"])["COMPANHIA"].unique().tolist())
@@ -0,0 +1,97 @@
+"""Tabelas dinâmicas sobre o cubo pré-agregado.
+
+Qualquer combinação de COMPANHIA, ANO, MES, ESTACAO, ORIGEM e DESTINO pode ir
+para as linhas, as colunas ou os filtros. A resposta sai das células do cubo
+(uma por ORIGEM × DESTINO × COMPANHIA × ANO × MES), somando as medidas
+aditivas: o custo depende do número de células, não do número de linhas do
+dataset.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from boraali import cubo, dados
+from boraali.constantes import ESTACAO_DO_MES, ESTACOES
+
+DIMENSOES = ["COMPANHIA", "ANO", "MES", "ESTACAO", "ORIGEM", "DESTINO"]
+
+# Medidas disponíveis: nome exibido -> coluna de ``cubo.finalizar``.
+MEDIDAS = {
+    "Tarifa média": "TARIFA",
+    "Desvio padrão da tarifa": "TARIFA_DP",
+    "Temperatura média": "TEMP_MEDIA",
+    "Linhas": "N",
+}
+
+
+def _celulas() -> pd.DataFrame:
+    # Cubo com a estação do mês como mais uma dimensão (na ordem de ESTACOES).
+    def construir() -> pd.DataFrame:
+        celulas = cubo.obter()
+        return celulas.assign(ESTACAO=pd.Categorical(
+            ESTACAO_DO_MES[celulas["MES"].to_numpy()], categories=list(ESTACOES), ordered=True,
+        ))
+
+    return dados.derivado("explorador", construir)
+
+
+def valores(dimensao: str) -> list:
+    """Valores possíveis de uma dimensão, na ordem de exibição."""
+    serie = _celulas()[dimensao]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        presentes = set(serie.unique())
+        return [str(v) for v in serie.cat.categories if v in presentes]
+    return sorted(int(v) for v in serie.unique())
+
+
+def filtrar(filtros: dict[str, list] | None = None) -> pd.DataFrame:
+    """Células que atendem a todos os filtros (dimensão -> valores aceitos)."""
+    celulas = _celulas()
+    mascara = np.ones(len(celulas), dtype=bool)
+    for dimensao, aceitos in (filtros or {}).items():
+        if aceitos:
+            mascara &= celulas[dimensao].isin(list(aceitos)).to_numpy()
+    return celulas[mascara]
+
+
+def _texto(rotulos: pd.Index) -> pd.Index:
+    # Rótulos categóricos viram texto (como em ``cubo.somar``), mantendo a ordem.
+    if isinstance(rotulos, pd.MultiIndex):
+        return rotulos.set_levels([
+            n.astype(str) if isinstance(n, pd.CategoricalIndex) else n for n in rotulos.levels
+        ])
+    return rotulos.astype(str) if isinstance(rotulos, pd.CategoricalIndex) else rotulos
+
+
+def pivotar(
+    linhas: list[str],
+    colunas: list[str],
+    filtros: dict[str, list] | None = None,
+    medida: str = "TARIFA",
+) -> pd.DataFrame:
+    """Tabela dinâmica da ``medida`` com ``linhas`` × ``colunas``.
+
+    Sem linhas, a tabela tem uma única linha "Total"; sem colunas, uma única
+    coluna com o nome da medida. Combinações sem dados ficam vazias (NaN).
+    """
+    repetidas = set(linhas) & set(colunas)
+    if repetidas:
+        raise ValueError(f"Dimensões nas linhas e nas colunas ao mesmo tempo: {sorted(repetidas)}")
+
+    selecao = filtrar(filtros)
+    por = list(linhas) + list(colunas)
+    if not por:
+        total = cubo.finalizar(selecao[cubo.MEDIDAS].sum().to_frame().T)
+        return pd.DataFrame({medida: total[medida].to_numpy()}, index=["Total"])
+
+    somas = selecao.groupby(por, observed=True, sort=True, as_index=False)[cubo.MEDIDAS].sum()
+    agregado = cubo.finalizar(somas)
+    if not colunas:
+        tabela = agregado.set_index(linhas)[[medida]]
+    elif not linhas:
+        tabela = agregado.set_index(colunas)[[medida]].T
+        tabela.index = ["Total"]
+    else:
+        tabela = agregado.pivot(index=linhas, columns=colunas, values=medida).sort_index(axis="columns")
+    return tabela.set_axis(_texto(tabela.index), axis="index").set_axis(_texto(tabela.columns), axis="columns")
@@ -0,0 +1,106 @@
+"""Figuras Plotly das páginas, montadas uma vez e reaproveitadas.
+
+Cada página entrega a tabela do gráfico e uma função que monta a figura a
+partir dela. Antes de montar:
+
+* séries grandes são reduzidas (``reduzir``): acima de
+  ``BORAALI_MAX_PONTOS_FIGURA`` pontos por série, cada faixa de pontos
+  consecutivos vira o seu mínimo e o seu máximo, preservando picos e vales;
+* a figura pronta vai para o cache de resultados (``boraali.cache``, memória
+  e disco), com chave formada pelo nome da figura, pelo código da função de
+  montagem, pelo conteúdo da tabela reduzida e por parâmetros extras. A mesma
+  tabela não monta a figura de novo em nenhuma sessão ou worker, e mudar o
+  gráfico numa página não reaproveita a figura antiga.
+
+Assim o custo de montar e enviar a figura não cresce com o volume de dados.
+As figuras são compartilhadas: não as altere depois de ``obter``.
+
+As funções de montagem importam o ``plotly.express`` dentro delas: uma
+página cujas figuras já estão no cache não paga a importação.
+"""
+from __future__ import annotations
+
+import hashlib
+import types
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from boraali import cache, config
+
+
+def reduzir(
+    df: pd.DataFrame,
+    y: str,
+    por: str | None = None,
+    maximo: int | None = None,
+) -> pd.DataFrame:
+    """Limita cada série (grupo de ``por``) a cerca de ``maximo`` pontos.
+
+    Os pontos são divididos em faixas consecutivas, na ordem da tabela, e de
+    cada faixa ficam só as linhas de menor e de maior ``y``.
+    """
+    maximo = config.MAX_PONTOS_FIGURA if maximo is None else maximo
+    serie = df[por].to_numpy() if por else np.zeros(len(df), dtype="int8")
+    rotulos = pd.DataFrame({"serie": serie, "y": df[y].to_numpy()})
+    pontos = rotulos.groupby("serie", sort=False)["y"]
+    if len(df) == 0 or pontos.size().max() <= maximo:
+        return df
+
+    # Posição do ponto dentro da sua série -> faixa de 0 a maximo // 2 - 1.
+    rotulos["faixa"] = pontos.cumcount() * (maximo // 2) // pontos.transform("size")
+    faixas = rotulos.dropna(subset=["y"]).groupby(["serie", "faixa"], sort=False)["y"]
+    manter = np.union1d(faixas.idxmin().to_numpy(), faixas.idxmax().to_numpy())
+    return df.iloc[manter]
+
+
+def _assinatura(df: pd.DataFrame) -> str:
+    # Conteúdo e ordem das linhas da tabela.
+    linhas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha256(linhas.tobytes()).hexdigest()[:24]
+
+
+def _hash_codigo(codigo: types.CodeType, h) -> None:
+    # Bytecode, nomes e constantes, descendo nas funções internas (o repr de
+    # um code object traz endereços de memória e muda a cada processo).
+    h.update(codigo.co_code)
+    h.update(repr(codigo.co_names).encode())
+    for const in codigo.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_codigo(const, h)
+        else:
+            h.update(repr(const).encode())
+
+
+def _versao_construtor(construir: Callable) -> str:
+    # Identidade da função de montagem, que vive na página e não no pacote.
+    codigo = getattr(construir, "__code__", None)
+    if codigo is None:
+        return getattr(construir, "__qualname__", type(construir).__qualname__)
+    h = hashlib.sha256()
+    _hash_codigo(codigo, h)
+    return h.hexdigest()[:16]
+
+
+def obter(
+    nome: str,
+    df: pd.DataFrame,
+    construir: Callable[[pd.DataFrame], object],
+    y: str | None = None,
+    por: str | None = None,
+    extras: tuple = (),
+):
+    """Figura ``nome`` para a tabela ``df``, montada por ``construir(df)``.
+
+    Com ``y``, a tabela é reduzida antes (séries separadas por ``por``).
+    ``extras`` (tupla de valores simples) entra na chave: use para parâmetros
+    da figura que não estão na tabela.
+    """
+    if y is not None:
+        df = reduzir(df, y, por)
+    chave = (
+        "figura", nome, _versao_construtor(construir),
+        tuple(df.columns), _assinatura(df), extras,
+    )
+    return cache.resultados.obter(chave, lambda: construir(df))
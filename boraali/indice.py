@@ -0,0 +1,74 @@
+"""Índice de rotas sobre tabelas ordenadas por (ORIGEM, DESTINO).
+
+Com a tabela ordenada por rota, as linhas de cada par (ORIGEM, DESTINO), e
+de cada ORIGEM sozinha, formam um bloco contíguo. O índice guarda o
+``slice`` de cada bloco, então filtrar uma rota custa uma consulta de
+dicionário mais um ``iloc`` proporcional às linhas da rota, e não uma
+varredura booleana da tabela inteira.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+_VAZIO = slice(0, 0)
+
+
+def _codigos(serie: pd.Series) -> tuple[np.ndarray, list[str]]:
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype("category")
+    return serie.cat.codes.to_numpy(dtype="int64"), [str(c) for c in serie.cat.categories]
+
+
+def _blocos(chave: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    if len(chave) == 0:
+        return np.empty(0, dtype="int64"), np.empty(0, dtype="int64")
+    inicio = np.flatnonzero(np.r_[True, chave[1:] != chave[:-1]])
+    fim = np.r_[inicio[1:], len(chave)]
+    return inicio, fim
+
+
+class IndiceRotas:
+    """Mapeia rotas e origens para fatias contíguas de uma tabela."""
+
+    def __init__(self, df: pd.DataFrame):
+        cod_o, cats_o = _codigos(df["ORIGEM"])
+        cod_d, cats_d = _codigos(df["DESTINO"])
+
+        chave = cod_o * (len(cats_d) + 1) + cod_d
+        if np.any(np.diff(chave) < 0):
+            raise ValueError("A tabela precisa estar ordenada por ORIGEM, DESTINO.")
+
+        inicio, fim = _blocos(chave)
+        self._rotas = {
+            (cats_o[cod_o[i]], cats_d[cod_d[i]]): slice(int(i), int(f))
+            for i, f in zip(inicio, fim)
+        }
+
+        inicio, fim = _blocos(cod_o)
+        self._origens = {
+            cats_o[cod_o[i]]: slice(int(i), int(f))
+            for i, f in zip(inicio, fim)
+        }
+
+    def rota(self, origem: str, destino: str) -> slice:
+        """Fatia das linhas da rota (vazia se a rota não existe)."""
+        return self._rotas.get((origem, destino), _VAZIO)
+
+    def origem(self, origem: str) -> slice:
+        """Fatia de todas as linhas que partem de ``origem``."""
+        return self._origens.get(origem, _VAZIO)
+
+    def rotas(self) -> list[tuple[str, str]]:
+        """Rotas presentes, na ordem da tabela."""
+        return list(self._rotas)
+
+    def tamanho_rota(self, origem: str, destino: str) -> int:
+        """Número de linhas da rota."""
+        fatia = self.rota(origem, destino)
+        return fatia.stop - fatia.start
+
+
+def ordenar_por_rota(df: pd.DataFrame) -> pd.DataFrame:
+    """Ordena a tabela por (ORIGEM, DESTINO), mantendo a ordem interna."""
+    return df.sort_values(["ORIGEM", "DESTINO"], kind="stable", ignore_index=True)
@@ -0,0 +1,601 @@
+"""Ingestão dos microdados brutos da ANAC e do INMET.
+
+Os arquivos são lidos em blocos de tamanho fixo e cada bloco é dobrado
+imediatamente em agregados por célula (COMPANHIA, ANO, MES, ORIGEM,
+DESTINO). Nenhum arquivo é carregado inteiro: o pico de memória depende do
+tamanho do bloco e do número de células, não do volume de entrada.
+
+* ANAC (tarifas comercializadas): ``ANO;MES;EMPRESA;ORIGEM;DESTINO;TARIFA;ASSENTOS``,
+  com tarifa em formato brasileiro (``1234,56``). A média por célula é
+  ponderada pelos assentos vendidos, e cada tarifa entra, com o peso dos
+  assentos, nos esboços de quantis (``_QUANTIS.parquet``, ``boraali.quantis``).
+* INMET (estações automáticas): 8 linhas de metadados seguidas das leituras
+  horárias; usa-se a coluna de temperatura de bulbo seco. Cada capital usa
+  as estações mais próximas das suas coordenadas (índice espacial sobre a
+  latitude/longitude do cabeçalho), e só os arquivos dessas estações são lidos.
+
+A saída tem o mesmo esquema do dataset reduzido, então o restante do painel
+(cubo, índices, páginas) funciona sem mudanças.
+
+No modo incremental (``--incremental``) só entram os meses posteriores à
+marca d'água (ANO, MES) de cada fonte, gravada junto ao dataset; apenas as
+partições desses meses são regravadas, numa versão nova do dataset que
+reaproveita as demais por hard link (``armazenamento.nova_versao``). O
+painel passa a vê-las sem reiniciar, pois a versão dos dados muda, e nunca
+vê uma atualização pela metade.
+
+Uso:
+    python -m boraali.ingestao --anac "brutos/anac/*.CSV" --inmet "brutos/inmet/*.CSV"
+    python -m boraali.ingestao --incremental --anac "brutos/anac/2025*.CSV" --inmet ...
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import unicodedata
+import warnings
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from boraali import armazenamento, config, dados, quantis
+from boraali.constantes import (
+    AEROPORTOS_CAPITAIS,
+    CAPITAIS_COORDS,
+    COMPANHIA_OUTRAS,
+    EMPRESAS_COMPANHIAS,
+)
+
+TAMANHO_BLOCO = 500_000
+
+CHAVES = ["COMPANHIA", "ANO", "MES", "ORIGEM", "DESTINO"]
+
+# Quantos agregados parciais acumular antes de compactá-los.
+PARCIAIS_ANTES_DE_COMPACTAR = 8
+
+VALOR_AUSENTE_INMET = -9999
+
+# Arquivos de controle gravados no diretório do dataset (ignorados na leitura).
+ARQUIVO_ESTADO = "_ESTADO_INGESTAO.json"
+ARQUIVO_TEMPERATURAS = "_TEMPERATURAS.parquet"
+
+MarcaDagua = tuple[int, int]
+
+
+# ===========================
+# AGREGAÇÃO INCREMENTAL
+# ===========================
+class Acumulador:
+    """Soma medidas aditivas por chave, bloco a bloco, em memória limitada."""
+
+    def __init__(self, chaves: list[str], medidas: list[str]):
+        self.chaves = chaves
+        self.medidas = medidas
+        self._parciais: list[pd.DataFrame] = []
+
+    def adicionar(self, parcial: pd.DataFrame) -> None:
+        """Incorpora um agregado parcial (já agrupado ou não)."""
+        if parcial.empty:
+            return
+        self._parciais.append(self._somar(parcial))
+        if len(self._parciais) >= PARCIAIS_ANTES_DE_COMPACTAR:
+            self._parciais = [self._somar(pd.concat(self._parciais, ignore_index=True))]
+
+    def resultado(self) -> pd.DataFrame:
+        """Agregado final, uma linha por chave."""
+        if not self._parciais:
+            vazio = {c: pd.Series(dtype=object) for c in self.chaves}
+            vazio.update({m: pd.Series(dtype="float64") for m in self.medidas})
+            return pd.DataFrame(vazio)
+        return self._somar(pd.concat(self._parciais, ignore_index=True))
+
+    def _somar(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.groupby(self.chaves, observed=True, sort=False, as_index=False)[self.medidas].sum()
+
+
+def _arquivos(padroes: str | Iterable[str]) -> list[str]:
+    if isinstance(padroes, str):
+        padroes = [padroes]
+    caminhos = sorted({c for p in padroes for c in glob.glob(p)})
+    if not caminhos:
+        raise FileNotFoundError(f"Nenhum arquivo encontrado para {list(padroes)}")
+    return caminhos
+
+
+def _posteriores(ano: pd.Series, mes: pd.Series, desde: MarcaDagua | None) -> pd.Series:
+    """Máscara das linhas estritamente depois da marca d'água (ANO, MES)."""
+    if desde is None:
+        return pd.Series(True, index=ano.index)
+    return ano.astype("int64") * 100 + mes.astype("int64") > desde[0] * 100 + desde[1]
+
+
+def _sem_acento(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode().upper().strip()
+
+
+# ===========================
+# ANAC
+# ===========================
+def ler_anac(
+    caminho: str, tamanho_bloco: int = TAMANHO_BLOCO, desde: MarcaDagua | None = None
+) -> Iterator[pd.DataFrame]:
+    """Blocos normalizados de um arquivo de tarifas da ANAC.
+
+    Empresas viram AZUL/GOL/LATAM/OUTRAS e aeroportos viram o nome da
+    capital; voos fora das capitais ou dentro da mesma cidade são descartados,
+    assim como meses até ``desde``, inclusive.
+    """
+    leitor = pd.read_csv(
+        caminho,
+        sep=";",
+        decimal=",",
+        encoding="latin-1",
+        usecols=["ANO", "MES", "EMPRESA", "ORIGEM", "DESTINO", "TARIFA", "ASSENTOS"],
+        dtype={"EMPRESA": str, "ORIGEM": str, "DESTINO": str},
+        chunksize=tamanho_bloco,
+    )
+    for bloco in leitor:
+        origem = bloco["ORIGEM"].str.strip().map(AEROPORTOS_CAPITAIS)
+        destino = bloco["DESTINO"].str.strip().map(AEROPORTOS_CAPITAIS)
+        valido = origem.notna() & destino.notna() & (origem != destino)
+        valido &= _posteriores(bloco["ANO"], bloco["MES"], desde)
+
+        bloco = bloco[valido]
+        yield pd.DataFrame({
+            "COMPANHIA": bloco["EMPRESA"].str.strip().map(EMPRESAS_COMPANHIAS).fillna(COMPANHIA_OUTRAS),
+            "ANO": bloco["ANO"].astype("int16"),
+            "MES": bloco["MES"].astype("int8"),
+            "ORIGEM": origem[valido],
+            "DESTINO": destino[valido],
+            "TARIFA": pd.to_numeric(bloco["TARIFA"], errors="coerce"),
+            "ASSENTOS": pd.to_numeric(bloco["ASSENTOS"], errors="coerce").fillna(1).clip(lower=0),
+        }).dropna(subset=["TARIFA"])
+
+
+def _somas_anac(bloco: pd.DataFrame) -> pd.DataFrame:
+    peso = bloco["ASSENTOS"].to_numpy(dtype="float64")
+    tarifa = bloco["TARIFA"].to_numpy(dtype="float64")
+    return bloco[CHAVES].assign(ASSENTOS=peso, TARIFA_SOMA=tarifa * peso)
+
+
+def agregar_anac(
+    caminhos: str | Iterable[str],
+    tamanho_bloco: int = TAMANHO_BLOCO,
+    desde: MarcaDagua | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Células e esboços de quantis das passagens, em streaming.
+
+    As células trazem assentos e soma ponderada de tarifas; os esboços
+    (``boraali.quantis``) contam cada tarifa pelos assentos vendidos.
+    """
+    acc = Acumulador(CHAVES, ["ASSENTOS", "TARIFA_SOMA"])
+    esbocos = Acumulador(quantis.CHAVES + ["FAIXA"], ["N"])
+    for caminho in _arquivos(caminhos):
+        for bloco in ler_anac(caminho, tamanho_bloco, desde):
+            acc.adicionar(_somas_anac(bloco))
+            esbocos.adicionar(quantis.construir(bloco, peso="ASSENTOS"))
+    return acc.resultado(), esbocos.resultado()
+
+
+# ===========================
+# INMET
+# ===========================
+LINHAS_METADADOS_INMET = 8
+
+
+def metadados_inmet(caminho: str) -> dict[str, str]:
+    """Cabeçalho de uma estação do INMET (ESTACAO, LATITUDE, ...)."""
+    meta = {}
+    with open(caminho, encoding="latin-1") as f:
+        for _ in range(LINHAS_METADADOS_INMET):
+            chave, _, valor = f.readline().partition(";")
+            meta[chave.strip().rstrip(":").upper()] = valor.strip()
+    return meta
+
+
+def _por_valor_distinto(serie: pd.Series, converter) -> np.ndarray:
+    """Aplica ``converter`` só aos valores distintos da série e espalha o resultado.
+
+    Leituras horárias repetem a mesma data 24 vezes e poucas centenas de
+    temperaturas diferentes, então converter os distintos é bem mais barato
+    que converter linha a linha.
+    """
+    codigos, distintos = pd.factorize(serie)
+    valores = np.append(np.asarray(converter(pd.Series(distintos)), dtype="float64"), np.nan)
+    return valores[codigos]  # código -1 (vazio) aponta para o NaN do fim
+
+
+def _numero_br(textos: pd.Series) -> pd.Series:
+    return pd.to_numeric(textos.str.strip().str.replace(",", ".", regex=False), errors="coerce")
+
+
+def ler_inmet(
+    caminho: str, tamanho_bloco: int = TAMANHO_BLOCO, desde: MarcaDagua | None = None
+) -> Iterator[pd.DataFrame]:
+    """Blocos (ANO, MES, TEMP) das leituras horárias de uma estação."""
+    leitor = pd.read_csv(
+        caminho,
+        sep=";",
+        decimal=",",
+        encoding="latin-1",
+        skiprows=LINHAS_METADADOS_INMET,
+        usecols=lambda c: c.upper().startswith(("DATA", "TEMPERATURA DO AR - BULBO SECO")),
+        dtype=str,
+        chunksize=tamanho_bloco,
+    )
+    for bloco in leitor:
+        col_data = next(c for c in bloco.columns if c.upper().startswith("DATA"))
+        col_temp = next(c for c in bloco.columns if c.upper().startswith("TEMPERATURA"))
+
+        ano = _por_valor_distinto(bloco[col_data], lambda d: pd.to_numeric(d.str.strip().str[0:4], errors="coerce"))
+        mes = _por_valor_distinto(bloco[col_data], lambda d: pd.to_numeric(d.str.strip().str[5:7], errors="coerce"))
+        temp = _por_valor_distinto(bloco[col_temp], _numero_br)
+        temp[temp <= VALOR_AUSENTE_INMET] = np.nan
+
+        leituras = pd.DataFrame({"ANO": ano, "MES": mes, "TEMP": temp}).dropna()
+        leituras = leituras.astype({"ANO": "int16", "MES": "int8"})
+        yield leituras[_posteriores(leituras["ANO"], leituras["MES"], desde)]
+
+
+def _somas_inmet(bloco: pd.DataFrame) -> pd.DataFrame:
+    """Soma e contagem das leituras do bloco por (ANO, MES)."""
+    return (
+        bloco.groupby(["ANO", "MES"], sort=False)["TEMP"]
+        .agg(TEMP_SOMA="sum", TEMP_N="count")
+        .reset_index()
+    )
+
+
+def capital_da_estacao(meta: dict[str, str]) -> str | None:
+    """Capital cujo nome abre o nome da estação (ex.: "SAO PAULO - MIRANTE")."""
+    estacao = _sem_acento(meta.get("ESTACAO", ""))
+    for capital in CAPITAIS_COORDS:
+        if estacao.startswith(_sem_acento(capital)):
+            return capital
+    return None
+
+
+# ===========================
+# ESTAÇÕES → CAPITAIS (ÍNDICE ESPACIAL)
+# ===========================
+RAIO_TERRA_KM = 6371.0088
+
+
+def estacoes_inmet(caminhos: str | Iterable[str]) -> tuple[pd.DataFrame, dict[str, list[str]]]:
+    """Estações (ESTACAO, NOME, LATITUDE, LONGITUDE) e os arquivos de cada uma.
+
+    Só lê os cabeçalhos. O INMET publica um arquivo por estação e ano, então
+    a mesma estação (pelo código WMO) pode ter vários arquivos.
+    """
+    linhas: dict[str, dict] = {}
+    arquivos: dict[str, list[str]] = {}
+    for caminho in _arquivos(caminhos):
+        meta = metadados_inmet(caminho)
+        codigo = meta.get("CODIGO (WMO)") or meta.get("ESTACAO") or caminho
+        arquivos.setdefault(codigo, []).append(caminho)
+        linhas.setdefault(codigo, {
+            "ESTACAO": codigo,
+            "NOME": meta.get("ESTACAO", ""),
+            "LATITUDE": _numero_br(pd.Series([meta.get("LATITUDE", "")])).iloc[0],
+            "LONGITUDE": _numero_br(pd.Series([meta.get("LONGITUDE", "")])).iloc[0],
+        })
+    estacoes = pd.DataFrame(list(linhas.values()), columns=["ESTACAO", "NOME", "LATITUDE", "LONGITUDE"])
+    return estacoes, arquivos
+
+
+def estacoes_das_capitais(
+    estacoes: pd.DataFrame,
+    por_capital: int = config.ESTACOES_POR_CAPITAL,
+    raio_km: float = config.RAIO_ESTACOES_KM,
+) -> pd.DataFrame:
+    """Estações mais próximas de cada capital (CAPITAL, ESTACAO, DISTANCIA_KM).
+
+    Uma BallTree com distância haversine sobre as coordenadas das estações
+    dá, para cada capital, as ``por_capital`` mais próximas; ficam as que
+    estão a até ``raio_km``. Estações sem coordenadas no cabeçalho entram
+    pelo nome (``capital_da_estacao``), com distância zero.
+    """
+    from sklearn.neighbors import BallTree
+
+    tem_coordenadas = estacoes["LATITUDE"].notna() & estacoes["LONGITUDE"].notna()
+    partes = []
+
+    com_coordenadas = estacoes[tem_coordenadas]
+    if not com_coordenadas.empty:
+        arvore = BallTree(np.radians(com_coordenadas[["LATITUDE", "LONGITUDE"]].to_numpy()), metric="haversine")
+        capitais = np.radians([[c["lat"], c["lon"]] for c in CAPITAIS_COORDS.values()])
+        k = min(por_capital, len(com_coordenadas))
+        distancias, posicoes = arvore.query(capitais, k=k)
+        vizinhas = pd.DataFrame({
+            "CAPITAL": np.repeat(list(CAPITAIS_COORDS), k),
+            "ESTACAO": com_coordenadas["ESTACAO"].to_numpy()[posicoes.ravel()],
+            "DISTANCIA_KM": distancias.ravel() * RAIO_TERRA_KM,
+        })
+        partes.append(vizinhas[vizinhas["DISTANCIA_KM"] <= raio_km])
+
+    sem_coordenadas = estacoes[~tem_coordenadas]
+    if not sem_coordenadas.empty:
+        capital = sem_coordenadas["NOME"].map(lambda nome: capital_da_estacao({"ESTACAO": nome}))
+        partes.append(pd.DataFrame({
+            "CAPITAL": capital,
+            "ESTACAO": sem_coordenadas["ESTACAO"],
+            "DISTANCIA_KM": 0.0,
+        }).dropna(subset=["CAPITAL"]))
+
+    if not partes:
+        return pd.DataFrame(columns=["CAPITAL", "ESTACAO", "DISTANCIA_KM"])
+    return pd.concat(partes, ignore_index=True).sort_values(["CAPITAL", "DISTANCIA_KM"], ignore_index=True)
+
+
+def temperaturas_mensais(
+    caminhos: str | Iterable[str],
+    tamanho_bloco: int = TAMANHO_BLOCO,
+    desde: MarcaDagua | None = None,
+) -> pd.DataFrame:
+    """Temperatura média mensal (CAPITAL, ANO, MES, TEMP_MEDIA) em streaming.
+
+    Cada capital recebe a média das leituras das suas estações mais
+    próximas (``estacoes_das_capitais``). Só os arquivos dessas estações são
+    lidos, e cada bloco vira somas por (ANO, MES) antes de ser acumulado.
+    """
+    estacoes, arquivos = estacoes_inmet(caminhos)
+    vinculos = estacoes_das_capitais(estacoes)
+
+    acc = Acumulador(["ESTACAO", "ANO", "MES"], ["TEMP_SOMA", "TEMP_N"])
+    for estacao in vinculos["ESTACAO"].unique():
+        for caminho in arquivos[estacao]:
+            for bloco in ler_inmet(caminho, tamanho_bloco, desde):
+                acc.adicionar(_somas_inmet(bloco).assign(ESTACAO=estacao))
+
+    por_estacao = acc.resultado()
+    if por_estacao.empty:
+        return TEMPERATURAS_VAZIAS
+    temps = (
+        vinculos[["CAPITAL", "ESTACAO"]]
+        .merge(por_estacao, on="ESTACAO")
+        .groupby(["CAPITAL", "ANO", "MES"], sort=True, as_index=False)[["TEMP_SOMA", "TEMP_N"]]
+        .sum()
+    )
+    temps["TEMP_MEDIA"] = temps["TEMP_SOMA"] / temps["TEMP_N"]
+    return temps.astype({"ANO": "int16", "MES": "int8"})[["CAPITAL", "ANO", "MES", "TEMP_MEDIA"]]
+
+
+# ===========================
+# MONTAGEM DA TABELA
+# ===========================
+def _com_temperatura(tabela: pd.DataFrame, temperaturas: pd.DataFrame, manter: bool = False) -> pd.DataFrame:
+    """Preenche TEMP_MEDIA da rota com a média da origem e do destino.
+
+    Usa a temperatura que existir se só uma ponta tiver leituras. Com
+    ``manter=True``, rotas sem nenhuma leitura conservam o valor anterior.
+    """
+    tabela = tabela.copy()
+    if temperaturas.empty:
+        if not manter:
+            tabela["TEMP_MEDIA"] = np.nan
+        return tabela
+
+    temps = temperaturas.set_index(["CAPITAL", "ANO", "MES"])["TEMP_MEDIA"]
+    t_o = temps.reindex(pd.MultiIndex.from_frame(
+        tabela[["ORIGEM", "ANO", "MES"]].astype({"ORIGEM": str}))).to_numpy()
+    t_d = temps.reindex(pd.MultiIndex.from_frame(
+        tabela[["DESTINO", "ANO", "MES"]].astype({"DESTINO": str}))).to_numpy()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # rotas sem nenhuma leitura
+        nova = pd.Series(np.round(np.nanmean(np.vstack([t_o, t_d]), axis=0), 2), index=tabela.index)
+
+    tabela["TEMP_MEDIA"] = nova.fillna(tabela["TEMP_MEDIA"]) if manter else nova
+    return tabela
+
+
+def montar_tabela(celulas: pd.DataFrame, temperaturas: pd.DataFrame) -> pd.DataFrame:
+    """Tabela no esquema do dataset a partir das células agregadas."""
+    tabela = celulas[CHAVES].copy()
+    tabela["TARIFA"] = (celulas["TARIFA_SOMA"] / celulas["ASSENTOS"]).round(2)
+    tabela = _com_temperatura(tabela, temperaturas)
+
+    tabela = tabela[np.isfinite(tabela["TARIFA"])]
+    return tabela.sort_values(CHAVES, ignore_index=True)[dados.COLUNAS]
+
+
+# ===========================
+# CONTROLE (MARCAS D'ÁGUA E TEMPERATURAS)
+# ===========================
+TEMPERATURAS_VAZIAS = pd.DataFrame({
+    "CAPITAL": pd.Series(dtype=str),
+    "ANO": pd.Series(dtype="int16"),
+    "MES": pd.Series(dtype="int8"),
+    "TEMP_MEDIA": pd.Series(dtype="float64"),
+})
+
+
+def ler_estado(diretorio: str) -> dict[str, MarcaDagua]:
+    """Marcas d'água (ANO, MES) de cada fonte já ingerida."""
+    caminho = os.path.join(diretorio, ARQUIVO_ESTADO)
+    if not os.path.isfile(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return {fonte: tuple(marca) for fonte, marca in json.load(f).items()}
+
+
+def ler_esbocos(diretorio: str) -> pd.DataFrame | None:
+    """Esboços de quantis já ingeridos (None se o dataset não tem esboços)."""
+    caminho = os.path.join(diretorio, quantis.ARQUIVO)
+    if not os.path.isfile(caminho):
+        return None
+    return pd.read_parquet(caminho)
+
+
+def ler_temperaturas(diretorio: str) -> pd.DataFrame:
+    """Temperaturas mensais por capital já ingeridas."""
+    caminho = os.path.join(diretorio, ARQUIVO_TEMPERATURAS)
+    if not os.path.isfile(caminho):
+        return TEMPERATURAS_VAZIAS
+    return pd.read_parquet(caminho)
+
+
+def _ultimo_mes(df: pd.DataFrame) -> MarcaDagua | None:
+    if df.empty:
+        return None
+    chave = (df["ANO"].astype("int64") * 100 + df["MES"].astype("int64")).max()
+    return (int(chave // 100), int(chave % 100))
+
+
+def _salvar_controle(
+    diretorio: str,
+    estado: dict[str, MarcaDagua | None],
+    temperaturas: pd.DataFrame,
+    esbocos: pd.DataFrame | None = None,
+) -> None:
+    marcas = {fonte: list(marca) for fonte, marca in estado.items() if marca is not None}
+    temporario = os.path.join(diretorio, ARQUIVO_ESTADO + ".tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(marcas, f)
+    os.replace(temporario, os.path.join(diretorio, ARQUIVO_ESTADO))
+    temperaturas.to_parquet(os.path.join(diretorio, ARQUIVO_TEMPERATURAS), index=False)
+    if esbocos is not None:
+        esbocos.to_parquet(os.path.join(diretorio, quantis.ARQUIVO), index=False)
+    armazenamento.marcar_versao(diretorio)
+
+
+def _lotes(tabela: pd.DataFrame):
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(tabela, preserve_index=False).cast(armazenamento.ESQUEMA).to_batches()
+
+
+# ===========================
+# INGESTÃO COMPLETA E INCREMENTAL
+# ===========================
+def ingerir(
+    anac: str | Iterable[str],
+    inmet: str | Iterable[str] | None = None,
+    diretorio: str = dados.DIR_PARQUET,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+) -> pd.DataFrame:
+    """Ingestão completa: regrava o dataset e as marcas d'água."""
+    celulas, esbocos = agregar_anac(anac, tamanho_bloco)
+    temperaturas = temperaturas_mensais(inmet, tamanho_bloco) if inmet else TEMPERATURAS_VAZIAS
+    tabela = montar_tabela(celulas, temperaturas)
+
+    with armazenamento.nova_versao(diretorio, manter=False) as novo:
+        armazenamento.gravar(_lotes(tabela), novo)
+        _salvar_controle(
+            novo,
+            {"anac": _ultimo_mes(tabela), "inmet": _ultimo_mes(temperaturas)},
+            temperaturas,
+            esbocos,
+        )
+    return tabela
+
+
+def atualizar(
+    anac: str | Iterable[str] | None,
+    inmet: str | Iterable[str] | None = None,
+    diretorio: str = dados.DIR_PARQUET,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+) -> pd.DataFrame:
+    """Ingestão incremental: só os meses após a marca d'água de cada fonte.
+
+    Novos meses da ANAC viram novas partições; novos meses do INMET também
+    atualizam TEMP_MEDIA das partições já existentes desses meses. Só as
+    partições tocadas são regravadas. Retorna as linhas gravadas.
+    """
+    if not armazenamento.existe(diretorio):
+        armazenamento.converter_csv(dados.CAMINHO_CSV, diretorio)
+
+    estado = ler_estado(diretorio)
+    existentes = armazenamento.particoes(diretorio)
+    marca_anac = estado.get("anac") or (max(existentes) if existentes else None)
+    marca_inmet = estado.get("inmet")
+
+    temps_novas = (
+        temperaturas_mensais(inmet, tamanho_bloco, marca_inmet) if inmet else TEMPERATURAS_VAZIAS
+    )
+    temperaturas = (
+        pd.concat([ler_temperaturas(diretorio), temps_novas], ignore_index=True)
+        .drop_duplicates(["CAPITAL", "ANO", "MES"], keep="last")
+    )
+
+    partes = []
+    esbocos_novos = None
+    if anac:
+        celulas, esbocos_novos = agregar_anac(anac, tamanho_bloco, marca_anac)
+        partes.append(montar_tabela(celulas, temperaturas))
+
+    meses_novos = {(int(a), int(m)) for p in partes for a, m in zip(p["ANO"], p["MES"])}
+
+    # Os esboços só valem se cobrem todos os meses: um dataset convertido do
+    # CSV reduzido (sem esboços) continua sem eles até uma ingestão completa.
+    esbocos = ler_esbocos(diretorio)
+    if esbocos is None and not existentes and esbocos_novos is not None:
+        esbocos = esbocos_novos
+    elif esbocos is not None and esbocos_novos is not None and not esbocos_novos.empty:
+        mes = esbocos["ANO"].astype("int64") * 100 + esbocos["MES"].astype("int64")
+        esbocos = pd.concat(
+            [esbocos[~mes.isin([a * 100 + m for a, m in meses_novos])], esbocos_novos],
+            ignore_index=True,
+        )
+    meses_temp = {(int(a), int(m)) for a, m in zip(temps_novas["ANO"], temps_novas["MES"])}
+    regravar_temp = (meses_temp & existentes) - meses_novos
+    if regravar_temp:
+        antigas = armazenamento.ler(
+            diretorio,
+            anos=tuple({a for a, _ in regravar_temp}),
+            meses=tuple({m for _, m in regravar_temp}),
+        )
+        chave = antigas["ANO"].astype("int64") * 100 + antigas["MES"].astype("int64")
+        antigas = antigas[chave.isin([a * 100 + m for a, m in regravar_temp])]
+        partes.append(_com_temperatura(antigas, temperaturas, manter=True)[dados.COLUNAS])
+
+    tabela = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=dados.COLUNAS)
+    tocadas = {(int(a), int(m)) for a, m in zip(tabela["ANO"], tabela["MES"])}
+
+    # Versão nova: partições intocadas viram hard links, as tocadas são
+    # regravadas inteiras e o painel só vê o resultado depois da troca.
+    with armazenamento.nova_versao(diretorio, exceto=tocadas) as novo:
+        if not tabela.empty:
+            armazenamento.gravar(_lotes(tabela), novo)
+        _salvar_controle(
+            novo,
+            {
+                "anac": max(filter(None, [marca_anac, _ultimo_mes(tabela)]), default=None),
+                "inmet": max(filter(None, [marca_inmet, _ultimo_mes(temps_novas)]), default=None),
+            },
+            temperaturas,
+            esbocos,
+        )
+    return tabela
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingestão dos microdados ANAC/INMET.")
+    parser.add_argument("--anac", nargs="+", help="arquivos (ou globs) de tarifas da ANAC")
+    parser.add_argument("--inmet", nargs="+", help="arquivos (ou globs) de estações do INMET")
+    parser.add_argument("--saida", default=dados.DIR_PARQUET, help="diretório do dataset Parquet")
+    parser.add_argument("--incremental", action="store_true",
+                        help="ingere só os meses após a última carga, sem regravar o resto")
+    parser.add_argument("--csv", help="também grava as linhas ingeridas neste CSV")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco de leitura")
+    args = parser.parse_args(argv)
+
+    if args.incremental:
+        if not (args.anac or args.inmet):
+            parser.error("informe --anac e/ou --inmet")
+        tabela = atualizar(args.anac, args.inmet, args.saida, args.bloco)
+    else:
+        if not args.anac:
+            parser.error("a ingestão completa exige --anac")
+        tabela = ingerir(args.anac, args.inmet, args.saida, args.bloco)
+
+    if args.csv:
+        os.makedirs(os.path.dirname(os.path.abspath(args.csv)), exist_ok=True)
+        tabela.to_csv(args.csv, index=False)
+    print(f"{len(tabela)} células gravadas em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Medição opcional do tempo de cada etapa das páginas.
+
+Desligada por padrão. Liga com ``BORAALI_INSTRUMENTACAO=1`` no ambiente ou
+com ``?debug=1`` na URL. Com ela ligada, cada execução de página:
+
+* mede as etapas marcadas com ``etapa()`` ou ``cronometrado``: leitura dos
+  dados, pré-cálculos, análises da ``api``, montagem das figuras...;
+* mostra a quebra por etapa num painel recolhível da barra lateral, logo
+  abaixo do menu;
+* acrescenta um registro JSON por execução (página, filtros, etapas com
+  duração e linhas) em ``data/logs/etapas.jsonl`` (ou ``BORAALI_LOG_ETAPAS``).
+
+Desligada, ``etapa()`` não mede nada e custa só uma consulta a um
+``ContextVar``. O motor não depende do Streamlit: ele só é importado quando
+uma página inicia a medição.
+"""
+from __future__ import annotations
+
+import atexit
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from boraali import config
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_LOG = os.environ.get("BORAALI_LOG_ETAPAS", os.path.join(_RAIZ, "data", "logs", "etapas.jsonl"))
+
+_atual: contextvars.ContextVar[Execucao | None] = contextvars.ContextVar("execucao", default=None)
+
+# Execuções interrompidas por ``st.stop()`` são gravadas na próxima execução
+# da mesma sessão (ou na saída do processo).
+_pendentes: dict[str, Execucao] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class Etapa:
+    nome: str
+    nivel: int
+    ms: float = 0.0
+    linhas: int | None = None
+
+
+@dataclass
+class Execucao:
+    pagina: str
+    sessao: str
+    filtros: dict = field(default_factory=dict)
+    etapas: list[Etapa] = field(default_factory=list)
+    inicio: float = field(default_factory=time.perf_counter)
+    data: str = field(default_factory=lambda: time.strftime("%Y-%m-%dT%H:%M:%S"))
+    painel: object = None
+    nivel: int = 0
+
+    def registro(self, interrompida: bool) -> dict:
+        return {
+            "data": self.data,
+            "pagina": self.pagina,
+            "filtros": self.filtros,
+            "total_ms": round((time.perf_counter() - self.inicio) * 1e3, 3),
+            "interrompida": interrompida,
+            "etapas": [
+                {"etapa": e.nome, "nivel": e.nivel, "ms": round(e.ms, 3), "linhas": e.linhas}
+                for e in self.etapas
+            ],
+        }
+
+
+def _gravar(registro: dict) -> None:
+    with _lock:
+        os.makedirs(os.path.dirname(ARQUIVO_LOG), exist_ok=True)
+        with open(ARQUIVO_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+
+
+@atexit.register
+def _gravar_pendentes() -> None:
+    with _lock:
+        pendentes = list(_pendentes.values())
+        _pendentes.clear()
+    for execucao in pendentes:
+        _gravar(execucao.registro(interrompida=True))
+
+
+def _ativa() -> bool:
+    if config.INSTRUMENTACAO:
+        return True
+    import streamlit as st
+
+    return st.query_params.get("debug") == "1"
+
+
+def _sessao() -> str:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else str(threading.get_ident())
+
+
+# ===========================
+# USO NAS PÁGINAS
+# ===========================
+def iniciar(pagina: str) -> Execucao | None:
+    """Começa a medir a execução da página (se a instrumentação estiver ligada).
+
+    Deve ser chamada logo após o menu lateral: o painel aparece ali.
+    """
+    if not _ativa():
+        _atual.set(None)
+        return None
+
+    import streamlit as st
+
+    execucao = Execucao(pagina=pagina, sessao=_sessao())
+    with _lock:
+        anterior = _pendentes.pop(execucao.sessao, None)
+        _pendentes[execucao.sessao] = execucao
+    if anterior is not None:
+        _gravar(anterior.registro(interrompida=True))
+
+    execucao.painel = st.sidebar.empty()
+    _atual.set(execucao)
+    return execucao
+
+
+def filtros(**valores) -> None:
+    """Registra os filtros escolhidos na execução atual."""
+    execucao = _atual.get()
+    if execucao is not None:
+        execucao.filtros.update(valores)
+
+
+def finalizar() -> None:
+    """Encerra a medição da página: atualiza o painel e grava o registro."""
+    execucao = _atual.get()
+    if execucao is None:
+        return
+    _atual.set(None)
+    with _lock:
+        if _pendentes.get(execucao.sessao) is execucao:
+            del _pendentes[execucao.sessao]
+    _mostrar(execucao)
+    _gravar(execucao.registro(interrompida=False))
+
+
+def _mostrar(execucao: Execucao) -> None:
+    import pandas as pd
+    import streamlit as st
+
+    from boraali import cache
+
+    tabela = pd.DataFrame({
+        "Etapa": [" " * e.nivel + e.nome for e in execucao.etapas],
+        "ms": [round(e.ms, 1) for e in execucao.etapas],
+        "Linhas": [e.linhas for e in execucao.etapas],
+    })
+    total = (time.perf_counter() - execucao.inicio) * 1e3
+    with execucao.painel.container():
+        with st.expander(f"⏱️ Tempos por etapa — {total:.0f} ms"):
+            st.dataframe(tabela, hide_index=True, use_container_width=True)
+            c = cache.estatisticas()
+            st.caption(
+                f"Cache de resultados: {c['acertos']} acertos, {c['acertos_disco']} do disco, {c['falhas']} falhas, "
+                f"{c['descartes']} descartes — {c['entradas']} entradas, "
+                f"{c['bytes'] / 2**20:.1f} de {c['limite_bytes'] / 2**20:.0f} MB"
+            )
+
+
+# ===========================
+# MARCAÇÃO DE ETAPAS
+# ===========================
+@contextlib.contextmanager
+def etapa(nome: str, linhas: int | None = None) -> Iterator[Etapa | None]:
+    """Mede o bloco como uma etapa da execução atual (se houver).
+
+    O objeto devolvido aceita ``linhas`` depois do cálculo:
+    ``with etapa("filtro") as e: ...; if e: e.linhas = len(df)``.
+    """
+    execucao = _atual.get()
+    if execucao is None:
+        yield None
+        return
+
+    registro = Etapa(nome=nome, nivel=execucao.nivel, linhas=linhas)
+    execucao.etapas.append(registro)
+    execucao.nivel += 1
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro.ms = (time.perf_counter() - inicio) * 1e3
+        execucao.nivel -= 1
+        if execucao.nivel == 0 and execucao.painel is not None:
+            # Atualiza o painel a cada etapa: vale mesmo se a página parar antes do fim.
+            _mostrar(execucao)
+
+
+def _linhas(resultado) -> int | None:
+    # Tabelas contam as próprias linhas; resultados da api, a primeira tabela.
+    if dataclasses.is_dataclass(resultado):
+        for campo in dataclasses.fields(resultado):
+            valor = getattr(resultado, campo.name)
+            if hasattr(valor, "columns"):
+                return len(valor)
+        return None
+    if hasattr(resultado, "columns"):
+        return len(resultado)
+    return None
+
+
+def cronometrado(nome: str | None = None) -> Callable:
+    """Decorador: mede cada chamada da função como uma etapa."""
+    def decorador(funcao: Callable) -> Callable:
+        rotulo = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if _atual.get() is None:
+                return funcao(*args, **kwargs)
+            with etapa(rotulo) as registro:
+                resultado = funcao(*args, **kwargs)
+                registro.linhas = _linhas(resultado)
+            return resultado
+
+        return envolvida
+
+    return decorador
@@ -0,0 +1,69 @@
+"""Busca por orçamento em todas as rotas de uma origem.
+
+Para cada origem, guarda a tarifa média mensal de cada (DESTINO, MES),
+calculada sobre todos os anos e companhias, em ordem crescente de tarifa.
+Responder "para onde e quando dá para ir com até R$ X" vira uma busca
+binária (``searchsorted``) mais uma fatia: o resultado já sai ranqueado.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from boraali import cubo, dados
+
+
+class IndiceOrcamento:
+    """Tarifas médias mensais por origem, ordenadas para busca binária."""
+
+    def __init__(self, celulas: pd.DataFrame):
+        tabela = cubo.agregar(celulas, ["ORIGEM", "DESTINO", "MES"])
+        tabela = tabela.sort_values(["ORIGEM", "TARIFA"], kind="stable", ignore_index=True)
+
+        destino = tabela["DESTINO"].astype("category")
+        self._destinos = np.asarray(destino.cat.categories, dtype=object)
+        self._cod_destino = destino.cat.codes.to_numpy()
+        self._mes = tabela["MES"].to_numpy(dtype="int8")
+        self._tarifa = tabela["TARIFA"].to_numpy(dtype="float64")
+        self._temp = tabela["TEMP_MEDIA"].to_numpy(dtype="float64")
+
+        # Cada origem é um bloco contíguo da tabela.
+        origem = tabela["ORIGEM"].astype(str).to_numpy()
+        quebras = np.flatnonzero(origem[1:] != origem[:-1]) + 1
+        inicio = np.r_[0, quebras] if len(origem) else quebras
+        fim = np.r_[quebras, len(origem)] if len(origem) else quebras
+        self._origens = {origem[i]: slice(int(i), int(f)) for i, f in zip(inicio, fim)}
+
+    def _linhas(self, sel: slice) -> pd.DataFrame:
+        return pd.DataFrame({
+            "DESTINO": self._destinos[self._cod_destino[sel]],
+            "MES": self._mes[sel],
+            "TARIFA": self._tarifa[sel],
+            "TEMP_MEDIA": self._temp[sel],
+        })
+
+    def abaixo_de(self, origem: str, orcamento: float, limite: int | None = None) -> pd.DataFrame:
+        """Pares (DESTINO, MES) da origem com tarifa média até ``orcamento``.
+
+        Ordenados da tarifa mais barata para a mais cara.
+        """
+        fatia = self._origens.get(origem, slice(0, 0))
+        fim = fatia.start + int(np.searchsorted(self._tarifa[fatia], orcamento, side="right"))
+        if limite is not None:
+            fim = min(fim, fatia.start + limite)
+        return self._linhas(slice(fatia.start, fim))
+
+    def mais_barato(self, origem: str) -> pd.DataFrame:
+        """Par (DESTINO, MES) mais barato da origem (vazio se não houver)."""
+        fatia = self._origens.get(origem, slice(0, 0))
+        return self._linhas(slice(fatia.start, min(fatia.start + 1, fatia.stop)))
+
+
+def obter() -> IndiceOrcamento:
+    """Índice de orçamento do dataset atual (todos os anos e companhias)."""
+    return dados.derivado("orcamento", lambda: IndiceOrcamento(cubo.obter()))
+
+
+def abaixo_de(origem: str, orcamento: float, limite: int | None = None) -> pd.DataFrame:
+    """Atalho para ``obter().abaixo_de(...)``."""
+    return obter().abaixo_de(origem, orcamento, limite)
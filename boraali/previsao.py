@@ -0,0 +1,154 @@
+"""Previsões mensais em lote para todas as rotas (e rota × companhia).
+
+Cada série é ajustada com um modelo sazonal com tendência linear comum aos
+meses, ponderado pelo número de observações de cada célula:
+
+    tarifa(ano, mes) = nível[mes] + tendência · (ano − ano_médio[mes])
+
+Os mínimos quadrados desse modelo têm solução fechada a partir de somas por
+(série, mês), então todas as séries são ajustadas de uma vez com alguns
+``groupby`` — sem laço em Python. A tendência é amortecida e, quando não é
+identificável (um único ano por mês), cai-se no fator de projeção padrão.
+
+O resultado é uma tabela compacta com 12 previsões por série, ordenada por
+rota e indexada: a página só consulta, e a latência não depende do modelo.
+A tabela é persistida em ``data/modelos`` (ver ``boraali.artefatos``) e só é
+recalculada quando o conteúdo dos dados ou os parâmetros mudam.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from boraali import artefatos, config, cubo, dados, indice
+
+TODAS = "TODAS"
+
+
+def _somas_por_serie(celulas: pd.DataFrame, serie: list[str]) -> pd.DataFrame:
+    base = cubo.somar(celulas, serie + ["ANO", "MES"])
+    ano = base["ANO"].to_numpy(dtype="float64")
+    w = base["N"].to_numpy(dtype="float64")
+    wy = base["TARIFA_SOMA"].to_numpy()
+    por_mes = pd.DataFrame({
+        **{c: base[c] for c in serie + ["MES"]},
+        "W": w,
+        "WX": w * ano,
+        "WX2": w * ano * ano,
+        "WY": wy,
+        "WXY": wy * ano,
+    })
+    return por_mes.groupby(serie + ["MES"], sort=False, as_index=False).sum()
+
+
+def ajustar(
+    celulas: pd.DataFrame,
+    ano_alvo: int,
+    ultimo_ano: int,
+    fator: float = config.FATOR_PROJECAO,
+    amortecimento: float = config.AMORTECIMENTO_TENDENCIA,
+) -> pd.DataFrame:
+    """Ajusta todas as séries de uma vez e prevê os 12 meses de ``ano_alvo``.
+
+    Séries: cada rota (COMPANHIA = "TODAS") e cada rota × companhia.
+    """
+    partes = [
+        _somas_por_serie(celulas, ["ORIGEM", "DESTINO"]).assign(COMPANHIA=TODAS),
+        _somas_por_serie(celulas, ["ORIGEM", "DESTINO", "COMPANHIA"]),
+    ]
+    s = pd.concat(partes, ignore_index=True)
+    serie = ["ORIGEM", "DESTINO", "COMPANHIA"]
+
+    w = s["W"].to_numpy()
+    x_med = s["WX"].to_numpy() / w
+    y_med = s["WY"].to_numpy() / w
+
+    # Somas centradas no mês; a tendência é única por série.
+    s["SXY"] = s["WXY"].to_numpy() - w * x_med * y_med
+    s["SXX"] = s["WX2"].to_numpy() - w * x_med * x_med
+    sxy = s.groupby(serie, sort=False)["SXY"].transform("sum").to_numpy()
+    sxx = s.groupby(serie, sort=False)["SXX"].transform("sum").to_numpy()
+
+    identificavel = sxx > 1e-9
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tendencia = np.where(identificavel, sxy / sxx, 0.0) * amortecimento
+
+    previsao = np.where(
+        identificavel,
+        y_med + tendencia * (ano_alvo - x_med),
+        y_med * fator ** (ano_alvo - ultimo_ano),
+    )
+    # Extrapolações de séries curtas ficam dentro de uma faixa plausível.
+    previsao = np.clip(previsao, y_med * config.PREVISAO_MIN_RELATIVA, y_med * config.PREVISAO_MAX_RELATIVA)
+
+    tabela = pd.DataFrame({
+        "ORIGEM": s["ORIGEM"].astype(str),
+        "DESTINO": s["DESTINO"].astype(str),
+        "COMPANHIA": s["COMPANHIA"].astype(str),
+        "MES": s["MES"].astype("int8"),
+        "HISTORICO": y_med.round(2).astype("float32"),
+        "PREVISAO": previsao.round(2).astype("float32"),
+    })
+    for col in serie:
+        tabela[col] = tabela[col].astype("category")
+    return tabela.sort_values(serie + ["MES"], ignore_index=True)
+
+
+def anos_treino() -> list[int]:
+    """Últimos anos reais usados no ajuste (2023–2025 com os dados atuais)."""
+    return dados.anos()[-config.ANOS_TREINO_PREVISAO:]
+
+
+def ano_alvo() -> int:
+    """Ano previsto: o seguinte ao último ano com dados."""
+    return dados.anos()[-1] + 1
+
+
+# Incrementar quando ``ajustar`` mudar, para invalidar artefatos antigos.
+VERSAO_MODELO = 1
+
+
+def _parametros() -> dict:
+    return {
+        "versao": VERSAO_MODELO,
+        "anos_treino": anos_treino(),
+        "ano_alvo": ano_alvo(),
+        "fator": config.FATOR_PROJECAO,
+        "amortecimento": config.AMORTECIMENTO_TENDENCIA,
+        "faixa": [config.PREVISAO_MIN_RELATIVA, config.PREVISAO_MAX_RELATIVA],
+    }
+
+
+def _treinar() -> pd.DataFrame:
+    celulas = cubo.filtrar(cubo.obter(), anos=anos_treino())
+    return ajustar(celulas, ano_alvo(), dados.anos()[-1])
+
+
+def _construir() -> tuple[pd.DataFrame, indice.IndiceRotas]:
+    # O ajuste só roda quando não há artefato para estes dados e parâmetros.
+    tabela = artefatos.obter_tabela("previsao", _parametros(), _treinar)
+    return tabela, indice.IndiceRotas(tabela)
+
+
+def _tabela() -> tuple[pd.DataFrame, indice.IndiceRotas]:
+    return dados.derivado("previsoes", _construir)
+
+
+def obter() -> pd.DataFrame:
+    """Tabela de previsões de todas as séries."""
+    return _tabela()[0]
+
+
+def da_rota(origem: str, destino: str, companhia: str = TODAS) -> pd.DataFrame:
+    """Previsões mensais (MES, HISTORICO, PREVISAO) de uma rota."""
+    tabela, idx = _tabela()
+    rota = tabela.iloc[idx.rota(origem, destino)]
+    rota = rota[rota["COMPANHIA"] == companhia]
+    return rota[["MES", "HISTORICO", "PREVISAO"]].reset_index(drop=True)
+
+
+def companhias_da_rota(origem: str, destino: str) -> list[str]:
+    """Companhias com previsão própria para a rota."""
+    tabela, idx = _tabela()
+    rota = tabela.iloc[idx.rota(origem, destino)]
+    return sorted(c for c in rota["COMPANHIA"].unique() if c != TODAS)
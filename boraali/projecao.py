@@ -0,0 +1,90 @@
+"""Anos projetados como visão calculada sobre o cubo.
+
+Um ano projetado (ex.: 2026) é o histórico inteiro com a tarifa reajustada
+por ``FATOR_PROJECAO`` elevado à distância do último ano com dados. Em vez
+de copiar as linhas, a projeção é aplicada às somas já agregadas no momento
+da consulta: escolher 2026 não ocupa memória extra.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from boraali import config, cubo, dados
+
+
+def ultimo_ano() -> int:
+    """Último ano com dados reais."""
+    return dados.anos()[-1]
+
+
+def anos_projetados(horizonte: int = config.HORIZONTE_PROJECAO) -> list[int]:
+    """Anos projetados após o último ano com dados."""
+    ultimo = ultimo_ano()
+    return [ultimo + k for k in range(1, horizonte + 1)]
+
+
+def _escalar(somas: pd.DataFrame, fator: float, fator2: float, repeticoes: float) -> pd.DataFrame:
+    # Tarifa × fator (e soma dos quadrados × fator²); contagens e temperatura
+    # apenas se repetem uma vez por ano projetado.
+    out = somas.copy()
+    out["TARIFA_SOMA"] = out["TARIFA_SOMA"] * fator
+    out["TARIFA_SOMA2"] = out["TARIFA_SOMA2"] * fator2
+    for col in ["N", "TEMP_N", "TEMP_SOMA", "TEMP_SOMA2"]:
+        out[col] = out[col] * repeticoes
+    return out
+
+
+def somar(
+    celulas: pd.DataFrame,
+    por: list[str],
+    anos: list[int],
+    fator: float = config.FATOR_PROJECAO,
+    horizonte: int = config.HORIZONTE_PROJECAO,
+) -> pd.DataFrame:
+    """Somas das medidas por ``por`` sobre anos reais e projetados.
+
+    ``celulas`` deve conter todos os anos reais (sem filtro de ANO): é delas
+    que sai o histórico usado nos anos projetados.
+    """
+    ultimo = ultimo_ano()
+    projetados = [a for a in anos if a in anos_projetados(horizonte)]
+    reais = [a for a in anos if a not in projetados]
+
+    partes = []
+    if reais:
+        partes.append(cubo.somar(celulas[celulas["ANO"].isin(reais)], por))
+
+    if projetados:
+        sem_ano = [c for c in por if c != "ANO"]
+        historico = cubo.somar(celulas, sem_ano)
+        if "ANO" in por:
+            for ano in projetados:
+                k = ano - ultimo
+                partes.append(_escalar(historico, fator ** k, fator ** (2 * k), 1).assign(ANO=ano))
+        else:
+            ks = [ano - ultimo for ano in projetados]
+            partes.append(_escalar(
+                historico,
+                sum(fator ** k for k in ks),
+                sum(fator ** (2 * k) for k in ks),
+                len(ks),
+            ))
+
+    if not partes:
+        return cubo.somar(celulas.iloc[0:0], por)
+    total = pd.concat(partes, ignore_index=True)
+    if len(partes) == 1:
+        return total
+    return cubo.somar(total, por) if por else total[cubo.MEDIDAS].sum().to_frame().T
+
+
+def agregar(
+    celulas: pd.DataFrame,
+    por: list[str],
+    anos: list[int],
+    fator: float = config.FATOR_PROJECAO,
+    horizonte: int = config.HORIZONTE_PROJECAO,
+) -> pd.DataFrame:
+    """Como ``cubo.agregar``, aceitando anos projetados em ``anos``."""
+    somas = somar(celulas, por, anos, fator, horizonte)
+    return cubo.finalizar(somas[somas["N"] > 0])
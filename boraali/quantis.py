@@ -0,0 +1,196 @@
+"""Esboços de quantis das tarifas por rota, companhia, ano e mês.
+
+Cada tarifa cai numa faixa logarítmica (como no DDSketch): a faixa ``i``
+cobre ``(γ^(i-1), γ^i]``, com ``γ = (1 + α) / (1 - α)``, e qualquer quantil
+lido do esboço fica a no máximo ``α`` (erro relativo, ``BORAALI_PRECISAO_QUANTIS``)
+do quantil exato. O esboço de uma célula (ORIGEM, DESTINO, COMPANHIA, ANO,
+MES) é só a contagem de tarifas por faixa; como contagens se somam, esboços
+de anos, meses e companhias diferentes se combinam sem voltar às linhas
+brutas, do mesmo jeito que as medidas do cubo.
+
+Os esboços das passagens são preenchidos na ingestão (``boraali.ingestao``),
+com cada tarifa dos microdados da ANAC contando pelos assentos vendidos, e
+gravados em ``_QUANTIS.parquet`` ao lado do dataset. Sem esse arquivo (só o
+CSV reduzido, que guarda uma tarifa média por companhia e mês), os esboços
+saem das linhas do dataset e descrevem essas médias mensais, não as
+passagens: ``por_passagem()`` diz qual é o caso.
+
+A tabela de esboços é publicada uma vez por conteúdo dos dados em
+``data/modelos`` (``boraali.artefatos``). Ela fica ordenada por rota e
+indexada, então ler p10/mediana/p90 de uma rota custa o número de faixas
+ocupadas por ela, não o número de passagens.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from boraali import artefatos, config, dados, indice
+
+CHAVES = ["ORIGEM", "DESTINO", "COMPANHIA", "ANO", "MES"]
+
+VERSAO_ESBOCO = 2
+
+# Esboços das passagens gravados pela ingestão, no diretório do dataset.
+ARQUIVO = "_QUANTIS.parquet"
+
+
+def _gama(alfa: float = config.PRECISAO_QUANTIS) -> float:
+    return (1 + alfa) / (1 - alfa)
+
+
+def faixa(valores, alfa: float = config.PRECISAO_QUANTIS) -> np.ndarray:
+    """Faixa logarítmica de cada valor (positivo)."""
+    valores = np.asarray(valores, dtype="float64")
+    return np.ceil(np.log(valores) / np.log(_gama(alfa))).astype("int32")
+
+
+def valor_da_faixa(faixas, alfa: float = config.PRECISAO_QUANTIS) -> np.ndarray:
+    """Valor representativo de cada faixa (erro relativo de no máximo ``alfa``)."""
+    gama = _gama(alfa)
+    return 2 * gama ** np.asarray(faixas, dtype="float64") / (gama + 1)
+
+
+# ===========================
+# ESBOÇO
+# ===========================
+@dataclass
+class Esboco:
+    """Contagens por faixa, ordenadas pela faixa."""
+
+    faixas: np.ndarray
+    contagens: np.ndarray
+
+    @classmethod
+    def de_tabela(cls, tabela: pd.DataFrame) -> Esboco:
+        """Soma as contagens das células da tabela de esboços."""
+        somas = tabela.groupby("FAIXA", sort=True)["N"].sum()
+        return cls(somas.index.to_numpy(), somas.to_numpy(dtype="int64"))
+
+    def __add__(self, outro: Esboco) -> Esboco:
+        faixas = np.concatenate([self.faixas, outro.faixas])
+        contagens = np.concatenate([self.contagens, outro.contagens])
+        unicas, posicao = np.unique(faixas, return_inverse=True)
+        return Esboco(unicas, np.bincount(posicao, weights=contagens).astype("int64"))
+
+    @property
+    def total(self) -> int:
+        return int(self.contagens.sum())
+
+    def quantis(self, qs) -> np.ndarray:
+        """Quantis ``qs`` (entre 0 e 1) das tarifas do esboço."""
+        if self.total == 0:
+            return np.full(len(np.atleast_1d(qs)), np.nan)
+        acumulado = np.cumsum(self.contagens)
+        # Posição (0-based) do elemento de ordem q·(n-1), como no DDSketch.
+        posicoes = np.floor(np.atleast_1d(qs) * (self.total - 1))
+        idx = np.searchsorted(acumulado, posicoes, side="right")
+        return valor_da_faixa(self.faixas[idx])
+
+    def quantil(self, q: float) -> float:
+        return float(self.quantis([q])[0])
+
+    def percentil_de(self, valor: float) -> float:
+        """Fração das tarifas do esboço até ``valor`` (0 a 1)."""
+        if self.total == 0:
+            return np.nan
+        if valor <= 0:
+            return 0.0
+        ate = self.contagens[self.faixas <= faixa([valor])[0]].sum()
+        return float(ate / self.total)
+
+
+# ===========================
+# TABELA DE ESBOÇOS
+# ===========================
+def construir(
+    df: pd.DataFrame, peso: str | None = None, alfa: float = config.PRECISAO_QUANTIS
+) -> pd.DataFrame:
+    """Contagem de tarifas por célula e faixa, ordenada por rota.
+
+    Com ``peso`` (ex.: ASSENTOS), cada linha conta por esse número de passagens.
+    """
+    tarifa = df["TARIFA"].to_numpy(dtype="float64")
+    validas = np.isfinite(tarifa) & (tarifa > 0)
+    if peso is None:
+        contagem = np.ones(len(df), dtype="int64")
+    else:
+        contagem = np.rint(df[peso].to_numpy(dtype="float64")).astype("int64")
+        validas &= contagem > 0
+    base = df.loc[validas, CHAVES].assign(FAIXA=faixa(tarifa[validas], alfa), N=contagem[validas])
+    tabela = base.groupby(CHAVES + ["FAIXA"], observed=True, sort=True)["N"].sum()
+    return tabela.astype("int64").reset_index()
+
+
+def _arquivo_ingerido() -> str | None:
+    caminho = os.path.join(dados.DIR_PARQUET, ARQUIVO)
+    return caminho if dados.usa_parquet() and os.path.isfile(caminho) else None
+
+
+def _ler_ingerido(caminho: str) -> pd.DataFrame:
+    tabela = pd.read_parquet(caminho)
+    tabela = tabela.astype({c: "category" for c in ["ORIGEM", "DESTINO", "COMPANHIA"]})
+    return indice.ordenar_por_rota(tabela.sort_values(CHAVES + ["FAIXA"], ignore_index=True))
+
+
+def _parametros() -> dict:
+    return {"versao": VERSAO_ESBOCO, "alfa": config.PRECISAO_QUANTIS}
+
+
+def _construir() -> tuple[pd.DataFrame, indice.IndiceRotas, bool]:
+    ingerido = _arquivo_ingerido()
+    tabela = artefatos.obter_tabela(
+        "quantis",
+        {**_parametros(), "por_passagem": ingerido is not None},
+        lambda: _ler_ingerido(ingerido) if ingerido else construir(dados.carregar_dados()),
+    )
+    return tabela, indice.IndiceRotas(tabela), ingerido is not None
+
+
+def _tabela() -> tuple[pd.DataFrame, indice.IndiceRotas, bool]:
+    return dados.derivado("quantis", _construir)
+
+
+def por_passagem() -> bool:
+    """Indica se os esboços contam passagens (ingestão) ou médias mensais do dataset."""
+    return _tabela()[2]
+
+
+def da_rota(origem: str, destino: str) -> pd.DataFrame:
+    """Células (com faixas e contagens) de uma rota."""
+    tabela, idx, _ = _tabela()
+    return tabela.iloc[idx.rota(origem, destino)]
+
+
+def filtrar(
+    tabela: pd.DataFrame,
+    companhias: list[str] | None = None,
+    anos: list[int] | None = None,
+    meses: list[int] | None = None,
+) -> pd.DataFrame:
+    """Seleciona as células dos filtros informados."""
+    mascara = np.ones(len(tabela), dtype=bool)
+    if companhias is not None:
+        mascara &= tabela["COMPANHIA"].isin(companhias).to_numpy()
+    if anos is not None:
+        mascara &= tabela["ANO"].isin(anos).to_numpy()
+    if meses is not None:
+        mascara &= tabela["MES"].isin(meses).to_numpy()
+    return tabela[mascara]
+
+
+def esboco(tabela: pd.DataFrame) -> Esboco:
+    """Esboço combinado de todas as células da tabela."""
+    return Esboco.de_tabela(tabela)
+
+
+def quantis_por(tabela: pd.DataFrame, por: str, qs: dict[str, float]) -> pd.DataFrame:
+    """Quantis ``qs`` (nome -> q) para cada valor de ``por`` (ex.: MES)."""
+    linhas = []
+    for chave, grupo in tabela.groupby(por, observed=True, sort=True):
+        valores = Esboco.de_tabela(grupo).quantis(list(qs.values()))
+        linhas.append({por: chave, **dict(zip(qs, valores))})
+    return pd.DataFrame(linhas, columns=[por, *qs])
@@ -0,0 +1,58 @@
+"""Camadas pré-calculadas do radar de oportunidades.
+
+Cada camada é o mapa de uma (ORIGEM, MES): tarifa média por destino,
+coordenadas e a categoria Barato/Médio/Caro pelos tercis da própria camada.
+Todas as camadas saem de uma única passada vetorizada sobre o cubo e ficam
+num dicionário; trocar origem ou mês na página é só uma consulta.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from boraali import cubo, dados
+from boraali.constantes import CAPITAIS_COORDS
+
+CATEGORIAS = ["Barato", "Médio", "Caro"]
+
+# Quantis que separam as categorias dentro de cada camada.
+CORTE_BARATO = 0.33
+CORTE_MEDIO = 0.66
+
+COLUNAS = ["DESTINO", "TARIFA_MEDIA", "lat", "lon", "CATEGORIA"]
+
+
+def construir(celulas: pd.DataFrame) -> dict[tuple[str, int], pd.DataFrame]:
+    """Calcula todas as camadas (ORIGEM, MES) de uma vez."""
+    agg = (
+        cubo.agregar(celulas, ["ORIGEM", "MES", "DESTINO"])[["ORIGEM", "MES", "DESTINO", "TARIFA"]]
+        .round(0)
+        .rename(columns={"TARIFA": "TARIFA_MEDIA"})
+    )
+
+    agg["lat"] = agg["DESTINO"].map({c: v["lat"] for c, v in CAPITAIS_COORDS.items()})
+    agg["lon"] = agg["DESTINO"].map({c: v["lon"] for c, v in CAPITAIS_COORDS.items()})
+
+    grupos = agg.groupby(["ORIGEM", "MES"], sort=False)["TARIFA_MEDIA"]
+    corte_barato = grupos.transform("quantile", CORTE_BARATO).to_numpy()
+    corte_medio = grupos.transform("quantile", CORTE_MEDIO).to_numpy()
+    tarifa = agg["TARIFA_MEDIA"].to_numpy()
+    agg["CATEGORIA"] = np.select(
+        [tarifa <= corte_barato, tarifa <= corte_medio],
+        CATEGORIAS[:2],
+        default=CATEGORIAS[2],
+    )
+
+    return {
+        (origem, int(mes)): camada[COLUNAS].reset_index(drop=True)
+        for (origem, mes), camada in agg.groupby(["ORIGEM", "MES"], sort=False)
+    }
+
+
+def _camadas() -> dict[tuple[str, int], pd.DataFrame]:
+    return dados.derivado("radar", lambda: construir(cubo.obter()))
+
+
+def camada(origem: str, mes: int) -> pd.DataFrame:
+    """Camada do mapa para a origem e o mês (vazia se não houver voos)."""
+    return _camadas().get((origem, mes), pd.DataFrame(columns=COLUNAS))
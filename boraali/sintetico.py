@@ -0,0 +1,192 @@
+"""Gerador de datasets sintéticos em escala de produção.
+
+O modelo é aprendido do dataset reduzido, a partir do cubo:
+
+* cada linha sorteia uma célula existente (COMPANHIA, ANO, MES, ORIGEM,
+  DESTINO), com probabilidade proporcional ao número de linhas dela;
+* a tarifa segue uma log-normal centrada na média da célula, com a dispersão
+  (coeficiente de variação) da série rota × companhia × mês entre os anos;
+* a temperatura segue uma normal com a média da célula e o desvio da série
+  rota × mês, e fica ausente onde o original não tem medição.
+
+Séries com uma única observação usam a mediana das dispersões. As médias por
+célula do dataset gerado reproduzem as do original, então as páginas mostram
+o mesmo panorama, só que com o volume de produção.
+
+A geração é em blocos: o pico de memória depende de ``--bloco``, não do
+total de linhas. A saída é um CSV no esquema do reduzido ou um dataset
+Parquet particionado por ANO/MES (o mesmo de ``boraali.armazenamento``).
+
+Uso:
+    python -m boraali.sintetico --linhas 10M --formato parquet --saida /tmp/sintetico
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from boraali import armazenamento, cubo, dados
+
+TAMANHO_BLOCO = 1_000_000
+
+# Faixa aceita para o coeficiente de variação das tarifas sorteadas.
+CV_MIN = 0.02
+CV_MAX = 1.0
+
+_SUFIXOS = {"K": 10**3, "M": 10**6, "G": 10**9}
+
+
+@dataclass
+class Modelo:
+    """Parâmetros por célula aprendidos do dataset reduzido."""
+
+    companhia: pd.Categorical
+    origem: pd.Categorical
+    destino: pd.Categorical
+    ano: np.ndarray
+    mes: np.ndarray
+    peso: np.ndarray
+    log_media: np.ndarray
+    log_dp: np.ndarray
+    temp_media: np.ndarray
+    temp_dp: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ano)
+
+
+def _dispersao(valores: pd.Series, padrao: float) -> np.ndarray:
+    valores = valores.to_numpy(dtype="float64")
+    return np.where(np.isfinite(valores), valores, padrao)
+
+
+def aprender(celulas: pd.DataFrame) -> Modelo:
+    """Estima o modelo a partir das células do cubo."""
+    c = cubo.finalizar(celulas.reset_index(drop=True))
+    tem_temp = celulas["TEMP_N"].to_numpy() > 0
+
+    # Dispersão entre os anos de cada série rota × companhia × mês.
+    serie = ["ORIGEM", "DESTINO", "COMPANHIA", "MES"]
+    tarifas = c.groupby(serie, observed=True)["TARIFA"]
+    cv = tarifas.transform("std") / tarifas.transform("mean")
+    cv_padrao = float(np.nanmedian(cv)) if cv.notna().any() else 0.2
+    cv = np.clip(_dispersao(cv, cv_padrao), CV_MIN, CV_MAX)
+
+    temp_dp = c.groupby(["ORIGEM", "DESTINO", "MES"], observed=True)["TEMP_MEDIA"].transform("std")
+    temp_padrao = float(np.nanmedian(temp_dp)) if temp_dp.notna().any() else 1.0
+    temp_dp = _dispersao(temp_dp, temp_padrao)
+
+    # Log-normal com a mesma média e o mesmo CV da célula.
+    log_dp = np.sqrt(np.log1p(cv ** 2))
+    log_media = np.log(c["TARIFA"].to_numpy()) - log_dp ** 2 / 2
+
+    peso = celulas["N"].to_numpy(dtype="float64")
+    return Modelo(
+        companhia=pd.Categorical(celulas["COMPANHIA"]),
+        origem=pd.Categorical(celulas["ORIGEM"]),
+        destino=pd.Categorical(celulas["DESTINO"]),
+        ano=celulas["ANO"].to_numpy(dtype="int16"),
+        mes=celulas["MES"].to_numpy(dtype="int8"),
+        peso=np.cumsum(peso / peso.sum()),
+        log_media=log_media,
+        log_dp=log_dp,
+        temp_media=np.where(tem_temp, c["TEMP_MEDIA"].to_numpy(), np.nan),
+        temp_dp=temp_dp,
+    )
+
+
+def _texto(categorias: pd.Categorical, idx: np.ndarray) -> pa.DictionaryArray:
+    return pa.DictionaryArray.from_arrays(
+        pa.array(categorias.codes[idx].astype("int32")),
+        pa.array([str(c) for c in categorias.categories]),
+    )
+
+
+def blocos(
+    modelo: Modelo,
+    linhas: int,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+    semente: int = 0,
+) -> Iterator[pa.RecordBatch]:
+    """Gera ``linhas`` linhas sintéticas em lotes Arrow no ``ESQUEMA``."""
+    rng = np.random.default_rng(semente)
+    restantes = linhas
+    while restantes > 0:
+        n = min(tamanho_bloco, restantes)
+        restantes -= n
+        idx = np.searchsorted(modelo.peso, rng.random(n), side="right")
+        idx = np.minimum(idx, len(modelo) - 1)
+
+        tarifa = np.exp(modelo.log_media[idx] + modelo.log_dp[idx] * rng.standard_normal(n))
+        temp = modelo.temp_media[idx] + modelo.temp_dp[idx] * rng.standard_normal(n)
+
+        yield pa.RecordBatch.from_arrays(
+            [
+                _texto(modelo.companhia, idx),
+                pa.array(modelo.ano[idx]),
+                pa.array(modelo.mes[idx]),
+                _texto(modelo.origem, idx),
+                _texto(modelo.destino, idx),
+                pa.array(np.round(tarifa, 2)),
+                pa.array(np.round(temp, 2), from_pandas=True),
+            ],
+            schema=armazenamento.ESQUEMA,
+        )
+
+
+def gravar_csv(lotes: Iterator[pa.RecordBatch], caminho: str) -> None:
+    """Grava os lotes em um CSV com o mesmo cabeçalho do dataset reduzido."""
+    esquema_csv = pa.schema([
+        (c.name, pa.string()) if pa.types.is_dictionary(c.type) else c
+        for c in armazenamento.ESQUEMA
+    ])
+    opcoes = pacsv.WriteOptions(quoting_style="needed")
+    with pacsv.CSVWriter(caminho, esquema_csv, write_options=opcoes) as escritor:
+        for lote in lotes:
+            escritor.write_batch(lote.cast(esquema_csv))
+
+
+def gravar_parquet(lotes: Iterator[pa.RecordBatch], diretorio: str) -> None:
+    """Grava os lotes como dataset Parquet particionado por ANO/MES."""
+    armazenamento.regravar(lotes, diretorio)
+
+
+def linhas_por_extenso(texto: str) -> int:
+    """Converte ``"1M"``, ``"10M"``, ``"250K"`` ou ``"1000"`` em inteiro."""
+    texto = texto.strip().upper().replace("_", "")
+    if texto and texto[-1] in _SUFIXOS:
+        return int(float(texto[:-1]) * _SUFIXOS[texto[-1]])
+    return int(texto)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Gera um dataset sintético a partir do reduzido.")
+    parser.add_argument("--linhas", required=True, type=linhas_por_extenso, help="total de linhas (ex.: 1M, 100M)")
+    parser.add_argument("--formato", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--saida", required=True, help="arquivo CSV ou diretório Parquet")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por lote gerado")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    modelo = aprender(cubo.obter())
+    lotes = blocos(modelo, args.linhas, args.bloco, args.semente)
+    if args.formato == "csv":
+        gravar_csv(lotes, args.saida)
+    else:
+        gravar_parquet(lotes, args.saida)
+    print(
+        f"{args.linhas} linhas sintéticas ({len(modelo)} células de {dados.CAMINHO_CSV}) "
+        f"gravadas em {args.saida} em {time.perf_counter() - inicio:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
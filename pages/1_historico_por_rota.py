@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from boraali import api, dados, figuras, instrumentacao
 
 # === REMOVER MENU NATIVO ===
 st.markdown("""
@@ -15,10 +15,14 @@ st.sidebar.title("✌️ Bora Alí")
 st.sidebar.page_link("app.py", label="🏠 Início")
 st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
 st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
-st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão 2026")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
 st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
 st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
 st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# Medição opcional das etapas (BORAALI_INSTRUMENTACAO=1 ou ?debug=1)
+instrumentacao.iniciar("1_historico_por_rota")
 
 # ===========================
 # CONFIG GERAL
@@ -79,83 +83,39 @@ body { background-color: var(--cinza); }
 st.markdown("<div class='big-title'>📍 Histórico por Rota</div>", unsafe_allow_html=True)
 st.markdown("<div class='subtitle'>Visualize o comportamento da tarifa ao longo dos anos</div>", unsafe_allow_html=True)
 
-# ===========================
-# CARREGAR DATA
-# ===========================
-df = pd.read_csv("data/INMET_ANAC_EXTREMAMENTE_REDUZIDO.csv")
-
-df["ANO"] = df["ANO"].astype(int)
-df["MES"] = df["MES"].astype(int)
-
-# ===========================
-# NOMES DOS MESES
-# ===========================
-meses = {
-    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
-}
-
-df["MES_NOME"] = df["MES"].map(meses)
-
 # ===========================
 # FILTROS DE ROTA
 # ===========================
 col1, col2 = st.columns(2)
 
 with col1:
-    origem = st.selectbox("Selecione a Origem:", ["Selecione"] + sorted(df["ORIGEM"].unique()))
+    origem = st.selectbox("Selecione a Origem:", ["Selecione"] + dados.origens())
 
 with col2:
-    destino = st.selectbox("Selecione o Destino:", ["Selecione"] + sorted(df["DESTINO"].unique()))
+    destino = st.selectbox("Selecione o Destino:", ["Selecione"] + dados.destinos())
+
+instrumentacao.filtros(origem=origem, destino=destino)
 
 # Validação
 if origem == "Selecione" or destino == "Selecione":
     st.info("🛫 Escolha a origem e destino para visualizar os dados.")
     st.stop()
 
-df_filtro = df[(df["ORIGEM"] == origem) & (df["DESTINO"] == destino)]
-
-if df_filtro.empty:
-    st.warning("⚠️ Não há dados para essa rota.")
-    st.stop()
-
-# ===========================
-# AGRUPAR PARA NÃO TER MESES DUPLICADOS
-# ===========================
-df_grouped = (
-    df_filtro.groupby(["ANO", "MES", "MES_NOME"], as_index=False)
-    .agg({"TARIFA": "mean", "TEMP_MEDIA": "mean"})
-)
-
-# ===========================
-# CÁLCULO TEMPERATURA MÉDIA ROTA
-# ===========================
-temp_media = df_grouped["TEMP_MEDIA"].mean()
-
-if temp_media < 20:
-    clima = "❄️ Frio"
-elif temp_media <= 25:
-    clima = "🌤️ Ameno"
-else:
-    clima = "☀️ Quente"
-
 # ===========================
-# CÁLCULO DE TARIFAS
+# HISTÓRICO DA ROTA (MOTOR HEADLESS)
 # ===========================
-media_geral = df_grouped["TARIFA"].mean()
+historico = api.historico_rota(origem, destino)
 
-melhor_mes = (
-    df_grouped.groupby("MES")["TARIFA"]
-    .mean()
-    .idxmin()
-)
+if historico is None:
+    st.warning("⚠️ Não há dados para essa rota.")
+    st.stop()
 
-melhor_valor = (
-    df_grouped.groupby("MES")["TARIFA"]
-    .mean()
-    .min()
-)
+df_grouped = historico.tabela
+temp_media = historico.temp_media
+clima = historico.clima
+media_geral = historico.media_geral
+melhor_mes = historico.melhor_mes
+melhor_valor = historico.melhor_valor
 
 # ===========================
 # CARDS
@@ -174,7 +134,7 @@ with colB:
     st.markdown(f"""
     <div class='card'>
         <b>🔥 Melhor época para viajar:</b><br>
-        <span class='metric-value'>{meses[melhor_mes]} — R$ {melhor_valor:,.2f}</span>
+        <span class='metric-value'>{api.MESES[melhor_mes]} — R$ {melhor_valor:,.2f}</span>
     </div>
     """, unsafe_allow_html=True)
 
@@ -191,21 +151,28 @@ with colC:
 # ===========================
 st.markdown("### 📈 Evolução Mensal da Tarifa (por Ano)")
 
-ordem_meses = list(meses.values())
-
-fig = px.line(
-    df_grouped,
-    x="MES_NOME",
-    y="TARIFA",
-    color="ANO",
-    markers=True,
-    line_shape="spline",
-    category_orders={"MES_NOME": ordem_meses},
-    color_discrete_sequence=["#9B6DFF", "#FF9F68", "#62D99C"]
-)
+ordem_meses = list(api.MESES.values())
 
-fig.update_traces(marker=dict(size=10))
-fig.update_layout(height=440)
+with instrumentacao.etapa("figura"):
+    def montar_linha(df):
+        import plotly.express as px
+
+        fig = px.line(
+            df,
+            x="MES_NOME",
+            y="TARIFA",
+            color="ANO",
+            markers=True,
+            line_shape="spline",
+            category_orders={"MES_NOME": ordem_meses},
+            color_discrete_sequence=["#9B6DFF", "#FF9F68", "#62D99C"]
+        )
+
+        fig.update_traces(marker=dict(size=10))
+        fig.update_layout(height=440)
+        return fig
+
+    fig = figuras.obter("historico_linha", df_grouped, montar_linha, y="TARIFA", por="ANO")
 
 st.plotly_chart(fig, use_container_width=True)
 
@@ -222,19 +189,93 @@ df_ano = (
 
 df_ano["ANO"] = df_ano["ANO"].astype(str)
 
-fig2 = px.bar(
-    df_ano,
-    x="ANO",
-    y="TARIFA",
-    text_auto=".2f",
-    color="ANO",
-    color_discrete_sequence=["#9B6DFF", "#FF9F68", "#62D99C"]
-)
+with instrumentacao.etapa("figura"):
+    def montar_barras(df):
+        import plotly.express as px
+
+        fig2 = px.bar(
+            df,
+            x="ANO",
+            y="TARIFA",
+            text_auto=".2f",
+            color="ANO",
+            color_discrete_sequence=["#9B6DFF", "#FF9F68", "#62D99C"]
+        )
 
-fig2.update_layout(height=400)
+        fig2.update_layout(height=400)
+        return fig2
+
+    fig2 = figuras.obter("historico_media_anual", df_ano, montar_barras)
 
 st.plotly_chart(fig2, use_container_width=True)
 
+# ===========================
+# FAIXA DE PREÇOS (P10 / MEDIANA / P90)
+# ===========================
+distribuicao = api.distribuicao_rota(origem, destino)
+
+if distribuicao is not None:
+    st.markdown("### 📏 Faixa de Preços da Rota")
+
+    observacoes = f"{distribuicao.observacoes:,}".replace(",", ".")
+    if distribuicao.por_passagem:
+        base = "das passagens vendidas"
+        st.caption(f"Distribuição de {observacoes} passagens vendidas (microdados da ANAC, por assento).")
+    else:
+        base = "das tarifas médias mensais"
+        st.caption(
+            f"Distribuição de {observacoes} tarifas médias mensais (uma por companhia e mês), "
+            "não de passagens individuais: o dataset reduzido não traz as tarifas de cada venda."
+        )
+
+    colP10, colMed, colP90 = st.columns(3)
+    for coluna, titulo, valor in [
+        (colP10, f"💚 Abaixo disso, 10% {base}", distribuicao.p10),
+        (colMed, "⚖️ Mediana", distribuicao.mediana),
+        (colP90, f"💸 Acima disso, 10% {base}", distribuicao.p90),
+    ]:
+        with coluna:
+            st.markdown(f"""
+            <div class='card'>
+                <b>{titulo}:</b><br>
+                <span class='metric-value'>R$ {valor:,.2f}</span>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with st.expander("📅 Faixa de preços mês a mês"):
+        tabela_meses = distribuicao.por_mes.set_index("MES_NOME")[["P10", "MEDIANA", "P90"]]
+        st.dataframe(
+            tabela_meses.rename_axis("Mês").rename(columns={"MEDIANA": "Mediana"}).round(2),
+            use_container_width=True
+        )
+
+    # ===========================
+    # ESSE PREÇO É BOM?
+    # ===========================
+    st.markdown("### 💬 Esse preço é bom?")
+
+    colPreco, colMes = st.columns(2)
+    with colPreco:
+        preco = st.number_input("Preço encontrado (R$):", min_value=0.0, value=0.0, step=10.0)
+    with colMes:
+        mes_viagem = st.selectbox(
+            "Mês da viagem:", [None] + list(api.MESES),
+            format_func=lambda m: "Qualquer mês" if m is None else api.MESES[m]
+        )
+
+    if preco > 0:
+        avaliacao = api.avaliar_preco(origem, destino, preco, mes_viagem)
+        if avaliacao is None:
+            st.info("Sem tarifas dessa rota no mês escolhido.")
+        else:
+            st.markdown(f"""
+            <div class='card'>
+                <b>{avaliacao.veredito}</b><br>
+                R$ {preco:,.2f} é maior ou igual a {avaliacao.percentil:.0f}% {base}
+                da rota (mediana: R$ {avaliacao.mediana:,.2f}).
+            </div>
+            """, unsafe_allow_html=True)
+
 # ===========================
 # INSIGHTS
 # ===========================
@@ -249,7 +290,9 @@ if trend.iloc[-1] < trend.iloc[0]:
 else:
     insights += "• A rota está ficando **mais cara** ao longo dos anos.<br>"
 
-insights += f"• O mês historicamente mais vantajoso é <b>{meses[melhor_mes]}</b>.<br>"
+insights += f"• O mês historicamente mais vantajoso é <b>{api.MESES[melhor_mes]}</b>.<br>"
 insights += f"• A temperatura média da rota é <b>{temp_media:.1f}°C</b> → {clima}.<br>"
 
 st.markdown(f"<div class='card'>{insights}</div>", unsafe_allow_html=True)
+
+instrumentacao.finalizar()
@@ -1,8 +1,8 @@
 # pages/2_ranking_por_estacao.py
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import numpy as np
+
+from boraali import api, dados, figuras, instrumentacao
+from boraali.constantes import ESTACOES
 
 # === REMOVER MENU NATIVO ===
 st.markdown("""
@@ -17,10 +17,14 @@ st.sidebar.title("✌️ Bora Alí ")
 st.sidebar.page_link("app.py", label="🏠 Início")
 st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
 st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
-st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão 2026")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
 st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
 st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
 st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# Medição opcional das etapas (BORAALI_INSTRUMENTACAO=1 ou ?debug=1)
+instrumentacao.iniciar("2_ranking_por_estacao")
 
 # ===========================
 # CONFIGURAÇÃO
@@ -57,47 +61,24 @@ st.markdown("<div class='big-title'>🍃 Ranking por Estação</div>", unsafe_al
 st.markdown("<div class='subtitle'>Veja os destinos com melhor custo-benefício na estação selecionada</div>", unsafe_allow_html=True)
 
 
-# ===========================
-# CARREGAR DADOS
-# ===========================
-df = pd.read_csv("data/INMET_ANAC_EXTREMAMENTE_REDUZIDO.csv")
-df["ANO"] = df["ANO"].astype(int)
-df["MES"] = df["MES"].astype(int)
-
-# ===========================
-# ADICIONAR ANO 2026 (+1%)
-# ===========================
-df_2026 = df.copy()
-df_2026["ANO"] = 2026
-df_2026["TARIFA"] = df_2026["TARIFA"] * 1.01   # <<<<< SOMENTE 2026 RECEBE +1%
-df = pd.concat([df, df_2026], ignore_index=True)
-
-# ===========================
-# ESTAÇÕES DO ANO
-# ===========================
-estacoes = {
-    "Verão": [12, 1, 2],
-    "Outono": [3, 4, 5],
-    "Inverno": [6, 7, 8],
-    "Primavera": [9, 10, 11]
-}
-
 # ===========================
 # FILTROS
 # ===========================
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    origem_choices = ["Todas"] + sorted(df["ORIGEM"].unique().tolist())
+    origem_choices = ["Todas"] + dados.origens()
     origem_sel = st.selectbox("Origem (opcional):", origem_choices, index=0)
 
 with col2:
-    estacao_opcoes = ["Selecione a estação"] + list(estacoes.keys())
+    estacao_opcoes = ["Selecione a estação"] + list(ESTACOES)
     estacao_sel = st.selectbox("Estação:", estacao_opcoes)
 
 with col3:
-    anos_disponiveis = sorted(df["ANO"].unique().tolist())
-    anos_sel = st.multiselect("Anos:", anos_disponiveis, default=[2023, 2024, 2025, 2026])
+    anos_disponiveis = api.anos_ranking()
+    anos_sel = st.multiselect("Anos:", anos_disponiveis, default=anos_disponiveis)
+
+instrumentacao.filtros(origem=origem_sel, estacao=estacao_sel, anos=anos_sel)
 
 # Para impedir execução sem escolher estação
 if estacao_sel == "Selecione a estação":
@@ -109,33 +90,21 @@ if len(anos_sel) == 0:
     st.stop()
 
 # ===========================
-# FILTRAR DATAFRAME
+# RANKING DA ESTAÇÃO (MOTOR HEADLESS)
+# Anos projetados (ex.: 2026 = histórico +1%) são calculados sobre as
+# somas agregadas, sem copiar linhas.
 # ===========================
-meses_est = estacoes[estacao_sel]
-
-df_filtered = df[df["MES"].isin(meses_est) & df["ANO"].isin(anos_sel)]
-if origem_sel != "Todas":
-    df_filtered = df_filtered[df_filtered["ORIGEM"] == origem_sel]
+ranking = api.ranking_estacao(
+    estacao_sel, anos_sel, origem=None if origem_sel == "Todas" else origem_sel
+)
 
-if df_filtered.empty:
+if ranking is None:
     st.warning("Nenhum dado disponível para essa combinação.")
     st.stop()
 
-# ===========================
-# AGREGAR POR DESTINO (ARREDONDADO)
-# ===========================
-agg = (
-    df_filtered.groupby("DESTINO", as_index=False)["TARIFA"]
-    .mean()
-    .round(0)
-    .rename(columns={"TARIFA": "TARIFA_MEDIA_ESTACAO"})
-).sort_values("TARIFA_MEDIA_ESTACAO", ascending=True)
-
-# ===========================
-# TOP 5 + TOP 3 EVITAR
-# ===========================
-top5 = agg.head(5)
-evitar3 = agg.tail(3).sort_values("TARIFA_MEDIA_ESTACAO", ascending=False)
+agg = ranking.tabela
+top5 = ranking.top5
+evitar3 = ranking.evitar3
 
 # ===========================
 # CORES
@@ -151,17 +120,24 @@ cores = {
 st.markdown(f"## 📊 Resultados — Estação **{estacao_sel}**")
 st.markdown("### 🟢 Top 5 destinos mais baratos")
 
-fig_top5 = px.bar(
-    top5,
-    x="TARIFA_MEDIA_ESTACAO",
-    y="DESTINO",
-    orientation="h",
-    text="TARIFA_MEDIA_ESTACAO",
-    color_discrete_sequence=[cores["top"]]
-)
+with instrumentacao.etapa("figura"):
+    def montar_top5(df):
+        import plotly.express as px
 
-fig_top5.update_traces(texttemplate="R$ %{x:.0f}", textposition="outside")
-fig_top5.update_layout(height=380, margin=dict(l=120, r=20, t=30, b=30))
+        fig_top5 = px.bar(
+            df,
+            x="TARIFA_MEDIA_ESTACAO",
+            y="DESTINO",
+            orientation="h",
+            text="TARIFA_MEDIA_ESTACAO",
+            color_discrete_sequence=[cores["top"]]
+        )
+
+        fig_top5.update_traces(texttemplate="R$ %{x:.0f}", textposition="outside")
+        fig_top5.update_layout(height=380, margin=dict(l=120, r=20, t=30, b=30))
+        return fig_top5
+
+    fig_top5 = figuras.obter("ranking_top5", top5, montar_top5)
 
 st.plotly_chart(fig_top5, use_container_width=True)
 
@@ -170,17 +146,24 @@ st.plotly_chart(fig_top5, use_container_width=True)
 # ===========================
 st.markdown("### 🔴 3 destinos mais caros (evite)")
 
-fig_evitar = px.bar(
-    evitar3,
-    x="TARIFA_MEDIA_ESTACAO",
-    y="DESTINO",
-    orientation="h",
-    text="TARIFA_MEDIA_ESTACAO",
-    color_discrete_sequence=[cores["bad"]]
-)
+with instrumentacao.etapa("figura"):
+    def montar_evitar(df):
+        import plotly.express as px
 
-fig_evitar.update_traces(texttemplate="R$ %{x:.0f}", textposition="outside")
-fig_evitar.update_layout(height=300, margin=dict(l=120, r=20, t=30, b=30))
+        fig_evitar = px.bar(
+            df,
+            x="TARIFA_MEDIA_ESTACAO",
+            y="DESTINO",
+            orientation="h",
+            text="TARIFA_MEDIA_ESTACAO",
+            color_discrete_sequence=[cores["bad"]]
+        )
+
+        fig_evitar.update_traces(texttemplate="R$ %{x:.0f}", textposition="outside")
+        fig_evitar.update_layout(height=300, margin=dict(l=120, r=20, t=30, b=30))
+        return fig_evitar
+
+    fig_evitar = figuras.obter("ranking_evitar", evitar3, montar_evitar)
 
 st.plotly_chart(fig_evitar, use_container_width=True)
 
@@ -190,8 +173,8 @@ st.plotly_chart(fig_evitar, use_container_width=True)
 st.markdown("### 🧠 Insights rápidos")
 
 melhor = top5.iloc[0]
-mediana = agg["TARIFA_MEDIA_ESTACAO"].median()
-pct_gap = ((mediana - melhor["TARIFA_MEDIA_ESTACAO"]) / mediana) * 100 if mediana != 0 else np.nan
+mediana = ranking.mediana
+pct_gap = ranking.vantagem_pct
 
 st.markdown(f"""
 <div class='card'>
@@ -211,3 +194,5 @@ st.markdown(
     "- Os destinos mais caros devem ser evitados devido à alta demanda sazonal.<br>",
     unsafe_allow_html=True
 )
+
+instrumentacao.finalizar()
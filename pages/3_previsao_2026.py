@@ -1,7 +1,7 @@
 # pages/3_previsao_2026.py
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from boraali import api, dados, figuras, instrumentacao, previsao
 
 # === REMOVER MENU NATIVO ===
 st.markdown("""
@@ -16,17 +16,21 @@ st.sidebar.title("✌️ Bora Alí ")
 st.sidebar.page_link("app.py", label="🏠 Início")
 st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
 st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
-st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão 2026")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
 st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
 st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
 st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# Medição opcional das etapas (BORAALI_INSTRUMENTACAO=1 ou ?debug=1)
+instrumentacao.iniciar("3_previsao_2026")
 
 
 # ===========================
 # CONFIGURAÇÃO
 # ===========================
 st.set_page_config(
-    page_title="Previsão 2026 — Bora Alí",
+    page_title="Previsão de Tarifas — Bora Alí",
     layout="wide"
 )
 
@@ -53,24 +57,15 @@ body { background-color: var(--cinza); }
 # ===========================
 # TÍTULO
 # ===========================
-st.markdown("<div class='big-title'>🔮 Previsão de Tarifas 2026</div>", unsafe_allow_html=True)
-st.markdown("<div class='subtitle'>Previsão baseada na média histórica (2023–2025)</div>", unsafe_allow_html=True)
-
-# ===========================
-# CARREGAR DATA
-# ===========================
-df = pd.read_csv("data/INMET_ANAC_EXTREMAMENTE_REDUZIDO.csv")
-df["ANO"] = df["ANO"].astype(int)
-df["MES"] = df["MES"].astype(int)
+# Ano previsto e anos de ajuste acompanham os dados (hoje 2026 e 2023–2025)
+ano = previsao.ano_alvo()
+anos_treino = previsao.anos_treino()
 
-# ===========================
-# NOMES DOS MESES
-# ===========================
-meses = {
-    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
-}
+st.markdown(f"<div class='big-title'>🔮 Previsão de Tarifas {ano}</div>", unsafe_allow_html=True)
+st.markdown(
+    f"<div class='subtitle'>Modelo sazonal com tendência, ajustado sobre {anos_treino[0]}–{anos_treino[-1]}</div>",
+    unsafe_allow_html=True,
+)
 
 # ===========================
 # FILTROS DE ROTA
@@ -78,53 +73,49 @@ meses = {
 col1, col2 = st.columns(2)
 
 with col1:
-    origens = sorted(df["ORIGEM"].unique())
+    origens = dados.origens()
     origem = st.selectbox("Origem:", ["Selecione a origem"] + origens)
 
 with col2:
-    destinos = sorted(df["DESTINO"].unique())
+    destinos = dados.destinos()
     destino = st.selectbox("Destino:", ["Selecione o destino"] + destinos)
 
 # bloquear execução até selecionar tudo
 if origem == "Selecione a origem" or destino == "Selecione o destino":
-    st.warning("Por favor, selecione a origem e o destino para gerar a previsão de 2026.")
+    st.warning(f"Por favor, selecione a origem e o destino para gerar a previsão de {ano}.")
     st.stop()
 
-df_filtro = df[(df["ORIGEM"] == origem) & (df["DESTINO"] == destino) & (df["ANO"].isin([2023, 2024, 2025]))]
+companhia = st.selectbox(
+    "Companhia (opcional):",
+    ["Todas"] + previsao.companhias_da_rota(origem, destino),
+)
 
-if df_filtro.empty:
-    st.warning("⚠️ Não há dados suficientes dessa rota para gerar previsão.")
-    st.stop()
+instrumentacao.filtros(origem=origem, destino=destino, companhia=companhia)
 
 # ===========================
-# AGRUPAR DADOS POR MÊS (MÉDIA 2023–2025)
+# PREVISÃO DO PRÓXIMO ANO (PRÉ-CALCULADA EM LOTE PARA TODAS AS ROTAS)
 # ===========================
-df_grouped = (
-    df_filtro.groupby("MES")["TARIFA"]
-    .mean()
-    .reset_index()
-)
+resultado = api.previsao_rota(origem, destino, None if companhia == "Todas" else companhia)
 
-df_grouped["MES_NOME"] = df_grouped["MES"].map(meses)
+if resultado is None:
+    st.warning("⚠️ Não há dados suficientes dessa rota para gerar previsão.")
+    st.stop()
 
-# ===========================
-# PREVISÃO: ADICIONAR +1% PARA 2026
-# ===========================
-df_grouped["PREVISAO_2026"] = (df_grouped["TARIFA"] * 1.01).round(2)
+df_grouped = resultado.tabela
+coluna = resultado.coluna
 
 # ===========================
-# MELHOR MÊS DE 2026
+# MELHOR MÊS DO ANO PREVISTO
 # ===========================
-melhor_mes = df_grouped.loc[df_grouped["PREVISAO_2026"].idxmin()]
-melhor_mes_nome = melhor_mes["MES_NOME"]
-melhor_valor = melhor_mes["PREVISAO_2026"]
+melhor_mes_nome = resultado.melhor["MES_NOME"]
+melhor_valor = resultado.melhor[coluna]
 
 # ===========================
 # CARD
 # ===========================
 st.markdown(f"""
 <div class='card'>
-    <b>🌟 Melhor mês para viajar em 2026:</b><br>
+    <b>🌟 Melhor mês para viajar em {ano}:</b><br>
     <span class='metric-value'>{melhor_mes_nome}</span><br>
     Tarifa estimada: <b>R$ {melhor_valor:.2f}</b>
 </div>
@@ -133,35 +124,42 @@ st.markdown(f"""
 # ===========================
 # GRÁFICO
 # ===========================
-st.markdown("### 📈 Previsão Mensal da Tarifa — 2026")
+st.markdown(f"### 📈 Previsão Mensal da Tarifa — {ano}")
 
-fig = px.line(
-    df_grouped,
-    x="MES_NOME",
-    y="PREVISAO_2026",
-    markers=True,
-    line_shape="spline",
-    color_discrete_sequence=["#9B6DFF"]
-)
+with instrumentacao.etapa("figura"):
+    def montar(df):
+        import plotly.express as px
 
-fig.update_layout(
-    height=450,
-    xaxis_title="Mês",
-    yaxis_title="Tarifa Prevista (R$)",
-    plot_bgcolor="#F5F4FA",
-    paper_bgcolor="#F5F4FA"
-)
+        fig = px.line(
+            df,
+            x="MES_NOME",
+            y=coluna,
+            markers=True,
+            line_shape="spline",
+            color_discrete_sequence=["#9B6DFF"]
+        )
+
+        fig.update_layout(
+            height=450,
+            xaxis_title="Mês",
+            yaxis_title="Tarifa Prevista (R$)",
+            plot_bgcolor="#F5F4FA",
+            paper_bgcolor="#F5F4FA"
+        )
+        return fig
+
+    fig = figuras.obter("previsao_linha", df_grouped, montar, y=coluna)
 
 st.plotly_chart(fig, use_container_width=True)
 
 # ===========================
 # TABELA
 # ===========================
-st.markdown("### 📋 Tabela Completa da Previsão 2026")
+st.markdown(f"### 📋 Tabela Completa da Previsão {ano}")
 
-df_exibir = df_grouped[["MES_NOME", "PREVISAO_2026"]].rename(columns={
+df_exibir = df_grouped[["MES_NOME", coluna]].rename(columns={
     "MES_NOME": "Mês",
-    "PREVISAO_2026": "Tarifa Prevista (R$)"
+    coluna: "Tarifa Prevista (R$)"
 })
 
 st.dataframe(df_exibir.style.format({"Tarifa Prevista (R$)": "R$ {:.2f}".format}), height=350)
@@ -173,16 +171,18 @@ st.markdown("### 🧠 Insights Automáticos")
 
 insights = ""
 
-if df_grouped["PREVISAO_2026"].iloc[-1] < df_grouped["PREVISAO_2026"].iloc[0]:
+if resultado.queda:
     insights += "• A previsão sugere tendência de **queda** ao longo do ano.<br>"
 else:
     insights += "• A previsão sugere tendência de **alta** ao longo do ano.<br>"
 
-pior_mes = df_grouped.loc[df_grouped["PREVISAO_2026"].idxmax()]
+pior_mes = resultado.pior
 insights += f"• Melhor mês: <b>{melhor_mes_nome}</b> — R$ {melhor_valor:.2f}.<br>"
-insights += f"• Mês mais caro previsto: <b>{pior_mes['MES_NOME']}</b> — R$ {pior_mes['PREVISAO_2026']:.2f}.<br>"
+insights += f"• Mês mais caro previsto: <b>{pior_mes['MES_NOME']}</b> — R$ {pior_mes[coluna]:.2f}.<br>"
 
-variacao = ((pior_mes["PREVISAO_2026"] - melhor_valor) / melhor_valor) * 100
+variacao = resultado.variacao_pct
 insights += f"• Diferença entre melhor e pior mês: <b>{variacao:.1f}%</b>."
 
 st.markdown(f"<div class='card'>{insights}</div>", unsafe_allow_html=True)
+
+instrumentacao.finalizar()
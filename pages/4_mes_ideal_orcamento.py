@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import numpy as np
+
+from boraali import api, dados, figuras, instrumentacao
 
 # === REMOVER MENU NATIVO ===
 st.markdown("""
@@ -16,10 +15,14 @@ st.sidebar.title("✌️ Bora Alí")
 st.sidebar.page_link("app.py", label="🏠 Início")
 st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
 st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
-st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão 2026")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
 st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
 st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
 st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# Medição opcional das etapas (BORAALI_INSTRUMENTACAO=1 ou ?debug=1)
+instrumentacao.iniciar("4_mes_ideal_orcamento")
 
 
 # ===========================
@@ -56,18 +59,7 @@ body { background-color: var(--cinza); }
 st.markdown("<div class='big-title'>💸 Melhor Mês Pelo Seu Orçamento</div>", unsafe_allow_html=True)
 st.markdown("<div class='subtitle'>Veja todos os meses que cabem no seu bolso — e o melhor entre eles</div>", unsafe_allow_html=True)
 
-# ===========================
-# CARREGAR DATA
-# ===========================
-df = pd.read_csv("data/INMET_ANAC_EXTREMAMENTE_REDUZIDO.csv")
-df["ANO"] = df["ANO"].astype(int)
-df["MES"] = df["MES"].astype(int)
-
-meses_nome = {
-    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
-}
+TODOS_DESTINOS = "Todos os destinos"
 
 # ===========================
 # FILTROS — NOVA ORDEM (Orçamento → Origem → Destino)
@@ -78,10 +70,12 @@ with col1:
     orcamento = st.number_input("Seu orçamento máximo (R$):", min_value=100.0, step=50.0)
 
 with col2:
-    origem = st.selectbox("Selecione a Origem:", ["Selecione"] + sorted(df["ORIGEM"].unique()))
+    origem = st.selectbox("Selecione a Origem:", ["Selecione"] + dados.origens())
 
 with col3:
-    destino = st.selectbox("Selecione o Destino:", ["Selecione"] + sorted(df["DESTINO"].unique()))
+    destino = st.selectbox("Selecione o Destino:", ["Selecione", TODOS_DESTINOS] + dados.destinos())
+
+instrumentacao.filtros(orcamento=orcamento, origem=origem, destino=destino)
 
 # Validação
 if origem == "Selecione" or destino == "Selecione":
@@ -89,45 +83,99 @@ if origem == "Selecione" or destino == "Selecione":
     st.stop()
 
 # ===========================
-# FILTRAR ROTA (2023–2025)
+# BUSCA EM TODOS OS DESTINOS DA ORIGEM
 # ===========================
-df_filtro = df[
-    (df["ORIGEM"] == origem) &
-    (df["DESTINO"] == destino) &
-    (df["ANO"].isin([2023, 2024, 2025]))
-]
-
-if df_filtro.empty:
-    st.warning("⚠️ Não há dados suficientes dessa rota para calcular.")
+if destino == TODOS_DESTINOS:
+    # Busca binária no índice de orçamento: já vem ordenado pela tarifa.
+    busca = api.orcamento_origem(origem, orcamento)
+
+    if busca.opcoes.empty:
+        if busca.mais_barato is None:
+            st.warning("⚠️ Não há dados suficientes dessa origem para calcular.")
+            st.stop()
+        opcao = busca.mais_barato
+        st.markdown(
+            "<div class='card'><span class='metric-value'>⚠️ Nenhum destino cabe no orçamento.<br>"
+            f"👉 A opção mais barata é <b>{opcao['DESTINO']}</b> em <b>{opcao['MES_NOME']}</b> — "
+            f"R$ {opcao['TARIFA']:.2f}</span></div>",
+            unsafe_allow_html=True,
+        )
+        st.stop()
+
+    df_opcoes = busca.opcoes
+    melhor = busca.mais_barato
+
+    colA, colB = st.columns(2)
+    with colA:
+        st.markdown(
+            f"<div class='card'><span class='metric-value'>🌟 Melhor opção: <b>{melhor['DESTINO']}</b> em "
+            f"<b>{melhor['MES_NOME']}</b> — R$ {melhor['TARIFA']:.2f}</span></div>",
+            unsafe_allow_html=True,
+        )
+    with colB:
+        st.markdown(f"""
+        <div class='card'>
+            <b>🗺️ Opções dentro do orçamento:</b><br>
+            <span class='metric-value'>{len(df_opcoes)} combinações — {df_opcoes['DESTINO'].nunique()} destinos</span>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("### 📉 Mês mais barato de cada destino que cabe no orçamento")
+    df_melhor_destino = busca.melhor_por_destino
+
+    with instrumentacao.etapa("figura"):
+        def montar_destinos(df):
+            import plotly.express as px
+
+            fig = px.bar(
+                df,
+                x="DESTINO",
+                y="TARIFA",
+                color="TARIFA",
+                color_continuous_scale=["#62D99C", "#FF9F68"],
+                hover_data=["MES_NOME"],
+                text="MES_NOME"
+            )
+            fig.update_traces(textposition="outside")
+            fig.update_layout(
+                height=420,
+                xaxis_title="Destino",
+                yaxis_title="Tarifa Média (R$)",
+                coloraxis_showscale=False
+            )
+            return fig
+
+        fig = figuras.obter("orcamento_destinos", df_melhor_destino, montar_destinos)
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### 🗓️ Todas as opções (da mais barata para a mais cara)")
+    st.dataframe(
+        df_opcoes[["DESTINO", "MES_NOME", "TARIFA", "TEMP_MEDIA"]].round(2).rename(columns={
+            "DESTINO": "Destino",
+            "MES_NOME": "Mês",
+            "TARIFA": "Tarifa Média (R$)",
+            "TEMP_MEDIA": "Temperatura (°C)",
+        }),
+        hide_index=True,
+        use_container_width=True,
+    )
+    instrumentacao.finalizar()
     st.stop()
 
 # ===========================
-# TEMPERATURA MÉDIA DA ROTA
+# MESES DA ROTA QUE CABEM NO ORÇAMENTO (MOTOR HEADLESS)
 # ===========================
-temp_media = df_filtro["TEMP_MEDIA"].mean()
-
-if temp_media < 20:
-    clima = "❄️ Frio"
-elif temp_media <= 25:
-    clima = "🌤️ Ameno"
-else:
-    clima = "☀️ Quente"
+resultado = api.orcamento_rota(origem, destino, orcamento)
 
-# ===========================
-# CÁLCULO DA MÉDIA HISTÓRICA POR MÊS
-# ===========================
-df_mes = (
-    df_filtro.groupby("MES")["TARIFA"]
-    .mean()
-    .round(2)
-    .reset_index()
-)
-df_mes["MES_NOME"] = df_mes["MES"].map(meses_nome)
+if resultado is None:
+    st.warning("⚠️ Não há dados suficientes dessa rota para calcular.")
+    st.stop()
 
-# ===========================
-# MESES QUE CABEM NO ORÇAMENTO
-# ===========================
-df_baratos = df_mes[df_mes["TARIFA"] <= orcamento].sort_values("TARIFA")
+temp_media = resultado.temp_media
+clima = resultado.clima
+df_mes = resultado.meses
+df_baratos = resultado.baratos
 
 if not df_baratos.empty:
     melhor = df_baratos.iloc[0]
@@ -142,7 +190,7 @@ if not df_baratos.empty:
     )
 
 else:
-    mais_proximo = df_mes.iloc[(df_mes["TARIFA"] - orcamento).abs().argmin()]
+    mais_proximo = resultado.mais_proximo
 
     msg_melhor = (
         "⚠️ Nenhum mês cabe no orçamento.<br>"
@@ -176,24 +224,31 @@ st.markdown(f"<div class='card'>{lista_meses}</div>", unsafe_allow_html=True)
 # ===========================
 # GRÁFICO
 # ===========================
-st.markdown("### 📈 Histórico de Tarifas Mensais (Média 2023–2025)")
-
-fig = px.bar(
-    df_mes.sort_values("MES"),
-    x="MES_NOME",
-    y="TARIFA",
-    color="TARIFA",
-    color_continuous_scale=["#62D99C", "#FF9F68"],
-    text="TARIFA"
-)
-
-fig.update_traces(texttemplate="R$ %{y:.2f}", textposition="outside")
-fig.update_layout(
-    height=420,
-    xaxis_title="Mês",
-    yaxis_title="Tarifa Média (R$)",
-    coloraxis_showscale=False
-)
+st.markdown(f"### 📈 Histórico de Tarifas Mensais (Média {min(api.ANOS_ORCAMENTO)}–{max(api.ANOS_ORCAMENTO)})")
+
+with instrumentacao.etapa("figura"):
+    def montar_meses(df):
+        import plotly.express as px
+
+        fig = px.bar(
+            df,
+            x="MES_NOME",
+            y="TARIFA",
+            color="TARIFA",
+            color_continuous_scale=["#62D99C", "#FF9F68"],
+            text="TARIFA"
+        )
+
+        fig.update_traces(texttemplate="R$ %{y:.2f}", textposition="outside")
+        fig.update_layout(
+            height=420,
+            xaxis_title="Mês",
+            yaxis_title="Tarifa Média (R$)",
+            coloraxis_showscale=False
+        )
+        return fig
+
+    fig = figuras.obter("orcamento_meses", df_mes.sort_values("MES"), montar_meses)
 
 st.plotly_chart(fig, use_container_width=True)
 
@@ -202,8 +257,8 @@ st.plotly_chart(fig, use_container_width=True)
 # ===========================
 st.markdown("### 🧠 Insights")
 
-mais_caro = df_mes.loc[df_mes["TARIFA"].idxmax()]
-mais_barato = df_mes.loc[df_mes["TARIFA"].idxmin()]
+mais_caro = resultado.mais_caro
+mais_barato = resultado.mais_barato
 
 insights = f"""
 <div class='card'>
@@ -215,3 +270,5 @@ insights = f"""
 """
 
 st.markdown(insights, unsafe_allow_html=True)
+
+instrumentacao.finalizar()
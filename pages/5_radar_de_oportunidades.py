@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import streamlit as st
+
+from boraali import api, dados, figuras, instrumentacao
 
 # === REMOVER MENU NATIVO ===
 st.markdown("""
@@ -16,10 +15,14 @@ st.sidebar.title("✌️ Bora Alí")
 st.sidebar.page_link("app.py", label="🏠 Início")
 st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
 st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
-st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão 2026")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
 st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
 st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
 st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# Medição opcional das etapas (BORAALI_INSTRUMENTACAO=1 ou ?debug=1)
+instrumentacao.iniciar("5_radar_de_oportunidades")
 
 # ==============================================
 # CONFIG
@@ -53,63 +56,13 @@ body { background-color: var(--cinza); }
 st.markdown("<div class='big-title'>🗺️ Radar de Oportunidades</div>", unsafe_allow_html=True)
 st.markdown("<div class='subtitle'>Encontre os destinos mais vantajosos para viajar a partir da sua origem</div>", unsafe_allow_html=True)
 
-# ==============================================
-# CARREGAR DATA
-# ==============================================
-df = pd.read_csv("data/INMET_ANAC_EXTREMAMENTE_REDUZIDO.csv")
-df["ANO"] = df["ANO"].astype(int)
-df["MES"] = df["MES"].astype(int)
-
-# ==============================================
-# MÊS POR EXTENSO
-# ==============================================
-MESES = {
-    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
-}
-MESES_INV = {v: k for k, v in MESES.items()}
-
-# ==============================================
-# COORDENADAS DAS CAPITAIS DO BRASIL
-# ==============================================
-CAPITAIS_COORDS = {
-    "Rio Branco": {"lat": -9.97499, "lon": -67.8243},
-    "Maceió": {"lat": -9.66599, "lon": -35.7350},
-    "Macapá": {"lat": 0.03493, "lon": -51.0694},
-    "Manaus": {"lat": -3.11866, "lon": -60.0212},
-    "Salvador": {"lat": -12.9718, "lon": -38.5011},
-    "Fortaleza": {"lat": -3.71722, "lon": -38.5434},
-    "Brasília": {"lat": -15.7797, "lon": -47.9297},
-    "Vitória": {"lat": -20.3155, "lon": -40.3128},
-    "Goiânia": {"lat": -16.6864, "lon": -49.2643},
-    "São Luís": {"lat": -2.53911, "lon": -44.2829},
-    "Cuiabá": {"lat": -15.6010, "lon": -56.0974},
-    "Campo Grande": {"lat": -20.4697, "lon": -54.6201},
-    "Belo Horizonte": {"lat": -19.8157, "lon": -43.9542},
-    "Belém": {"lat": -1.45502, "lon": -48.5024},
-    "João Pessoa": {"lat": -7.11509, "lon": -34.8641},
-    "Curitiba": {"lat": -25.4284, "lon": -49.2733},
-    "Recife": {"lat": -8.04666, "lon": -34.8771},
-    "Teresina": {"lat": -5.08921, "lon": -42.8016},
-    "Rio de Janeiro": {"lat": -22.9068, "lon": -43.1729},
-    "Natal": {"lat": -5.79448, "lon": -35.2110},
-    "Porto Alegre": {"lat": -30.0277, "lon": -51.2287},
-    "Porto Velho": {"lat": -8.76077, "lon": -63.8999},
-    "Boa Vista": {"lat": 2.82384, "lon": -60.6753},
-    "Florianópolis": {"lat": -27.5945, "lon": -48.5477},
-    "São Paulo": {"lat": -23.5505, "lon": -46.6333},
-    "Aracaju": {"lat": -10.9472, "lon": -37.0731},
-    "Palmas": {"lat": -10.1675, "lon": -48.3277}
-}
-
 # ==============================================
 # FILTROS
 # ==============================================
 col1, col2 = st.columns(2)
 
 with col1:
-    origens = sorted(df["ORIGEM"].unique())
+    origens = dados.origens()
     origem = st.selectbox("Origem:", ["Selecione a origem"] + origens)
 
     if origem == "Selecione a origem":
@@ -117,39 +70,21 @@ with col1:
         st.stop()
 
 with col2:
-    mes_nome = st.selectbox("Mês:", list(MESES.values()))
-    mes = MESES_INV[mes_nome]
+    mes = st.selectbox("Mês:", list(api.MESES), format_func=api.MESES.get)
 
-df_filtro = df[(df["ORIGEM"] == origem) & (df["MES"] == mes)]
+instrumentacao.filtros(origem=origem, mes=mes)
 
 # ==============================================
-# AGRUPAMENTO POR DESTINO
+# CAMADA PRÉ-CALCULADA (ORIGEM × MÊS)
 # ==============================================
-agg = (
-    df_filtro.groupby("DESTINO", as_index=False)["TARIFA"]
-    .mean()
-    .round(0)
-    .rename(columns={"TARIFA": "TARIFA_MEDIA"})
-)
+# Tarifa por destino, coordenadas e categoria Barato/Médio/Caro (tercis)
+resultado = api.radar_oportunidades(origem, mes)
 
-# adicionar coordenadas
-agg["lat"] = agg["DESTINO"].apply(lambda x: CAPITAIS_COORDS[x]["lat"])
-agg["lon"] = agg["DESTINO"].apply(lambda x: CAPITAIS_COORDS[x]["lon"])
-
-# ==============================================
-# CLASSIFICAÇÃO: BARATO / MÉDIO / CARO
-# ==============================================
-p20 = agg["TARIFA_MEDIA"].quantile(0.33)
-p80 = agg["TARIFA_MEDIA"].quantile(0.66)
+if resultado is None:
+    st.warning("⚠️ Não há voos dessa origem no mês escolhido.")
+    st.stop()
 
-def categoria(v):
-    if v <= p20:
-        return "Barato"
-    elif v <= p80:
-        return "Médio"
-    return "Caro"
-
-agg["CATEGORIA"] = agg["TARIFA_MEDIA"].apply(categoria)
+agg = resultado.camada
 
 cores = {
     "Barato": "#62D99C",
@@ -162,28 +97,35 @@ cores = {
 # ==============================================
 st.markdown("### 🗺️ Mapa de Oportunidades")
 
-fig = px.scatter_mapbox(
-    agg,
-    lat="lat",
-    lon="lon",
-    size="TARIFA_MEDIA",
-    color="CATEGORIA",
-    hover_name="DESTINO",
-    hover_data={"TARIFA_MEDIA": True},
-    color_discrete_map=cores,
-    zoom=3.4,
-    height=650
-)
+with instrumentacao.etapa("figura"):
+    def montar(df):
+        import plotly.express as px
+
+        fig = px.scatter_mapbox(
+            df,
+            lat="lat",
+            lon="lon",
+            size="TARIFA_MEDIA",
+            color="CATEGORIA",
+            hover_name="DESTINO",
+            hover_data={"TARIFA_MEDIA": True},
+            color_discrete_map=cores,
+            zoom=3.4,
+            height=650
+        )
 
-fig.update_layout(mapbox_style="open-street-map")
+        fig.update_layout(mapbox_style="open-street-map")
+        return fig
+
+    fig = figuras.obter("radar_mapa", agg, montar)
 
 st.plotly_chart(fig, use_container_width=True)
 
 # ==============================================
 # INSIGHTS AUTOMÁTICOS
 # ==============================================
-melhor = agg.loc[agg["TARIFA_MEDIA"].idxmin()]
-pior = agg.loc[agg["TARIFA_MEDIA"].idxmax()]
+melhor = resultado.melhor
+pior = resultado.pior
 
 st.markdown("### 🧠 Insights")
 st.markdown(f"""
@@ -193,3 +135,5 @@ st.markdown(f"""
 <b>• Diferença entre eles:</b> R$ {pior['TARIFA_MEDIA'] - melhor['TARIFA_MEDIA']:.0f}<br>
 </div>
 """, unsafe_allow_html=True)
+
+instrumentacao.finalizar()
@@ -1,8 +1,8 @@
 # pages/6_analise_companhias.py
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
+
+from boraali import api, figuras, instrumentacao
+from boraali.constantes import ESTACOES
 
 # === REMOVER MENU NATIVO ===
 st.markdown("""
@@ -17,10 +17,14 @@ st.sidebar.title("✌️ Bora Alí ")
 st.sidebar.page_link("app.py", label="🏠 Início")
 st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
 st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
-st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão 2026")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
 st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
 st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
 st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# Medição opcional das etapas (BORAALI_INSTRUMENTACAO=1 ou ?debug=1)
+instrumentacao.iniciar("6_analise_companhias")
 
 # ==========================================
 # CONFIGURAÇÃO DE TELA
@@ -55,65 +59,79 @@ st.markdown("""
 st.markdown("<div class='big-title'>✈️ Análise das Companhias Aéreas</div>", unsafe_allow_html=True)
 st.markdown("<div class='subtitle'>Comparação entre LATAM, GOL e AZUL por estação do ano</div>", unsafe_allow_html=True)
 
-# ==========================================
-# CARREGAR DATA
-# ==========================================
-df = pd.read_csv("data/INMET_ANAC_EXTREMAMENTE_REDUZIDO.csv")
-df["ANO"] = df["ANO"].astype(int)
-df["MES"] = df["MES"].astype(int)
-
-# Apenas as três principais
-df = df[df["COMPANHIA"].isin(["LATAM", "GOL", "AZUL"])]
-
-# Nome dos meses
-meses_nome = {
-    1:'Janeiro',2:'Fevereiro',3:'Março',4:'Abril',5:'Maio',6:'Junho',
-    7:'Julho',8:'Agosto',9:'Setembro',10:'Outubro',11:'Novembro',12:'Dezembro'
-}
-
-# Estações
-estacoes = {
-    "Verão": [12, 1, 2],
-    "Outono": [3, 4, 5],
-    "Inverno": [6, 7, 8],
-    "Primavera": [9, 10, 11]
-}
-
 # ==========================================
 # FILTRO — ESTAÇÃO DO ANO
 # ==========================================
 st.markdown("### ❄️ Escolha a estação do ano para comparar as companhias:")
-estacao = st.selectbox("Estação:", ["Selecione", "Verão", "Outono", "Inverno", "Primavera"])
+TODAS_ESTACOES = "Todas (lado a lado)"
+estacao = st.selectbox("Estação:", ["Selecione"] + list(ESTACOES) + [TODAS_ESTACOES])
+instrumentacao.filtros(estacao=estacao)
 
 if estacao == "Selecione":
     st.info("👈 Selecione uma estação para visualizar os dados.")
     st.stop()
 
-meses_filtrados = estacoes[estacao]
-
-df = df[df["MES"].isin(meses_filtrados)]
+cores_companhias = {
+    "LATAM": "#9B6DFF",
+    "GOL": "#FF9F68",
+    "AZUL": "#62D99C"
+}
 
-if df.empty:
-    st.warning("⚠️ Não há dados suficientes para esta estação.")
+# ==========================================
+# TODAS AS ESTAÇÕES LADO A LADO
+# ==========================================
+if estacao == TODAS_ESTACOES:
+    # Mesma tabela pré-calculada, já com as quatro estações
+    todas = api.companhias_todas_estacoes()
+    df_todas = todas.mensal
+
+    st.markdown("### 💰 Tarifa média por estação")
+    st.dataframe(todas.media.round(2), use_container_width=True)
+
+    st.markdown("### 📉 Estabilidade por estação (0–100)")
+    st.dataframe(todas.estabilidade.round(1), use_container_width=True)
+
+    st.markdown("### 📈 Evolução das Tarifas — Todas as Estações")
+    with instrumentacao.etapa("figura"):
+        def montar_todas(df):
+            import plotly.express as px
+
+            fig = px.line(
+                df,
+                x="MES_NOME",
+                y="TARIFA",
+                color="COMPANHIA",
+                facet_col="ESTACAO",
+                category_orders={"ESTACAO": list(ESTACOES)},
+                markers=True,
+                line_shape="spline",
+                color_discrete_map=cores_companhias
+            )
+            fig.update_xaxes(matches=None, title_text="")
+            fig.update_layout(
+                height=460,
+                yaxis_title="Tarifa Média (R$)",
+                plot_bgcolor="#F5F4FA",
+            )
+            return fig
+
+        fig = figuras.obter("companhias_todas", df_todas, montar_todas)
+
+    st.plotly_chart(fig, use_container_width=True)
+    instrumentacao.finalizar()
     st.stop()
 
 # ==========================================
-# AGRUPAMENTO POR COMPANHIA
+# MÉTRICAS PRÉ-CALCULADAS DA ESTAÇÃO
 # ==========================================
-df_group = (
-    df.groupby(["COMPANHIA", "MES"])["TARIFA"]
-      .mean()
-      .reset_index()
-)
-df_group["MES_NOME"] = df_group["MES"].map(meses_nome)
+resultado = api.companhias_estacao(estacao)
 
-# ==========================================
-# MÉTRICAS
-# ==========================================
-metrics = df_group.groupby("COMPANHIA")["TARIFA"].agg(["mean", "std", "min", "max"])
-metrics["volatilidade_%"] = (metrics["max"] - metrics["min"]) / metrics["mean"] * 100
-metrics["estabilidade"] = 100 - (metrics["std"] / metrics["mean"] * 100)
-m = metrics.round(2)
+if resultado is None:
+    st.warning("⚠️ Não há dados suficientes para esta estação.")
+    st.stop()
+
+df_group = resultado.mensal
+m = resultado.metricas
 
 # ==========================================
 # CARDS
@@ -121,7 +139,7 @@ m = metrics.round(2)
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    c = m["mean"].idxmin()
+    c = resultado.mais_barata
     st.markdown(f"""
     <div class='card'>
         <b>💰 Companhia Mais Barata</b><br>
@@ -130,7 +148,7 @@ with col1:
     </div>""", unsafe_allow_html=True)
 
 with col2:
-    c = m["estabilidade"].idxmax()
+    c = resultado.mais_estavel
     st.markdown(f"""
     <div class='card'>
         <b>📉 Mais Estável</b><br>
@@ -139,7 +157,7 @@ with col2:
     </div>""", unsafe_allow_html=True)
 
 with col3:
-    c = m["volatilidade_%"].idxmax()
+    c = resultado.maior_oscilacao
     st.markdown(f"""
     <div class='card'>
         <b>⚠️ Maior Oscilação</b><br>
@@ -152,26 +170,29 @@ with col3:
 # ==========================================
 st.markdown(f"### 📈 Evolução das Tarifas — {estacao}")
 
-fig = px.line(
-    df_group,
-    x="MES_NOME",
-    y="TARIFA",
-    color="COMPANHIA",
-    markers=True,
-    line_shape="spline",
-    color_discrete_map={
-        "LATAM": "#9B6DFF",
-        "GOL": "#FF9F68",
-        "AZUL": "#62D99C"
-    }
-)
-
-fig.update_layout(
-    height=460,
-    xaxis_title="Mês",
-    yaxis_title="Tarifa Média (R$)",
-    plot_bgcolor="#F5F4FA",
-)
+with instrumentacao.etapa("figura"):
+    def montar(df):
+        import plotly.express as px
+
+        fig = px.line(
+            df,
+            x="MES_NOME",
+            y="TARIFA",
+            color="COMPANHIA",
+            markers=True,
+            line_shape="spline",
+            color_discrete_map=cores_companhias
+        )
+
+        fig.update_layout(
+            height=460,
+            xaxis_title="Mês",
+            yaxis_title="Tarifa Média (R$)",
+            plot_bgcolor="#F5F4FA",
+        )
+        return fig
+
+    fig = figuras.obter("companhias_linha", df_group, montar, y="TARIFA", por="COMPANHIA")
 
 st.plotly_chart(fig, use_container_width=True)
 
@@ -180,9 +201,9 @@ st.plotly_chart(fig, use_container_width=True)
 # ==========================================
 st.markdown("### 🧠 Insights da Estação")
 
-comp_cheap = m["mean"].idxmin()
-comp_stable = m["estabilidade"].idxmax()
-comp_vol = m["volatilidade_%"].idxmax()
+comp_cheap = resultado.mais_barata
+comp_stable = resultado.mais_estavel
+comp_vol = resultado.maior_oscilacao
 
 ins = f"""
 <div class='card'>
@@ -193,3 +214,5 @@ ins = f"""
 """
 
 st.markdown(ins, unsafe_allow_html=True)
+
+instrumentacao.finalizar()
@@ -0,0 +1,153 @@
+import streamlit as st
+import pandas as pd
+
+from boraali import api, explorador, instrumentacao
+
+# === REMOVER MENU NATIVO ===
+st.markdown("""
+<style>
+div[data-testid="stSidebarNav"] {display: none !important;}
+</style>
+""", unsafe_allow_html=True)
+
+# === MENU CUSTOMIZADO ===
+st.sidebar.title("✌️ Bora Alí")
+
+st.sidebar.page_link("app.py", label="🏠 Início")
+st.sidebar.page_link("pages/1_historico_por_rota.py", label="📍 Histórico por Rota")
+st.sidebar.page_link("pages/2_ranking_por_estacao.py", label="🏆 Ranking por Estação")
+st.sidebar.page_link("pages/3_previsao_2026.py", label="📈 Previsão de Tarifas")
+st.sidebar.page_link("pages/4_mes_ideal_orcamento.py", label="💸 Mês Ideal x Orçamento")
+st.sidebar.page_link("pages/5_radar_de_oportunidades.py", label="🎯 Radar de Oportunidades")
+st.sidebar.page_link("pages/6_analise_companhias.py", label="✈️ Análise das Companhias")
+st.sidebar.page_link("pages/7_explorador.py", label="🧮 Explorador")
+
+# Medição opcional das etapas (BORAALI_INSTRUMENTACAO=1 ou ?debug=1)
+instrumentacao.iniciar("7_explorador")
+
+# ==========================================
+# CONFIGURAÇÃO DE TELA
+# ==========================================
+st.set_page_config(
+    page_title="Explorador — Bora Alí",
+    layout="wide"
+)
+
+# ==========================================
+# ESTILO BORA ALÍ
+# ==========================================
+st.markdown("""
+<style>
+:root {
+    --laranja: #FF9F68;
+    --roxo: #9B6DFF;
+    --verde: #62D99C;
+    --cinza: #F5F4FA;
+}
+.big-title { font-size: 40px; font-weight: 900; color: var(--roxo); }
+.subtitle { font-size: 18px; color: #444; margin-bottom: 18px; }
+.card { background: white; padding: 20px; border-radius: 16px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.07); margin-bottom: 15px; }
+</style>
+""", unsafe_allow_html=True)
+
+# ==========================================
+# TITULO
+# ==========================================
+st.markdown("<div class='big-title'>🧮 Explorador de Tarifas</div>", unsafe_allow_html=True)
+st.markdown("<div class='subtitle'>Monte sua própria tabela: escolha o que vai nas linhas, nas colunas e nos filtros</div>", unsafe_allow_html=True)
+
+NOMES = {
+    "COMPANHIA": "Companhia",
+    "ANO": "Ano",
+    "MES": "Mês",
+    "ESTACAO": "Estação",
+    "ORIGEM": "Origem",
+    "DESTINO": "Destino",
+}
+
+# ==========================================
+# LINHAS, COLUNAS E MEDIDA
+# ==========================================
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    linhas = st.multiselect(
+        "Linhas:", explorador.DIMENSOES, default=["ORIGEM"], format_func=NOMES.get
+    )
+
+with col2:
+    colunas = st.multiselect(
+        "Colunas:",
+        [d for d in explorador.DIMENSOES if d not in linhas],
+        default=["ANO"] if "ANO" not in linhas else [],
+        format_func=NOMES.get
+    )
+
+with col3:
+    medida_nome = st.selectbox("Medida:", list(explorador.MEDIDAS))
+    medida = explorador.MEDIDAS[medida_nome]
+
+# ==========================================
+# FILTROS
+# ==========================================
+filtros = {}
+with st.expander("🔎 Filtros (vazio = todos)"):
+    colunas_filtro = st.columns(3)
+    for i, dimensao in enumerate(explorador.DIMENSOES):
+        with colunas_filtro[i % 3]:
+            escolhidos = st.multiselect(
+                f"{NOMES[dimensao]}:",
+                explorador.valores(dimensao),
+                format_func=lambda v, d=dimensao: api.MESES[v] if d == "MES" else str(v)
+            )
+        if escolhidos:
+            filtros[dimensao] = escolhidos
+
+instrumentacao.filtros(linhas=linhas, colunas=colunas, medida=medida, filtros=filtros)
+
+# ==========================================
+# TABELA DINÂMICA (CUBO PRÉ-AGREGADO)
+# ==========================================
+resultado = api.explorar(linhas, colunas, filtros, medida)
+
+if resultado is None:
+    st.warning("⚠️ Nenhum dado para os filtros escolhidos.")
+    st.stop()
+
+tabela = resultado.tabela
+# Meses por extenso nos rótulos (a ordem continua a do calendário)
+for eixo in ("index", "columns"):
+    rotulos = getattr(tabela, eixo)
+    if "MES" in (rotulos.names or []):
+        nivel = rotulos.names.index("MES")
+        novos = rotulos.set_levels(rotulos.levels[nivel].map(api.MESES), level=nivel) \
+            if isinstance(rotulos, pd.MultiIndex) else rotulos.map(api.MESES)
+        tabela = tabela.set_axis(novos, axis=eixo)
+if not colunas:
+    tabela = tabela.set_axis([medida_nome], axis="columns")
+tabela = tabela.rename_axis(
+    index=[NOMES.get(n, n) for n in tabela.index.names],
+    columns=[NOMES.get(n, n) for n in tabela.columns.names]
+)
+
+celulas = f"{resultado.celulas:,}".replace(",", ".")
+registros = f"{resultado.registros:,}".replace(",", ".")
+st.markdown(f"""
+<div class='card'>
+    <b>📦 {len(tabela)} linhas × {len(tabela.columns)} colunas</b><br>
+    Calculado a partir de {celulas} células pré-agregadas que resumem {registros} registros.
+</div>
+""", unsafe_allow_html=True)
+
+casas = 0 if medida == "N" else 2
+st.dataframe(tabela.round(casas), use_container_width=True)
+
+st.download_button(
+    "⬇️ Baixar CSV",
+    tabela.to_csv().encode("utf-8"),
+    file_name="explorador_bora_ali.csv",
+    mime="text/csv"
+)
+
+instrumentacao.finalizar()
@@ -0,0 +1,120 @@
+"""Ingestão completa e incremental sobre microdados ANAC sintéticos."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from boraali import armazenamento, ingestao
+
+AEROPORTOS = ["SBRF", "SBGR", "SBSV", "SBEG"]
+EMPRESAS = ["GLO", "TAM", "AZU", "PTB"]
+
+
+def _microdados(meses: list[tuple[int, int]], linhas_por_mes: int = 400, semente: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    partes = []
+    for ano, mes in meses:
+        n = linhas_por_mes
+        partes.append(pd.DataFrame({
+            "ANO": ano,
+            "MES": mes,
+            "EMPRESA": rng.choice(EMPRESAS, n),
+            "ORIGEM": rng.choice(AEROPORTOS, n),
+            "DESTINO": rng.choice(AEROPORTOS, n),
+            "TARIFA": rng.lognormal(6.5, 0.4, n).round(2),
+            "ASSENTOS": rng.integers(1, 40, n),
+        }))
+    return pd.concat(partes, ignore_index=True)
+
+
+def _gravar_anac(df: pd.DataFrame, caminho) -> str:
+    df.to_csv(caminho, sep=";", decimal=",", index=False, encoding="latin-1")
+    return str(caminho)
+
+
+def _dataset(diretorio: str) -> pd.DataFrame:
+    df = armazenamento.ler(diretorio)
+    df = df.astype({c: str for c in ["COMPANHIA", "ORIGEM", "DESTINO"]})
+    return df.sort_values(ingestao.CHAVES, ignore_index=True)
+
+
+def _esbocos(diretorio: str) -> pd.DataFrame:
+    df = ingestao.ler_esbocos(diretorio)
+    df = df.astype({c: str for c in ["COMPANHIA", "ORIGEM", "DESTINO"]})
+    return df.sort_values(list(df.columns[:-1]), ignore_index=True)
+
+
+@pytest.fixture
+def anac(tmp_path):
+    meses = [(2024, 1), (2024, 2), (2024, 3)]
+    return {
+        "todos": _gravar_anac(_microdados(meses), tmp_path / "anac_todos.csv"),
+        "primeiros": _gravar_anac(
+            _microdados(meses).query("MES < 3"), tmp_path / "anac_primeiros.csv"
+        ),
+    }
+
+
+def test_reingerir_mes_sem_mudancas_nao_altera_o_dataset(tmp_path, anac):
+    diretorio = str(tmp_path / "parquet")
+    ingestao.ingerir(anac["todos"], diretorio=diretorio)
+    antes = _dataset(diretorio)
+    esbocos = _esbocos(diretorio)
+    estado = ingestao.ler_estado(diretorio)
+
+    gravadas = ingestao.atualizar(anac["todos"], diretorio=diretorio)
+
+    assert gravadas.empty
+    pd.testing.assert_frame_equal(_dataset(diretorio), antes)
+    pd.testing.assert_frame_equal(_esbocos(diretorio), esbocos)
+    assert ingestao.ler_estado(diretorio) == estado
+
+
+def test_atualizar_equivale_a_ingestao_completa(tmp_path, anac):
+    completo = str(tmp_path / "completo")
+    incremental = str(tmp_path / "incremental")
+    ingestao.ingerir(anac["todos"], diretorio=completo)
+    ingestao.ingerir(anac["primeiros"], diretorio=incremental)
+
+    gravadas = ingestao.atualizar(anac["todos"], diretorio=incremental)
+
+    assert set(zip(gravadas["ANO"], gravadas["MES"])) == {(2024, 3)}
+    pd.testing.assert_frame_equal(_dataset(incremental), _dataset(completo))
+    pd.testing.assert_frame_equal(_esbocos(incremental), _esbocos(completo))
+    assert ingestao.ler_estado(incremental) == {"anac": (2024, 3)}
+
+
+def test_falha_na_atualizacao_preserva_a_versao_atual(tmp_path, anac, monkeypatch):
+    diretorio = str(tmp_path / "parquet")
+    ingestao.ingerir(anac["primeiros"], diretorio=diretorio)
+    antes = _dataset(diretorio)
+    versao = armazenamento.versao(diretorio)
+
+    def falhar(*args, **kwargs):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(ingestao, "_salvar_controle", falhar)
+    with pytest.raises(OSError):
+        ingestao.atualizar(anac["todos"], diretorio=diretorio)
+
+    pd.testing.assert_frame_equal(_dataset(diretorio), antes)
+    assert armazenamento.versao(diretorio) == versao
+    assert ingestao.ler_estado(diretorio) == {"anac": (2024, 2)}
+    # Só a versão publicada sobra ao lado do link.
+    assert len([p for p in tmp_path.iterdir() if p.name.startswith(".parquet-")]) == 1
+
+
+def test_acumulador_com_compactacao_igual_ao_recalculo(monkeypatch):
+    monkeypatch.setattr(ingestao, "PARCIAIS_ANTES_DE_COMPACTAR", 3)
+    df = _microdados([(2024, m) for m in range(1, 13)], linhas_por_mes=300, semente=1)
+    df = df.assign(N=1.0, TARIFA_SOMA=df["TARIFA"] * df["ASSENTOS"])
+    chaves = ["EMPRESA", "ANO", "MES", "ORIGEM", "DESTINO"]
+    medidas = ["ASSENTOS", "TARIFA_SOMA", "N"]
+
+    acc = ingestao.Acumulador(chaves, medidas)
+    embaralhado = df.sample(frac=1, random_state=2)[chaves + medidas]
+    for inicio in range(0, len(embaralhado), 250):
+        acc.adicionar(embaralhado.iloc[inicio:inicio + 250])
+
+    esperado = df.groupby(chaves, as_index=False)[medidas].sum()
+    obtido = acc.resultado().sort_values(chaves, ignore_index=True)
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False)
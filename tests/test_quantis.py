@@ -0,0 +1,79 @@
+"""Esboços de quantis contra os quantis exatos do dataset reduzido."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from boraali import config, dados, quantis
+
+QS = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+
+@pytest.fixture(scope="module")
+def reduzido() -> pd.DataFrame:
+    return pd.read_csv(dados.CAMINHO_CSV)
+
+
+@pytest.fixture(scope="module")
+def tabela(reduzido) -> pd.DataFrame:
+    return quantis.construir(reduzido)
+
+
+def _erro_relativo(estimado, exato) -> np.ndarray:
+    return np.abs(np.asarray(estimado) - exato) / exato
+
+
+def test_quantis_por_rota_dentro_do_erro_documentado(reduzido, tabela):
+    rotas = reduzido[["ORIGEM", "DESTINO"]].drop_duplicates().sample(80, random_state=0)
+    for origem, destino in rotas.itertuples(index=False):
+        tarifas = reduzido.loc[
+            (reduzido["ORIGEM"] == origem) & (reduzido["DESTINO"] == destino), "TARIFA"
+        ].to_numpy()
+        celulas = tabela[(tabela["ORIGEM"] == origem) & (tabela["DESTINO"] == destino)]
+
+        esboco = quantis.esboco(celulas)
+        exato = np.quantile(tarifas, QS, method="lower")
+
+        assert esboco.total == len(tarifas)
+        assert _erro_relativo(esboco.quantis(QS), exato).max() <= config.PRECISAO_QUANTIS + 1e-9
+
+
+def test_quantis_por_mes_dentro_do_erro_documentado(reduzido, tabela):
+    origem, destino = "São Paulo", "Rio de Janeiro"
+    rota = reduzido[(reduzido["ORIGEM"] == origem) & (reduzido["DESTINO"] == destino)]
+    celulas = tabela[(tabela["ORIGEM"] == origem) & (tabela["DESTINO"] == destino)]
+
+    por_mes = quantis.quantis_por(celulas, "MES", {"P10": 0.1, "MEDIANA": 0.5, "P90": 0.9})
+
+    for linha in por_mes.itertuples(index=False):
+        tarifas = rota.loc[rota["MES"] == linha.MES, "TARIFA"].to_numpy()
+        exato = np.quantile(tarifas, [0.1, 0.5, 0.9], method="lower")
+        estimado = [linha.P10, linha.MEDIANA, linha.P90]
+        assert _erro_relativo(estimado, exato).max() <= config.PRECISAO_QUANTIS + 1e-9
+
+
+def test_soma_de_esbocos_igual_ao_esboco_do_conjunto(reduzido):
+    anos = sorted(reduzido["ANO"].unique())
+    partes = [quantis.esboco(quantis.construir(reduzido[reduzido["ANO"] == a])) for a in anos]
+
+    somado = partes[0]
+    for parte in partes[1:]:
+        somado = somado + parte
+    direto = quantis.esboco(quantis.construir(reduzido))
+
+    np.testing.assert_array_equal(somado.faixas, direto.faixas)
+    np.testing.assert_array_equal(somado.contagens, direto.contagens)
+
+
+def test_peso_conta_cada_linha_pelos_assentos():
+    linhas = pd.DataFrame({
+        "ORIGEM": "Recife", "DESTINO": "São Paulo", "COMPANHIA": "GOL", "ANO": 2024, "MES": 1,
+        "TARIFA": [300.0, 450.0, 900.0],
+        "ASSENTOS": [5, 1, 2],
+    })
+    repetidas = linhas.loc[linhas.index.repeat(linhas["ASSENTOS"])]
+
+    ponderado = quantis.esboco(quantis.construir(linhas, peso="ASSENTOS"))
+    expandido = quantis.esboco(quantis.construir(repetidas))
+
+    np.testing.assert_array_equal(ponderado.contagens, expandido.contagens)
+    np.testing.assert_allclose(ponderado.quantis(QS), expandido.quantis(QS))